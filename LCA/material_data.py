@@ -1,7 +1,11 @@
+import argparse
+import matplotlib
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 
 # Set the aesthetics
 plt.rcParams["font.family"] = "sans-serif"
@@ -53,27 +57,6 @@ groups = {
     "Others": ["General materials", "Hot melt adhesive"],
 }
 
-# Aggregate data
-grouped_data = {}
-for group, items in groups.items():
-    grouped_data[group] = sum(data[item] for item in items)
-
-# Verify sum
-calculated_sum = sum(grouped_data.values())
-print(f"Calculated Sum: {calculated_sum:.3f}")
-print(f"Target Sum: {total_input}")
-
-# Calculate percentages
-# The user asked to calculate on Total Material Input (69.298)
-percentages = {k: (v / total_input) * 100 for k, v in grouped_data.items()}
-
-# Prepare for plotting
-df = pd.DataFrame(list(percentages.items()), columns=["Material", "Percentage"])
-df = df.sort_values("Percentage", ascending=True)
-
-# Plotting
-fig, ax = plt.subplots(figsize=(10, 6))
-
 # Colors (Premium Palette)
 colors = ["#E0E0E0", "#B0BEC5", "#90CAF9", "#64B5F6", "#42A5F5", "#1E88E5"]
 # Or map specific colors to materials for better semantics
@@ -85,209 +68,323 @@ color_map = {
     "Other Metals": "#A1887F",  # Brown
     "Others": "#E0E0E0",  # Grey
 }
-bar_colors = [color_map.get(m, "#E0E0E0") for m in df["Material"]]
-
-bars = ax.barh(
-    df["Material"], df["Percentage"], color=bar_colors, edgecolor="white", height=0.6
-)
-
-# Labels and Title
-ax.set_xlabel("Percentage by Weight (%)", fontsize=12, labelpad=10)
-# ax.set_ylabel('Material Group', fontsize=12) # Labels are on Y axis
-ax.set_title("Material Input Distribution (Weight %)", fontsize=16, pad=20)
-
-# Add value labels
-for bar in bars:
-    width = bar.get_width()
-    ax.text(
-        width + 0.5,
-        bar.get_y() + bar.get_height() / 2,
-        f"{width:.1f}%",
-        va="center",
-        fontsize=11,
-        fontweight="bold",
-        color="#333333",
+
+note_text = "Note: Calculated on Total Material Input to account for manufacturing scraps and process efficiency"
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def compute_group_percentages(data=data, groups=groups, total_input=total_input):
+    """
+    Aggregates material weights per group and expresses them as a share of
+    the total material input. Returns a frame sorted ascending for barh plots.
+    """
+    grouped_data = {}
+    for group, items in groups.items():
+        grouped_data[group] = sum(data[item] for item in items)
+
+    # The user asked to calculate on Total Material Input (69.298)
+    df = pd.DataFrame(list(grouped_data.items()), columns=["Material", "Weight"])
+    df["Percentage"] = (df["Weight"] / total_input) * 100
+    return df.sort_values("Percentage", ascending=True)
+
+
+def build_long_table(variants, groups=groups, total_inputs=None):
+    """
+    Long-form table of every material of every product variant, with its
+    group, share of the group, share of the total input and chart label,
+    computed column-wise in one pass instead of per group.
+
+    variants maps variant name -> {material: weight}; total_inputs maps
+    variant name -> total material input (defaults to the sum of weights).
+    """
+    item_group = {item: group for group, items in groups.items() for item in items}
+    long = pd.DataFrame(
+        [(variant, material, weight) for variant, materials in variants.items() for material, weight in materials.items()],
+        columns=["Variant", "Material", "Weight"],
     )
+    long["Group"] = long["Material"].map(item_group).fillna("Others")
+    totals = long.groupby("Variant")["Weight"].sum()
+    if total_inputs:
+        totals = pd.Series(total_inputs).reindex(totals.index).fillna(totals)
+    long["GroupWeight"] = long.groupby(["Variant", "Group"])["Weight"].transform("sum")
+    long["GroupSize"] = long.groupby(["Variant", "Group"])["Weight"].transform("size")
+    long["RelativePercentage"] = long["Weight"] / long["GroupWeight"] * 100
+    long["TotalPercentage"] = long["Weight"] / long["Variant"].map(totals) * 100
+    long["Label"] = [f"{w:.3f} kg ({p:.3f}%)" for w, p in zip(long["Weight"], long["TotalPercentage"])]
+    return long.sort_values(["Variant", "Group", "Weight"], kind="stable").reset_index(drop=True)
 
-# Clean up axes
-ax.spines["top"].set_visible(False)
-ax.spines["right"].set_visible(False)
-ax.spines["left"].set_visible(False)
-ax.spines["bottom"].set_color("#DDDDDD")
-ax.tick_params(axis="y", length=0)
-ax.grid(axis="x", linestyle="--", alpha=0.5, color="#CCCCCC")
 
-# Add the note
-note_text = "Note: Calculated on Total Material Input to account for manufacturing scraps and process efficiency"
-fig.text(0.5, 0.02, note_text, ha="center", fontsize=9, style="italic", color="#666666")
+def safe_file_name(name):
+    return re.sub(r"[^a-zA-Z0-9]", "_", name).lower()
 
-plt.tight_layout()
-plt.subplots_adjust(bottom=0.15)  # Make room for the note
 
-# Save Bar Chart
-script_dir = os.path.dirname(os.path.abspath(__file__))
-output_path_bar = os.path.join(script_dir, "material_distribution_bar.png")
-plt.savefig(output_path_bar, dpi=300, bbox_inches="tight")
-print(f"Bar chart saved to {output_path_bar}")
-
-# --- Donut Chart ---
-fig2, ax2 = plt.subplots(figsize=(10, 8))
-
-# Prepare data for donut (ensure sorted for consistency)
-# Use same colors
-colors_mapped = [color_map.get(m, "#E0E0E0") for m in df["Material"]]
-
-# Wedgeprops for separation
-wedges, texts, autotexts = ax2.pie(
-    df["Percentage"],
-    labels=None,
-    autopct="",
-    startangle=90,
-    pctdistance=0.85,
-    colors=colors_mapped,
-    wedgeprops=dict(width=0.4, edgecolor="w"),
-)
-
-# Add legend nicely
-ax2.legend(
-    wedges,
-    df["Material"],
-    title="Materials",
-    loc="center left",
-    bbox_to_anchor=(1, 0, 0.5, 1),
-)
-
-# Add percentages manually to look cleaner or just rely on the legend/table?
-# Let's put labels with lines if possible, or just the main ones inside.
-# Given small slices, standard pie labels might overlap.
-# Let's use a list on the side or just the legend.
-# We'll calculate labels for the legend: "Name (X.X%)"
-legend_labels = [f"{m} ({p:.1f}%)" for m, p in zip(df["Material"], df["Percentage"])]
-ax2.legend(
-    wedges,
-    legend_labels,
-    title="Materials",
-    loc="center left",
-    bbox_to_anchor=(1, 0, 0.5, 1),
-)
-
-
-ax2.set_title("Material Input Composition", fontsize=16, fontweight="bold")
-
-# Center text
-ax2.text(
-    0,
-    0,
-    f"Total\n{total_input:,.1f} kg",
-    ha="center",
-    va="center",
-    fontsize=14,
-    fontweight="bold",
-    color="#555555",
-)
-
-# Add the note
-fig2.text(
-    0.5, 0.05, note_text, ha="center", fontsize=9, style="italic", color="#666666"
-)
-
-# Save Donut Chart
-output_path_donut = os.path.join(script_dir, "material_distribution_donut.png")
-plt.tight_layout()
-plt.subplots_adjust(bottom=0.15)
-plt.savefig(output_path_donut, dpi=300, bbox_inches="tight")
-print(f"Donut chart saved to {output_path_donut}")
-
-# --- Detailed Bar Charts per Category ---
-import re
+# Detail-chart figures kept per number of bars, one cache per process
+_DETAIL_TEMPLATES = {}
+
+
+def _detail_template(n_bars):
+    """Figure with every static element of a detail chart with n_bars bars."""
+    if n_bars in _DETAIL_TEMPLATES:
+        return _DETAIL_TEMPLATES[n_bars]
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    bars = ax.barh(range(n_bars), np.ones(n_bars), edgecolor="white", height=0.6)
+    labels = [
+        ax.text(0, bar.get_y() + bar.get_height() / 2, "", va="center", fontsize=10,
+                fontweight="bold", color="#333333")
+        for bar in bars
+    ]
+    ax.set_yticks(range(n_bars))
 
-for group_name, items in groups.items():
-    if len(items) <= 1:
-        continue  # Skip categories with single item (redundant)
-
-    # Extract sub-data
-    sub_data = {item: data[item] for item in items}
-    sub_total = sum(sub_data.values())
-
-    # Sort for visual appeal
-    sub_df = pd.DataFrame(list(sub_data.items()), columns=["Material", "Weight"])
-    sub_df["RelativePercentage"] = (
-        sub_df["Weight"] / sub_total
-    ) * 100  # For the chart slices
-    sub_df["TotalPercentage"] = (sub_df["Weight"] / total_input) * 100  # For the labels
-    sub_df = sub_df.sort_values("Weight", ascending=True)  # Ascending for BarH
-
-    # Plot - Horizontal Bar Chart
-    fig3, ax3 = plt.subplots(figsize=(10, 6))
-
-    # Colors
-    base_color_hex = color_map.get(group_name, "#9E9E9E")
-    # Create valid color list
-    bar_colors = [base_color_hex] * len(sub_df)
-
-    bars = ax3.barh(
-        sub_df["Material"],
-        sub_df["TotalPercentage"],
-        color=bar_colors,
-        edgecolor="white",
-        height=0.6,
+    # Add 1% Threshold Line
+    ax.axvline(x=1.0, color="red", linestyle="--", linewidth=1.5, alpha=0.7)
+    ax.text(1.0, ax.get_ylim()[1], " 1% Threshold", color="red", va="bottom", ha="center",
+            fontsize=9, fontweight="bold")
+
+    ax.set_xlabel("Percentage of Total Input (%)", fontsize=12)
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.spines["left"].set_visible(False)
+    ax.spines["bottom"].set_color("#DDDDDD")
+    ax.grid(axis="x", linestyle="--", alpha=0.5, color="#CCCCCC")
+    fig.text(0.5, 0.02, note_text, ha="center", fontsize=8, style="italic", color="#666666")
+
+    _DETAIL_TEMPLATES[n_bars] = (fig, ax, bars, labels)
+    return _DETAIL_TEMPLATES[n_bars]
+
+
+def render_detail_chart(task):
+    """
+    Renders one group's detail chart into the cached template for its size.
+    task is (group name, materials, total percentages, labels, output path, dpi).
+    """
+    group_name, materials, widths, label_texts, output_path, dpi = task
+    fig, ax, bars, labels = _detail_template(len(materials))
+
+    color = color_map.get(group_name, "#9E9E9E")
+    for bar, label, width, text in zip(bars, labels, widths, label_texts):
+        bar.set_width(width)
+        bar.set_facecolor(color)
+        label.set_position((width + (0.005 if width < 0.05 else 0.05), label.get_position()[1]))
+        label.set_text(text)
+    ax.set_yticklabels(materials)
+    ax.set_xlim(0, max(max(widths), 1.0) * 1.05)
+    ax.set_title(f"{group_name} Detailed Breakdown", fontsize=14, fontweight="bold", pad=20)
+
+    fig.tight_layout()
+    fig.subplots_adjust(bottom=0.15)
+    fig.savefig(output_path, dpi=dpi, bbox_inches="tight")
+    return output_path
+
+
+def _init_render_worker():
+    matplotlib.use("Agg")
+
+
+def detail_chart_tasks(long, output_dir, dpi, per_variant_dirs=True):
+    """One render task per multi-material group, ordered by group size so templates are reused."""
+    detail = long[long["GroupSize"] > 1]
+    tasks = []
+    for (variant, group_name), rows in detail.groupby(["Variant", "Group"], sort=False):
+        directory = os.path.join(output_dir, safe_file_name(variant)) if per_variant_dirs else output_dir
+        output_path = os.path.join(directory, f"material_distribution_detail_{safe_file_name(group_name)}_bar.png")
+        tasks.append((group_name, rows["Material"].tolist(), rows["TotalPercentage"].tolist(),
+                      rows["Label"].tolist(), output_path, dpi))
+    return sorted(tasks, key=lambda task: len(task[1]))
+
+
+def render_detail_charts(tasks, workers=1):
+    """Renders the detail charts in-process or across a worker pool."""
+    for directory in {os.path.dirname(task[4]) for task in tasks}:
+        os.makedirs(directory, exist_ok=True)
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            return list(pool.map(render_detail_chart, tasks, chunksize=chunksize))
+    return [render_detail_chart(task) for task in tasks]
+
+
+def demo_variants(n_variants, seed=0):
+    """Product variants scattered around the reference inventory, for the batched mode."""
+    rng = np.random.default_rng(seed)
+    materials = list(data)
+    weights = np.array(list(data.values())) * rng.lognormal(0.0, 0.15, (n_variants, len(materials)))
+    return {
+        f"Variant {v + 1:03d}": dict(zip(materials, row.round(3)))
+        for v, row in enumerate(weights)
+    }
+
+
+def load_variants(file_path):
+    """Reads a Variant;Material;Weight [kg] long-form inventory."""
+    frame = pd.read_csv(file_path, sep=";")
+    return {
+        variant: dict(zip(rows["Material"], rows["Weight [kg]"]))
+        for variant, rows in frame.groupby("Variant", sort=False)
+    }
+
+
+def run_batched(variants, output_dir, workers=None, dpi=150):
+    """Group breakdowns of every variant in one table, then the detail charts across workers."""
+    long = build_long_table(variants)
+    os.makedirs(output_dir, exist_ok=True)
+    summary = (
+        long.groupby(["Variant", "Group"], sort=False)
+        .agg(Weight=("Weight", "sum"), Percentage=("TotalPercentage", "sum"))
+        .reset_index()
+    )
+    summary.to_csv(os.path.join(output_dir, "group_breakdown.csv"), sep=";", index=False)
+    long.drop(columns=["GroupWeight", "GroupSize"]).to_csv(
+        os.path.join(output_dir, "material_breakdown.csv"), sep=";", index=False
     )
+    tasks = detail_chart_tasks(long, output_dir, dpi)
+    return summary, render_detail_charts(tasks, workers or os.cpu_count())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Material input charts for the LCA.")
+    parser.add_argument("--batch", action="store_true", help="Batched mode over many product variants")
+    parser.add_argument("--variants", default=None, help="Variant;Material;Weight [kg] CSV for --batch")
+    parser.add_argument("--demo-variants", type=int, default=100, help="Synthetic variants when no CSV is given")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--dpi", type=int, default=150)
+    parser.add_argument("--output-dir", default=os.path.join(script_dir, "batch_output"))
+    args = parser.parse_args()
+
+    if args.batch:
+        variants = load_variants(args.variants) if args.variants else demo_variants(args.demo_variants)
+        summary, paths = run_batched(variants, args.output_dir, args.workers, args.dpi)
+        print(f"{len(variants)} variants: {len(summary)} group rows, {len(paths)} detail charts in {args.output_dir}")
+        return
+
+    df = compute_group_percentages()
 
-    # Add values
-    for i, bar in enumerate(bars):
+    # Verify sum
+    calculated_sum = df["Weight"].sum()
+    print(f"Calculated Sum: {calculated_sum:.3f}")
+    print(f"Target Sum: {total_input}")
+
+    # Plotting
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    bar_colors = [color_map.get(m, "#E0E0E0") for m in df["Material"]]
+
+    bars = ax.barh(
+        df["Material"], df["Percentage"], color=bar_colors, edgecolor="white", height=0.6
+    )
+
+    # Labels and Title
+    ax.set_xlabel("Percentage by Weight (%)", fontsize=12, labelpad=10)
+    # ax.set_ylabel('Material Group', fontsize=12) # Labels are on Y axis
+    ax.set_title("Material Input Distribution (Weight %)", fontsize=16, pad=20)
+
+    # Add value labels
+    for bar in bars:
         width = bar.get_width()
-        weight = sub_df.iloc[i]["Weight"]
-        label_text = f"{weight:.3f} kg ({width:.3f}%)"
-        ax3.text(
-            width + (0.005 if width < 0.05 else 0.05),
+        ax.text(
+            width + 0.5,
             bar.get_y() + bar.get_height() / 2,
-            label_text,
+            f"{width:.1f}%",
             va="center",
-            fontsize=10,
+            fontsize=11,
             fontweight="bold",
             color="#333333",
         )
 
-    # Add 1% Threshold Line
-    ax3.axvline(x=1.0, color="red", linestyle="--", linewidth=1.5, alpha=0.7)
-    # Add text for threshold
-    ax3.text(
-        1.0,
-        ax3.get_ylim()[1],
-        " 1% Threshold",
-        color="red",
-        va="bottom",
-        ha="center",
-        fontsize=9,
-        fontweight="bold",
+    # Clean up axes
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.spines["left"].set_visible(False)
+    ax.spines["bottom"].set_color("#DDDDDD")
+    ax.tick_params(axis="y", length=0)
+    ax.grid(axis="x", linestyle="--", alpha=0.5, color="#CCCCCC")
+
+    # Add the note
+    fig.text(0.5, 0.02, note_text, ha="center", fontsize=9, style="italic", color="#666666")
+
+    plt.tight_layout()
+    plt.subplots_adjust(bottom=0.15)  # Make room for the note
+
+    # Save Bar Chart
+    output_path_bar = os.path.join(script_dir, "material_distribution_bar.png")
+    plt.savefig(output_path_bar, dpi=300, bbox_inches="tight")
+    print(f"Bar chart saved to {output_path_bar}")
+
+    # --- Donut Chart ---
+    fig2, ax2 = plt.subplots(figsize=(10, 8))
+
+    # Prepare data for donut (ensure sorted for consistency)
+    # Use same colors
+    colors_mapped = [color_map.get(m, "#E0E0E0") for m in df["Material"]]
+
+    # Wedgeprops for separation
+    wedges, texts, autotexts = ax2.pie(
+        df["Percentage"],
+        labels=None,
+        autopct="",
+        startangle=90,
+        pctdistance=0.85,
+        colors=colors_mapped,
+        wedgeprops=dict(width=0.4, edgecolor="w"),
     )
 
-    # Formatting
-    ax3.set_xlabel("Percentage of Total Input (%)", fontsize=12)
-    ax3.set_title(
-        f"{group_name} Detailed Breakdown", fontsize=14, fontweight="bold", pad=20
+    # Add legend nicely
+    ax2.legend(
+        wedges,
+        df["Material"],
+        title="Materials",
+        loc="center left",
+        bbox_to_anchor=(1, 0, 0.5, 1),
     )
 
-    # Clean up axes
-    ax3.spines["top"].set_visible(False)
-    ax3.spines["right"].set_visible(False)
-    ax3.spines["left"].set_visible(False)
-    ax3.spines["bottom"].set_color("#DDDDDD")
-    ax3.grid(axis="x", linestyle="--", alpha=0.5, color="#CCCCCC")
-
-    # Add Note
-    fig3.text(
-        0.5, 0.02, note_text, ha="center", fontsize=8, style="italic", color="#666666"
+    # Add percentages manually to look cleaner or just rely on the legend/table?
+    # Let's put labels with lines if possible, or just the main ones inside.
+    # Given small slices, standard pie labels might overlap.
+    # Let's use a list on the side or just the legend.
+    # We'll calculate labels for the legend: "Name (X.X%)"
+    legend_labels = [f"{m} ({p:.1f}%)" for m, p in zip(df["Material"], df["Percentage"])]
+    ax2.legend(
+        wedges,
+        legend_labels,
+        title="Materials",
+        loc="center left",
+        bbox_to_anchor=(1, 0, 0.5, 1),
     )
 
-    plt.tight_layout()
-    plt.subplots_adjust(bottom=0.15)
 
-    # Save
-    safe_name = re.sub(r"[^a-zA-Z0-9]", "_", group_name).lower()
-    output_path_sub = os.path.join(
-        script_dir, f"material_distribution_detail_{safe_name}_bar.png"
+    ax2.set_title("Material Input Composition", fontsize=16, fontweight="bold")
+
+    # Center text
+    ax2.text(
+        0,
+        0,
+        f"Total\n{total_input:,.1f} kg",
+        ha="center",
+        va="center",
+        fontsize=14,
+        fontweight="bold",
+        color="#555555",
+    )
+
+    # Add the note
+    fig2.text(
+        0.5, 0.05, note_text, ha="center", fontsize=9, style="italic", color="#666666"
     )
-    plt.savefig(output_path_sub, dpi=300, bbox_inches="tight")
-    print(f"Detailed chart for {group_name} saved to {output_path_sub}")
-    plt.close(fig3)  # Close to free memory
+
+    # Save Donut Chart
+    output_path_donut = os.path.join(script_dir, "material_distribution_donut.png")
+    plt.tight_layout()
+    plt.subplots_adjust(bottom=0.15)
+    plt.savefig(output_path_donut, dpi=300, bbox_inches="tight")
+    print(f"Donut chart saved to {output_path_donut}")
+
+    # --- Detailed Bar Charts per Category ---
+    # Single-item categories are skipped by the task builder (redundant)
+    long = build_long_table({"Reference": data}, total_inputs={"Reference": total_input})
+    tasks = detail_chart_tasks(long, script_dir, dpi=300, per_variant_dirs=False)
+    for task, output_path_sub in zip(tasks, render_detail_charts(tasks)):
+        print(f"Detailed chart for {task[0]} saved to {output_path_sub}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List, NamedTuple
+
+from load_profiles import interval_index, production_shape
+
+# --- Constants ---
+HOURS_PER_WEEK = 168
+
+# Smoothing factors for the seasonal baseline and the residual statistics
+BASELINE_ALPHA = 0.2
+RESIDUAL_ALPHA = 0.02
+
+# Spike threshold on the standardized residual and CUSUM parameters
+Z_THRESHOLD = 4.0
+CUSUM_DRIFT = 0.5
+CUSUM_THRESHOLD = 10.0
+
+# Readings per meter before any flag is raised (two full weeks)
+WARMUP_READINGS = 2 * HOURS_PER_WEEK
+
+
+class AnomalyFlags(NamedTuple):
+    """Per-meter result of one update step."""
+
+    z_score: np.ndarray
+    spike: np.ndarray
+    changepoint: np.ndarray
+
+
+class MeterAnomalyDetector:
+    """
+    Streaming detector for many meters at once.
+
+    State is a fixed set of arrays indexed by meter: a seasonal baseline per
+    hour-of-week slot, an EWMA/EW-variance of the relative residual against
+    that baseline and two-sided CUSUM statistics for level shifts. Memory per
+    meter is constant and every update is a handful of array operations,
+    regardless of how many meters are tracked.
+    """
+
+    def __init__(self, meter_names: List[str], season_slots: int = HOURS_PER_WEEK,
+                 baseline_alpha: float = BASELINE_ALPHA, residual_alpha: float = RESIDUAL_ALPHA,
+                 z_threshold: float = Z_THRESHOLD, cusum_drift: float = CUSUM_DRIFT,
+                 cusum_threshold: float = CUSUM_THRESHOLD, warmup: int = WARMUP_READINGS,
+                 min_scale: float = 1e-3):
+        self.meter_names = list(meter_names)
+        n_meters = len(self.meter_names)
+        self.season_slots = season_slots
+        self.baseline_alpha = baseline_alpha
+        self.residual_alpha = residual_alpha
+        self.z_threshold = z_threshold
+        self.cusum_drift = cusum_drift
+        self.cusum_threshold = cusum_threshold
+        self.warmup = warmup
+
+        self.baseline = np.full((n_meters, season_slots), np.nan)
+        self.residual_mean = np.zeros(n_meters)
+        self.residual_var = np.zeros(n_meters)
+        self.cusum_pos = np.zeros(n_meters)
+        self.cusum_neg = np.zeros(n_meters)
+        self.n_seen = np.zeros(n_meters, dtype=np.int64)
+        self.min_scale = min_scale
+        self._rows = np.arange(n_meters)
+
+    def update(self, slot, values) -> AnomalyFlags:
+        """
+        Consumes one reading per meter. slot is the season slot (e.g. hour of
+        week) as a scalar or per-meter array; NaN values leave a meter's
+        state untouched.
+        """
+        values = np.asarray(values, dtype=float)
+        slot = np.broadcast_to(np.asarray(slot) % self.season_slots, values.shape)
+        valid = ~np.isnan(values)
+
+        expected = self.baseline[self._rows, slot]
+        first_in_slot = np.isnan(expected)
+        expected = np.where(first_in_slot, values, expected)
+        # Relative residual, so day and night readings share one noise scale
+        scale = np.maximum(np.abs(expected), self.min_scale)
+        residual = (values - expected) / scale
+
+        std = np.sqrt(self.residual_var)
+        z = np.where(std > 0, (residual - self.residual_mean) / np.where(std > 0, std, 1.0), 0.0)
+        armed = valid & (self.n_seen >= self.warmup)
+        spike = armed & (np.abs(z) > self.z_threshold)
+
+        # Two-sided CUSUM on the standardized residual, reset after an alarm
+        z_valid = np.where(armed, np.clip(z, -self.z_threshold, self.z_threshold), 0.0)
+        self.cusum_pos = np.maximum(0.0, self.cusum_pos + z_valid - self.cusum_drift)
+        self.cusum_neg = np.maximum(0.0, self.cusum_neg - z_valid - self.cusum_drift)
+        changepoint = (self.cusum_pos > self.cusum_threshold) | (self.cusum_neg > self.cusum_threshold)
+        self.cusum_pos[changepoint] = 0.0
+        self.cusum_neg[changepoint] = 0.0
+
+        # Spikes are kept out of the residual statistics so an event cannot
+        # widen the band that is supposed to detect it
+        learn = valid & ~spike
+        delta = residual - self.residual_mean
+        a = self.residual_alpha
+        self.residual_mean = np.where(learn, self.residual_mean + a * delta, self.residual_mean)
+        self.residual_var = np.where(learn, (1 - a) * (self.residual_var + a * delta ** 2), self.residual_var)
+
+        # Spikes only nudge the seasonal baseline by one standard deviation,
+        # so short events wash out while persistent shifts are absorbed slowly
+        step = np.where(spike, np.clip(residual, -std, std), residual) * scale
+        new_baseline = np.where(first_in_slot, values, expected + self.baseline_alpha * step)
+        self.baseline[self._rows[valid], slot[valid]] = new_baseline[valid]
+        self.n_seen += valid
+
+        return AnomalyFlags(z, spike, changepoint)
+
+    def run(self, timestamps: pd.DatetimeIndex, values: np.ndarray) -> pd.DataFrame:
+        """
+        Feeds a (T, n_meters) block of readings row by row and returns the
+        flagged (timestamp, meter) pairs.
+        """
+        slots = (timestamps.dayofweek * 24 + timestamps.hour).to_numpy()
+        events = []
+        for t, (slot, row) in enumerate(zip(slots, values)):
+            flags = self.update(slot, row)
+            for meter_idx in np.flatnonzero(flags.spike | flags.changepoint):
+                events.append(
+                    {
+                        "Timestamp": timestamps[t],
+                        "Meter": self.meter_names[meter_idx],
+                        "Reading [kWh]": row[meter_idx],
+                        "Z-score": flags.z_score[meter_idx],
+                        "Type": "changepoint" if flags.changepoint[meter_idx] else "spike",
+                    }
+                )
+        return pd.DataFrame(events, columns=["Timestamp", "Meter", "Reading [kWh]", "Z-score", "Type"])
+
+
+def simulate_subsector_streams(sectors_df: pd.DataFrame, index: pd.DatetimeIndex, seed: int = 0) -> pd.DataFrame:
+    """
+    Synthetic hourly meter readings per subsector, following the production
+    shape and summing to the annual sectors.csv figures, with 5 % noise.
+    """
+    rng = np.random.default_rng(seed)
+    shape = production_shape(index)
+    shape = shape / shape.sum()
+    annual = sectors_df["Consumption [kWh/year]"].to_numpy(dtype=float)
+    readings = shape[:, None] * annual[None, :]
+    readings *= rng.normal(1.0, 0.05, readings.shape)
+    return pd.DataFrame(readings, index=index, columns=sectors_df["Subsector"])
+
+
+def main():
+    script_dir = Path(__file__).parent
+    sectors_df = pd.read_csv(script_dir / "data" / "sectors.csv", sep=";")
+
+    index = interval_index()
+    streams = simulate_subsector_streams(sectors_df, index)
+
+    # Inject typical waste: compressors running through the nights of one
+    # week and the lights left on over a weekend
+    night_week = (index >= "2025-03-10") & (index < "2025-03-17") & ((index.hour < 6) | (index.hour >= 22))
+    streams.loc[night_week, "Compressed air"] *= 3.0
+    weekend = (index >= "2025-05-10") & (index < "2025-05-12")
+    streams.loc[weekend, "Lighting"] = streams["Lighting"].max()
+
+    detector = MeterAnomalyDetector(streams.columns)
+    events = detector.run(streams.index, streams.to_numpy())
+
+    print(f"Processed {len(index)} readings for {len(streams.columns)} meters")
+    if events.empty:
+        print("No anomalies flagged.")
+        return
+    summary = events.groupby(["Meter", "Type"]).agg(
+        Events=("Timestamp", "size"), First=("Timestamp", "min"), Last=("Timestamp", "max")
+    )
+    print(summary.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import argparse
+import csv
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+# --- Constants ---
+NEED = "Total need [kWh]"
+PV = "PV production [kWh]"
+BOUGHT = "Bought [kWh]"
+SELF_CONSUMED = "Self-consumed [kWh]"
+SOLD = "Sold [kWh]"
+ENERGY_COLUMNS = [NEED, PV, BOUGHT, SELF_CONSUMED, SOLD]
+
+# Identity name -> (left-hand column, right-hand columns)
+IDENTITIES = {
+    "need = bought + self-consumed": (NEED, [BOUGHT, SELF_CONSUMED]),
+    "pv = self-consumed + sold": (PV, [SELF_CONSUMED, SOLD]),
+}
+
+ABS_TOLERANCE_KWH = 0.5
+REL_TOLERANCE = 0.001
+CHUNK_ROWS = 1_000_000
+
+# Columns of the per period/meter summary, in validate_chunk order
+SUMMARY_COLUMNS = (
+    ["Rows"]
+    + [f"Violations {name}" for name in IDENTITIES]
+    + ["Violations negative value"]
+    + [f"Max |residual| {name} [kWh]" for name in IDENTITIES]
+)
+
+
+@dataclass
+class BalanceReport:
+    """Violation counts and residuals accumulated over all chunks."""
+
+    summary: Optional[pd.DataFrame] = None
+    metered_totals: Dict[str, float] = field(default_factory=dict)
+    rows: int = 0
+
+    def add(self, chunk_summary: pd.DataFrame, chunk_totals: pd.Series, rows: int) -> None:
+        if self.summary is None:
+            self.summary = chunk_summary
+        else:
+            combined = self.summary.add(chunk_summary, fill_value=0)
+            max_cols = [c for c in combined.columns if c.startswith("Max |residual|")]
+            combined[max_cols] = np.fmax(
+                self.summary[max_cols].reindex(combined.index),
+                chunk_summary[max_cols].reindex(combined.index),
+            )
+            self.summary = combined
+        for meter, total in chunk_totals.items():
+            self.metered_totals[meter] = self.metered_totals.get(meter, 0.0) + float(total)
+        self.rows += rows
+
+    def violations(self) -> pd.DataFrame:
+        """Only the (period, meter) groups with at least one violation."""
+        if self.summary is None:
+            index = pd.MultiIndex.from_arrays([[], []], names=["Period", "Meter"])
+            return pd.DataFrame(columns=SUMMARY_COLUMNS, index=index)
+        count_cols = [c for c in self.summary.columns if c.startswith("Violations")]
+        return self.summary[self.summary[count_cols].sum(axis=1) > 0]
+
+
+def _period_key(chunk: pd.DataFrame, time_column: str) -> pd.Series:
+    if time_column == "Month":
+        return chunk["Month"].astype(str)
+    # Truncate to months in datetime64 space; formatting per row is far slower
+    months = pd.to_datetime(chunk[time_column]).to_numpy().astype("datetime64[M]")
+    return pd.Series(months, index=chunk.index)
+
+
+def validate_chunk(chunk: pd.DataFrame, time_column: str, meter_column: Optional[str],
+                   abs_tol: float = ABS_TOLERANCE_KWH, rel_tol: float = REL_TOLERANCE):
+    """
+    Checks the balance identities on one chunk with array operations and
+    returns (per period/meter summary, metered need per meter).
+    """
+    values = {col: chunk[col].to_numpy(dtype=float) for col in ENERGY_COLUMNS}
+    group_keys = [_period_key(chunk, time_column).rename("Period")]
+    if meter_column:
+        group_keys.append(chunk[meter_column].astype(str).rename("Meter"))
+    else:
+        group_keys.append(pd.Series("ALL", index=chunk.index, name="Meter"))
+
+    columns = {"Rows": np.ones(len(chunk), dtype=np.int64)}
+    for name, (lhs, rhs) in IDENTITIES.items():
+        residual = values[lhs] - sum(values[col] for col in rhs)
+        tolerance = abs_tol + rel_tol * np.abs(values[lhs])
+        # NaN residuals count as violations: a missing reading breaks the identity
+        columns[f"Violations {name}"] = ~(np.abs(residual) <= tolerance)
+        columns[f"Max |residual| {name} [kWh]"] = np.abs(residual)
+    negatives = np.zeros(len(chunk), dtype=bool)
+    for col in ENERGY_COLUMNS:
+        negatives |= values[col] < -abs_tol
+    columns["Violations negative value"] = negatives
+
+    frame = pd.DataFrame(columns, index=chunk.index)
+    grouped = frame.groupby(group_keys, sort=False)
+    max_cols = [c for c in frame.columns if c.startswith("Max |residual|")]
+    summary = grouped[[c for c in frame.columns if c not in max_cols]].sum()
+    summary = summary.join(grouped[max_cols].max())
+    if time_column != "Month":
+        summary.index = summary.index.set_levels(
+            summary.index.levels[0].strftime("%Y-%m"), level="Period"
+        )
+    totals = pd.Series(values[NEED], index=chunk.index).groupby(group_keys[1]).sum()
+    return summary, totals
+
+
+def iter_chunks(file_path: Path, chunk_rows: int = CHUNK_ROWS) -> Iterable[pd.DataFrame]:
+    """Streams a ';' or ',' separated meter file in fixed-size chunks."""
+    with open(file_path, newline="") as handle:
+        delimiter = csv.Sniffer().sniff(handle.readline(), delimiters=";,").delimiter
+    yield from pd.read_csv(file_path, sep=delimiter, chunksize=chunk_rows)
+
+
+def validate_stream(chunks: Iterable[pd.DataFrame], time_column: Optional[str] = None,
+                    meter_column: Optional[str] = None, abs_tol: float = ABS_TOLERANCE_KWH,
+                    rel_tol: float = REL_TOLERANCE) -> BalanceReport:
+    """Validates every chunk as it arrives, keeping only the per-group summary in memory."""
+    report = BalanceReport()
+    for chunk in chunks:
+        if time_column is None:
+            time_column = "Month" if "Month" in chunk.columns else "Timestamp"
+        if meter_column is None and "Meter" in chunk.columns:
+            meter_column = "Meter"
+        summary, totals = validate_chunk(chunk, time_column, meter_column, abs_tol, rel_tol)
+        report.add(summary, totals, len(chunk))
+    return report
+
+
+def check_sector_totals(sectors_df: pd.DataFrame, metered_totals: Dict[str, float],
+                        rel_tol: float = 0.01) -> pd.DataFrame:
+    """
+    Compares sectors.csv against metered need. Meters named after a subsector
+    are compared one to one; the plant total is always compared.
+    """
+    declared = sectors_df.groupby("Subsector")["Consumption [kWh/year]"].sum()
+    rows = []
+    for subsector, value in declared.items():
+        if subsector in metered_totals:
+            rows.append((subsector, value, metered_totals[subsector]))
+    rows.append(("PLANT TOTAL", declared.sum(), sum(metered_totals.values())))
+
+    result = pd.DataFrame(rows, columns=["Subsector", "sectors.csv [kWh]", "Metered [kWh]"])
+    result["Difference [kWh]"] = result["Metered [kWh]"] - result["sectors.csv [kWh]"]
+    result["Difference [%]"] = result["Difference [kWh]"] / result["sectors.csv [kWh]"] * 100
+    result["OK"] = result["Difference [%]"].abs() <= rel_tol * 100
+    return result
+
+
+def main():
+    script_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Validate energy-balance identities in meter data.")
+    parser.add_argument("file", nargs="?", type=Path, default=script_dir / "data" / "montly_data.csv")
+    parser.add_argument("--sectors", type=Path, default=script_dir / "data" / "sectors.csv")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--abs-tol", type=float, default=ABS_TOLERANCE_KWH)
+    parser.add_argument("--rel-tol", type=float, default=REL_TOLERANCE)
+    args = parser.parse_args()
+
+    if not args.file.is_file():
+        print(f"File not found: {args.file}")
+        return
+
+    report = validate_stream(iter_chunks(args.file, args.chunk_rows), abs_tol=args.abs_tol, rel_tol=args.rel_tol)
+    pd.set_option("display.width", 160)
+    print(f"Validated {report.rows} rows from {args.file.name}")
+
+    violations = report.violations()
+    if violations.empty:
+        print("All balance identities hold within tolerance.")
+    else:
+        print(f"\n--- Violations by period and meter ({len(violations)} groups) ---")
+        print(violations.to_string())
+
+    sectors_df = pd.read_csv(args.sectors, sep=";")
+    print("\n--- sectors.csv vs metered totals ---")
+    print(check_sector_totals(sectors_df, report.metered_totals).round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from key_indicators import yearly_products
+from LCA import material_data
+from load_profiles import monthly_to_interval, pv_shape
+
+# --- Constants ---
+LOCATION_BASED = "Location-based [kgCO2e/kWh]"
+MARKET_BASED = "Market-based [kgCO2e/kWh]"
+
+# Indicative defaults used when no hourly factor file is available:
+# national grid average and supplier residual mix
+LOCATION_BASED_MEAN = 0.27
+MARKET_BASED_RESIDUAL_MIX = 0.46
+# Midday solar lowers the grid intensity, evening peaks raise it
+LOCATION_SOLAR_DIP = 0.35
+LOCATION_WINTER_UPLIFT = 0.15
+
+# Cradle-to-gate factors [kgCO2e/kg] for the LCA/material_data.py inventory.
+# Indicative database averages, to be replaced by supplier EPDs when available.
+MATERIAL_EMISSION_FACTORS = {
+    "Tempered glass": 1.35,
+    "Aluminium": 8.6,
+    "Stainless steel": 6.15,
+    "ZAMa (Zinc alloy)": 3.9,
+    "Brass (alloy of copper and zinc)": 4.8,
+    "PA (polyamide)": 9.0,
+    "PA+GF": 7.3,
+    "PC (polycarbonate)": 7.6,
+    "ABS (thermoplastic)": 3.8,
+    "PVC (Polyvinyl Chloride)": 3.1,
+    "Neodymium Magnet": 30.0,
+    "General materials": 2.0,
+    "Corrugated cardboard": 0.9,
+    "Polystyrène": 3.4,
+    "Hot melt adhesive": 2.5,
+    "Transparent PVC film": 3.1,
+}
+
+
+def default_emission_factors(index: pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    Synthetic hourly factors: the location-based series dips with solar
+    output and rises in winter, the market-based one is the flat residual mix.
+    """
+    solar = pv_shape(index)
+    winter = np.cos(2 * np.pi * (index.dayofyear.to_numpy() - 15) / 365.25)
+    location = LOCATION_BASED_MEAN * (1 - LOCATION_SOLAR_DIP * (solar - solar.mean())
+                                      + LOCATION_WINTER_UPLIFT * winter)
+    return pd.DataFrame(
+        {LOCATION_BASED: location, MARKET_BASED: MARKET_BASED_RESIDUAL_MIX}, index=index
+    )
+
+
+def load_emission_factors(file_path: Path, index: pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    Reads hourly factors (Timestamp;Location-based;Market-based) aligned to
+    index, falling back to the synthetic defaults when the file is missing.
+    """
+    if not file_path.is_file():
+        return default_emission_factors(index)
+    factors = pd.read_csv(file_path, sep=";", parse_dates=["Timestamp"], index_col="Timestamp")
+    return factors[[LOCATION_BASED, MARKET_BASED]].reindex(index).interpolate(limit_direction="both")
+
+
+@dataclass
+class OperationalEmissions:
+    """Annual emissions per site, year and accounting method [kgCO2e]."""
+
+    years: np.ndarray
+    bought: Dict[str, np.ndarray]  # method -> (sites, years)
+    # (sites, years) from energy sold, location-based only: market-based
+    # Scope 2 accounting gives no credit for exported electricity
+    avoided: Optional[np.ndarray]
+
+
+def operational_emissions(index: pd.DatetimeIndex, bought: np.ndarray, sold: np.ndarray,
+                          factors: Dict[str, np.ndarray]) -> OperationalEmissions:
+    """
+    Multiplies interval energy by hourly factors and sums per calendar year.
+    bought and sold are (sites, T); each factor series is (T,) or (sites, T).
+    Emissions avoided by export are reported under the location-based method
+    only, and are None when factors has no location-based series.
+    """
+    years, year_idx = np.unique(index.year.to_numpy(), return_inverse=True)
+    n_sites = bought.shape[0]
+
+    def per_year(values):
+        # One weighted bincount over a flattened (site, year) key
+        keys = (np.arange(n_sites)[:, None] * len(years) + year_idx[None, :]).ravel()
+        sums = np.bincount(keys, weights=values.ravel(), minlength=n_sites * len(years))
+        return sums.reshape(n_sites, len(years))
+
+    result_bought, avoided = {}, None
+    for method, factor in factors.items():
+        factor = np.broadcast_to(np.asarray(factor, dtype=float), bought.shape)
+        result_bought[method] = per_year(bought * factor)
+        if method == LOCATION_BASED:
+            avoided = per_year(sold * factor)
+    return OperationalEmissions(years, result_bought, avoided)
+
+
+def attribute_to_subsectors(site_emissions: np.ndarray, sectors_df: pd.DataFrame) -> pd.Series:
+    """Splits a site's purchased-electricity emissions by the sectors.csv consumption shares."""
+    shares = sectors_df["Consumption [kWh/year]"] / sectors_df["Consumption [kWh/year]"].sum()
+    return pd.Series(site_emissions * shares.to_numpy(), index=sectors_df["Subsector"])
+
+
+def material_footprint(data: Optional[Dict[str, float]] = None,
+                       factors: Dict[str, float] = MATERIAL_EMISSION_FACTORS) -> pd.DataFrame:
+    """
+    Embodied emissions per product from the LCA material inventory, by
+    material group. Raises ValueError for materials without an emission
+    factor, which would otherwise drop out of the footprint.
+    """
+    data = data or material_data.data
+    unmapped = [material for material in data if material not in factors]
+    if unmapped:
+        raise ValueError(f"No emission factor for: {', '.join(unmapped)}")
+    item_group = {item: group for group, items in material_data.groups.items() for item in items}
+    footprint = pd.DataFrame(
+        {"Material": list(data), "Weight [kg]": list(data.values())}
+    )
+    footprint["Group"] = footprint["Material"].map(item_group)
+    footprint["Emissions [kgCO2e/product]"] = footprint["Weight [kg]"] * footprint["Material"].map(factors)
+    return footprint
+
+
+def product_footprint(operational_kg: float, materials: pd.DataFrame,
+                      products: int = yearly_products) -> pd.Series:
+    """Combines material groups and operational electricity into kgCO2e per product."""
+    parts = materials.groupby("Group")["Emissions [kgCO2e/product]"].sum()
+    parts["Operational electricity"] = operational_kg / products
+    return parts.sort_values(ascending=False)
+
+
+def plot_product_footprint(footprints: Dict[str, pd.Series], filename: Path) -> None:
+    """Stacked bar of the per-product footprint, one bar per accounting method."""
+    frame = pd.DataFrame(footprints).fillna(0)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    left = np.zeros(frame.shape[1])
+    colors = plt.cm.tab20(np.linspace(0, 1, len(frame)))
+    for (component, row), color in zip(frame.iterrows(), colors):
+        ax.barh(frame.columns, row.to_numpy(), left=left, label=component, color=color, edgecolor="white")
+        left += row.to_numpy()
+    for y, total in enumerate(left):
+        ax.text(total, y, f" {total:.1f} kgCO2e", va="center", fontweight="bold")
+    ax.set_xlabel("kgCO2e per product", fontsize=12)
+    ax.set_title("Product Carbon Footprint: Materials + Operational Electricity", fontsize=14, fontweight="bold")
+    ax.legend(loc="center left", bbox_to_anchor=(1, 0.5), fontsize=9)
+    plt.tight_layout()
+    plt.savefig(filename, dpi=150, bbox_inches="tight")
+    plt.close(fig)
+    print(f"Saved {filename}")
+
+
+def main():
+    script_dir = Path(__file__).parent
+    monthly_df = pd.read_csv(script_dir / "data" / "montly_data.csv", sep=";")
+    sectors_df = pd.read_csv(script_dir / "data" / "sectors.csv", sep=";")
+
+    interval = monthly_to_interval(monthly_df)
+    factors = load_emission_factors(script_dir / "data" / "grid_emission_factors.csv", interval.index)
+    emissions = operational_emissions(
+        interval.index,
+        interval["Bought [kWh]"].to_numpy()[None, :],
+        interval["Sold [kWh]"].to_numpy()[None, :],
+        {method: factors[method].to_numpy() for method in (LOCATION_BASED, MARKET_BASED)},
+    )
+
+    print("--- Operational emissions (purchased electricity) ---")
+    for method in (LOCATION_BASED, MARKET_BASED):
+        name = method.split(" [")[0]
+        for y, year in enumerate(emissions.years):
+            line = f"{name} {year}: {emissions.bought[method][0, y] / 1000:,.1f} tCO2e"
+            if method == LOCATION_BASED:
+                line += f" (export avoids {emissions.avoided[0, y] / 1000:,.1f} tCO2e)"
+            print(line)
+
+    attribution = attribute_to_subsectors(emissions.bought[LOCATION_BASED][0, -1], sectors_df) / 1000
+    print("\n--- Location-based attribution by subsector [tCO2e] ---")
+    print(attribution.sort_values(ascending=False).round(1).to_string())
+
+    materials = material_footprint()
+    footprints = {
+        method.split(" [")[0]: product_footprint(emissions.bought[method][0, -1], materials)
+        for method in (LOCATION_BASED, MARKET_BASED)
+    }
+    print("\n--- Footprint per product [kgCO2e] ---")
+    print(pd.DataFrame(footprints).round(3).to_string())
+    plot_product_footprint(footprints, script_dir / "carbon_footprint_per_product.png")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
 import pandas as pd
 import os
 
-def print_data_summary(file_path):
+from pv_analysis import plot_energy_data
+from streaming_stats import SKETCH_ALPHA, inspect_file, profile_file
+
+PREVIEW_ROWS = 13
+
+def print_data_summary(file_path, workers=1):
     """
     Reads a CSV file and prints a summary of its content.
     """
@@ -10,26 +15,31 @@ def print_data_summary(file_path):
         return
 
     try:
-        # Read the CSV file
-        # Using sep=None to automatically detect separator (common issue with ; vs ,)
-        df = pd.read_csv(file_path, sep=None, engine='python')
-        
+        # Only the preview is loaded; the statistics are computed in one
+        # streaming pass, so files larger than memory can be profiled
+        layout = inspect_file(file_path)
+        preview = pd.read_csv(file_path, sep=layout.separator, nrows=PREVIEW_ROWS)
+
         print(f"\n{'='*40}")
         print(f"File: {os.path.basename(file_path)}")
         print(f"{'='*40}")
         
-        print("\n--- First 5 rows ---")
-        print(df.head(13))
+        print(f"\n--- First {PREVIEW_ROWS} rows ---")
+        print(preview)
         
-        print("\n--- Totals ---")
-        # Select only numeric columns for summation
-        numeric_df = df.select_dtypes(include=['number'])
-        if not numeric_df.empty:
-            totals = numeric_df.sum()
+        if layout.numeric:
+            profile = profile_file(file_path, workers=workers, layout=layout)
+            summary = profile.summary()
+            print("\n--- Summary statistics ---")
+            print(summary.drop(columns='sum').T)
+            print(f"Quantiles (q*) follow the np.quantile linear convention, within {SKETCH_ALPHA:.0%} relative error.")
+
+            print("\n--- Totals ---")
+            totals = summary['sum']
             print(totals)
             
             # Calculate yearly self-consumption if columns exist
-            if 'Self-consumed [kWh]' in df.columns and 'Total need [kWh]' in df.columns:
+            if 'Self-consumed [kWh]' in totals.index and 'Total need [kWh]' in totals.index:
                 total_self_consumed = totals['Self-consumed [kWh]']
                 total_need = totals['Total need [kWh]']
                 if total_need > 0:
@@ -39,8 +49,9 @@ def print_data_summary(file_path):
             print("No numeric columns to sum.")
             
         # Check if this is the monthly data file and plot it
+        # (twelve months, so the preview holds the whole file)
         if 'montly_data.csv' in file_path:
-             plot_monthly_data(df)
+            plot_energy_data(preview, 'Self-consumed [kWh]', 'Bought [kWh]', 'Monthly Energy Data')
         
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
@@ -0,0 +1,206 @@
+import hashlib
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from load_profiles import monthly_to_interval
+from pv_analysis import compute_energy_cost, compute_pv_balance
+
+# --- Constants ---
+CACHE_DIR = Path(__file__).parent / ".forecast_cache"
+FORECAST_COLUMNS = ["PV production [kWh]", "Total need [kWh]"]
+
+YEAR_DAYS = 365.25
+ANNUAL_HARMONICS = 3
+WEEKLY_HARMONICS = 2
+DAILY_HARMONICS = 3
+RIDGE = 1e-6
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """Regressors of the seasonal linear model: trend plus Fourier terms."""
+
+    trend: bool = True
+    annual_harmonics: int = ANNUAL_HARMONICS
+    weekly_harmonics: int = WEEKLY_HARMONICS
+    daily_harmonics: int = 0
+
+    @classmethod
+    def for_index(cls, timestamps: pd.DatetimeIndex) -> "FeatureSpec":
+        """Weekly terms for daily data, plus daily terms for sub-daily intervals."""
+        step = pd.Series(timestamps).diff().median()
+        if step > pd.Timedelta("1D"):
+            return cls(weekly_harmonics=0)
+        sub_daily = step < pd.Timedelta("1D")
+        return cls(daily_harmonics=DAILY_HARMONICS if sub_daily else 0)
+
+    def design_matrix(self, timestamps: pd.DatetimeIndex) -> np.ndarray:
+        days = (timestamps - pd.Timestamp("2000-01-01")).total_seconds().to_numpy() / 86400
+        columns = [np.ones_like(days)]
+        if self.trend:
+            columns.append(days / YEAR_DAYS)
+        for period, harmonics in ((YEAR_DAYS, self.annual_harmonics), (7.0, self.weekly_harmonics),
+                                  (1.0, self.daily_harmonics)):
+            for k in range(1, harmonics + 1):
+                angle = 2 * np.pi * k * days / period
+                columns.extend([np.sin(angle), np.cos(angle)])
+        return np.column_stack(columns)
+
+
+def solve_normal_equations(xtx: np.ndarray, xty: np.ndarray, ridge: float = RIDGE) -> np.ndarray:
+    """
+    Solves a stack of (k, k) normal-equation systems in one call.
+    xtx has shape (S, k, k) and xty (S, k); returns coefficients (S, k).
+    """
+    k = xtx.shape[-1]
+    scale = np.trace(xtx, axis1=-2, axis2=-1)[:, None, None] / k
+    regularized = xtx + ridge * np.maximum(scale, 1.0) * np.eye(k)
+    return np.linalg.solve(regularized, xty[..., None])[..., 0]
+
+
+def accumulate_normal_equations(x: np.ndarray, y: np.ndarray):
+    """
+    Normal-equation sums for many series sharing one design matrix.
+    y has shape (S, T) and may contain NaN for missing readings.
+    """
+    mask = ~np.isnan(y)
+    y = np.where(mask, y, 0.0)
+    xtx = np.einsum("st,tj,tk->sjk", mask.astype(float), x, x, optimize=True)
+    xty = y @ x
+    return xtx, xty, mask.sum(axis=1)
+
+
+class ForecastModelCache:
+    """
+    Fitted seasonal models for a set of series, persisted as normal-equation
+    sums with one entry per data window (series names, start and end).
+
+    A fit starts from the longest cached window ending within the new one
+    and only accumulates the rows after it, so the cost of an update scales
+    with the new data rather than the full history. Each entry stores a
+    digest of the rows it accumulated; entries whose rows have since been
+    revised are ignored.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(exist_ok=True)
+
+    def _series_key(self, names: List[str], spec: FeatureSpec, window_start: pd.Timestamp) -> str:
+        digest = hashlib.sha256(repr((list(names), spec, window_start.isoformat())).encode())
+        return digest.hexdigest()[:24]
+
+    @staticmethod
+    def _rows_digest(rows: pd.DataFrame) -> str:
+        digest = hashlib.sha256(rows.index.asi8.tobytes())
+        digest.update(np.ascontiguousarray(rows.to_numpy(dtype=float)).tobytes())
+        return digest.hexdigest()
+
+    def _load(self, key: str, frame: pd.DataFrame):
+        """Latest cached window of key ending within frame whose rows are unchanged."""
+        window_ends = sorted(
+            (int(path.stem.rsplit("-", 1)[1]) for path in self.cache_dir.glob(f"{key}-*.npz")), reverse=True
+        )
+        for window_end in window_ends:
+            if window_end > frame.index[-1].value:
+                continue
+            with np.load(self.cache_dir / f"{key}-{window_end}.npz") as stored:
+                cached = {name: stored[name] for name in stored.files}
+            if str(cached["digest"]) == self._rows_digest(frame.loc[:pd.Timestamp(window_end)]):
+                return cached
+        return None
+
+    def fit(self, frame: pd.DataFrame, spec: Optional[FeatureSpec] = None) -> "FittedForecast":
+        """
+        Fits one model per column of frame (indexed by timestamp) in a single
+        batched solve, reusing the cached sums for rows already seen.
+        """
+        frame = frame.sort_index()
+        spec = spec or FeatureSpec.for_index(frame.index)
+        names = list(frame.columns)
+        key = self._series_key(names, spec, frame.index[0])
+
+        cached = self._load(key, frame)
+        if cached is not None:
+            window_end = pd.Timestamp(int(cached["window_end"]))
+            new_rows = frame.loc[frame.index > window_end]
+            xtx, xty, n_obs = cached["xtx"], cached["xty"], cached["n_obs"]
+        else:
+            new_rows = frame
+            k = spec.design_matrix(frame.index[:1]).shape[1]
+            xtx = np.zeros((len(names), k, k))
+            xty = np.zeros((len(names), k))
+            n_obs = np.zeros(len(names), dtype=np.int64)
+
+        if len(new_rows):
+            d_xtx, d_xty, d_n = accumulate_normal_equations(
+                spec.design_matrix(new_rows.index), new_rows.to_numpy(dtype=float).T
+            )
+            xtx, xty, n_obs = xtx + d_xtx, xty + d_xty, n_obs + d_n
+            # Written beside the final path and renamed into place, so an
+            # interrupted run never leaves a truncated cache entry behind
+            cache_file = self.cache_dir / f"{key}-{frame.index[-1].value}.npz"
+            tmp_file = cache_file.with_suffix(".tmp")
+            with open(tmp_file, "wb") as handle:
+                np.savez(handle, xtx=xtx, xty=xty, n_obs=n_obs, window_end=frame.index[-1].value,
+                         digest=self._rows_digest(frame))
+            tmp_file.replace(cache_file)
+
+        coefficients = solve_normal_equations(xtx, xty)
+        return FittedForecast(names, spec, coefficients, n_obs, len(new_rows))
+
+
+@dataclass
+class FittedForecast:
+    names: List[str]
+    spec: FeatureSpec
+    coefficients: np.ndarray
+    n_obs: np.ndarray
+    rows_added: int
+
+    def predict(self, timestamps: pd.DatetimeIndex) -> pd.DataFrame:
+        """Forecasts every series at the given timestamps; energy cannot be negative."""
+        values = self.spec.design_matrix(timestamps) @ self.coefficients.T
+        return pd.DataFrame(np.clip(values, 0.0, None), index=timestamps, columns=self.names)
+
+
+def forecast_monthly_balance(forecast: pd.DataFrame, monthly_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregates a PV/need forecast to months and runs it through the PV
+    balance and cost calculations, using each calendar month's historical
+    self-consumption ratio from montly_data.csv.
+    """
+    monthly = forecast.resample("MS").sum()
+    ratio = (monthly_df["Self-consumed [kWh]"] / monthly_df["PV production [kWh]"]).to_numpy()
+    balance = compute_pv_balance(
+        monthly["Total need [kWh]"], monthly["PV production [kWh]"], ratio[monthly.index.month - 1]
+    )
+    balance.insert(0, "Month", monthly.index.strftime("%B %Y"))
+    return compute_energy_cost(balance).reset_index(drop=True)
+
+
+def main():
+    script_dir = Path(__file__).parent
+    monthly_df = pd.read_csv(script_dir / "data" / "montly_data.csv", sep=";")
+    daily = monthly_to_interval(monthly_df)[FORECAST_COLUMNS].resample("D").sum()
+
+    cache = ForecastModelCache()
+    # Fit on the first eleven months, then refresh once December arrives
+    first = cache.fit(daily.loc[:"2025-11-30"])
+    refreshed = cache.fit(daily)
+    print(f"Initial fit rows: {first.rows_added}, refresh rows: {refreshed.rows_added}")
+
+    horizon = pd.date_range("2026-01-01", "2026-03-31", freq="D")
+    forecast = refreshed.predict(horizon)
+    balance = forecast_monthly_balance(forecast, monthly_df)
+
+    pd.set_option("display.width", 160)
+    print("\n--- Forecast PV balance and cost ---")
+    print(balance.round(0).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -82,92 +82,98 @@ for task in tasks_data:
     task['Start'] = get_date_from_month(task['StartMonth'])
     task['End'] = get_end_date_from_month(task['EndMonth'])
 
-df = pd.DataFrame(tasks_data)
-
-# Convert for Matplotlib
-df['Start_num'] = df['Start'].apply(mdates.date2num)
-df['End_num'] = df['End'].apply(mdates.date2num)
-df['Duration'] = df['End_num'] - df['Start_num']
-
-# --- Styling ---
-phase_colors = {
-    'Infrastructure': '#1f77b4',  # Blue
-    'Optimization': '#ff7f0e',    # Orange
-    'Advanced': '#2ca02c',        # Green
-    'Certification': '#d62728'    # Red
-}
-df['Color'] = df['Phase'].map(phase_colors)
-
-# Reverse order for Gantt (Top = First item in list)
-df = df.iloc[::-1].reset_index(drop=True)
-
 # Helper to look up current index by Task Name substring
-def get_idx(task_str):
+def get_idx(df, task_str):
     # Splits "T1: ..." to match "T1"
     matches = df[df['Task'].str.startswith(task_str)]
     if not matches.empty:
         return matches.index[0]
     return None
 
-# --- Plotting ---
-fig, ax = plt.subplots(figsize=(14, 9)) # Increased height for more tasks
-
-# Create bars
-bars = ax.barh(
-    y=df.index,
-    width=df['Duration'],
-    left=df['Start_num'],
-    color=df['Color'],
-    edgecolor='black',
-    height=0.6,
-    alpha=0.9
-)
-
-# Text Labels
-for i, row in df.iterrows():
-    # Task Name
-    ax.text(
-        x=row['Start_num'], 
-        y=i + 0.35, 
-        s=f" {row['Task']}", 
-        va='bottom', ha='left', 
-        fontweight='bold', fontsize=11
-    )
-    # Description
-    ax.text(
-        x=row['Start_num'] + 5, 
-        y=i, 
-        s=f"{row['Desc']}", 
-        va='center', ha='left', 
-        color='white', fontsize=9, fontstyle='italic'
-    )
 
-# --- Formatting ---
-ax.set_title('2026–2029 Strategic Energy Plan', fontsize=16, fontweight='bold', pad=20)
-ax.set_xlabel('Timeline', fontsize=12)
+def main():
+    df = pd.DataFrame(tasks_data)
 
-# Date Axis
-ax.xaxis.set_major_locator(mdates.YearLocator())
-ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-ax.xaxis.set_minor_locator(mdates.MonthLocator(interval=3))
-plt.xticks(fontsize=11)
+    # Convert for Matplotlib
+    df['Start_num'] = df['Start'].apply(mdates.date2num)
+    df['End_num'] = df['End'].apply(mdates.date2num)
+    df['Duration'] = df['End_num'] - df['Start_num']
 
-# Remove Y Axis ticks
-ax.set_yticks([])
-
-# Grid
-ax.grid(axis='x', linestyle='--', alpha=0.5)
-
-# Limits
-start_lim = mdates.date2num(datetime(2025, 12, 1)) # Start roughly nearby Jan 2026
-end_lim = mdates.date2num(datetime(2029, 1, 31)) # End Jan 2029 (36 months after start)
-ax.set_xlim(start_lim, end_lim)
-
-# Legend
-handles = [plt.Rectangle((0,0),1,1, color=color) for color in phase_colors.values()]
-ax.legend(handles, phase_colors.keys(), loc='upper right', title="Phases")
+    # --- Styling ---
+    phase_colors = {
+        'Infrastructure': '#1f77b4',  # Blue
+        'Optimization': '#ff7f0e',    # Orange
+        'Advanced': '#2ca02c',        # Green
+        'Certification': '#d62728'    # Red
+    }
+    df['Color'] = df['Phase'].map(phase_colors)
+
+    # Reverse order for Gantt (Top = First item in list)
+    df = df.iloc[::-1].reset_index(drop=True)
+
+    # --- Plotting ---
+    fig, ax = plt.subplots(figsize=(14, 9)) # Increased height for more tasks
+
+    # Create bars
+    bars = ax.barh(
+        y=df.index,
+        width=df['Duration'],
+        left=df['Start_num'],
+        color=df['Color'],
+        edgecolor='black',
+        height=0.6,
+        alpha=0.9
+    )
 
-plt.tight_layout()
-filename = 'strategic_energy_plan_gantt.png'
-plt.savefig(filename, dpi=300)
-print(f"Saved {filename}")
\ No newline at end of file
+    # Text Labels
+    for i, row in df.iterrows():
+        # Task Name
+        ax.text(
+            x=row['Start_num'], 
+            y=i + 0.35, 
+            s=f" {row['Task']}", 
+            va='bottom', ha='left', 
+            fontweight='bold', fontsize=11
+        )
+        # Description
+        ax.text(
+            x=row['Start_num'] + 5, 
+            y=i, 
+            s=f"{row['Desc']}", 
+            va='center', ha='left', 
+            color='white', fontsize=9, fontstyle='italic'
+        )
+
+    # --- Formatting ---
+    ax.set_title('2026–2029 Strategic Energy Plan', fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlabel('Timeline', fontsize=12)
+
+    # Date Axis
+    ax.xaxis.set_major_locator(mdates.YearLocator())
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
+    ax.xaxis.set_minor_locator(mdates.MonthLocator(interval=3))
+    plt.xticks(fontsize=11)
+
+    # Remove Y Axis ticks
+    ax.set_yticks([])
+
+    # Grid
+    ax.grid(axis='x', linestyle='--', alpha=0.5)
+
+    # Limits
+    start_lim = mdates.date2num(datetime(2025, 12, 1)) # Start roughly nearby Jan 2026
+    end_lim = mdates.date2num(datetime(2029, 1, 31)) # End Jan 2029 (36 months after start)
+    ax.set_xlim(start_lim, end_lim)
+
+    # Legend
+    handles = [plt.Rectangle((0,0),1,1, color=color) for color in phase_colors.values()]
+    ax.legend(handles, phase_colors.keys(), loc='upper right', title="Phases")
+
+    plt.tight_layout()
+    filename = 'strategic_energy_plan_gantt.png'
+    plt.savefig(filename, dpi=300)
+    print(f"Saved {filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,6 @@ import os
 # Get the directory of the current script
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
-# Read risk data
-risk_db = pd.read_csv(os.path.join(script_dir, "risk_table.csv"), skiprows=2)
-
 impact_bins = [0, 16 / 3, 2 * 16 / 3, 16]
 likelihood_bins = [0, 5 / 3, 2 * 5 / 3, 5]
 
@@ -46,43 +43,65 @@ likelihood_centers = [
     likelihood_bins[2] + (likelihood_bins[3] - likelihood_bins[2]) / 2,
 ]
 
-fig = go.Figure(
-    data=go.Heatmap(
-        z=risk_matrix_values,
-        x=impact_centers,
-        y=likelihood_centers,
-        colorscale="RdYlGn_r",
-        zsmooth="best",
-        colorbar=dict(
-            tickvals=[0, 1, 2],
-            ticktext=["Low Risk", "Medium Risk", "High Risk"],
-            title="Risk Level",
-        ),
-        showscale=False,
+def load_risk_table(file_path):
+    """Loads the risk register, skipping the two blank padding rows."""
+    risk_db = pd.read_csv(file_path, skiprows=2)
+    # The register is column-aligned with spaces, so trim headers and cells
+    risk_db.columns = risk_db.columns.str.strip()
+    for column in risk_db.select_dtypes(include=["object", "string"]).columns:
+        risk_db[column] = risk_db[column].str.strip()
+    return risk_db
+
+
+def create_risk_heatmap_figure(risk_db):
+    """Builds the risk heat map with one marker per risk in the register."""
+    fig = go.Figure(
+        data=go.Heatmap(
+            z=risk_matrix_values,
+            x=impact_centers,
+            y=likelihood_centers,
+            colorscale="RdYlGn_r",
+            zsmooth="best",
+            colorbar=dict(
+                tickvals=[0, 1, 2],
+                ticktext=["Low Risk", "Medium Risk", "High Risk"],
+                title="Risk Level",
+            ),
+            showscale=False,
+        )
     )
-)
 
-# Add scatter plot for each risk
-for index, row in risk_db.iterrows():
-    fig.add_trace(
-        go.Scatter(
-            x=[row["Impact (1-16)"]],
-            y=[row["Likelihood (1-5)"]],
-            mode="markers+text",
-            text=[row["Ref ID"]],
-            textposition="top center",
-            marker=dict(size=10),
-            name=row["Risk Description"],
+    # Add scatter plot for each risk
+    for _, row in risk_db.iterrows():
+        fig.add_trace(
+            go.Scatter(
+                x=[row["Impact (1-16)"]],
+                y=[row["Likelihood (1-5)"]],
+                mode="markers+text",
+                text=[row["Ref ID"]],
+                textposition="top center",
+                marker=dict(size=10),
+                name=row["Risk Description"],
+            )
         )
+
+    fig.update_layout(
+        title="Risk Heat Map",
+        xaxis_title="Impact",
+        yaxis_title="Likelihood",
+        xaxis=dict(showticklabels=False, showgrid=False, zeroline=False, range=[0, 16]),
+        yaxis=dict(showticklabels=False, showgrid=False, zeroline=False, range=[0, 5]),
+        showlegend=True,
     )
 
-fig.update_layout(
-    title="Risk Heat Map",
-    xaxis_title="Impact",
-    yaxis_title="Likelihood",
-    xaxis=dict(showticklabels=False, showgrid=False, zeroline=False, range=[0, 16]),
-    yaxis=dict(showticklabels=False, showgrid=False, zeroline=False, range=[0, 5]),
-    showlegend=True,
-)
+    return fig
+
+
+def main():
+    risk_db = load_risk_table(os.path.join(script_dir, "risk_table.csv"))
+    fig = create_risk_heatmap_figure(risk_db)
+    fig.show()
+
 
-fig.show()
+if __name__ == "__main__":
+    main()
@@ -2,44 +2,60 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from results_store import ResultsStore, record_sector_kpis
+
 # data definition
 sectors_path = Path(__file__).parent / "data" / "sectors.csv"
-sectors_df = pd.read_csv(sectors_path, sep=";")
 
 yearly_products = 251184
+reporting_year = 2025
+
 
 # calculation
-consumption_per_product = sectors_df
-consumption_per_product["Consumption [kWh/product]"] = (
-    consumption_per_product["Consumption [kWh/year]"] / yearly_products
-)
-
-consumption_per_product = consumption_per_product.sort_values(
-    by="Consumption [kWh/product]", ascending=False
-)
-
-consumption_per_product.to_csv(
-    Path(__file__).parent / "data" / "consumption_per_product.csv", index=False
-)
-
-# visualization
-plt.figure(figsize=(12, 7))
-colors = plt.cm.viridis(
-    consumption_per_product["Consumption [kWh/product]"]
-    / consumption_per_product["Consumption [kWh/product]"].max()
-)
-plt.bar(
-    consumption_per_product["Subsector"],
-    consumption_per_product["Consumption [kWh/product]"] * 1000,
-    color=colors,
-)
-plt.xlabel("Subsector")
-plt.ylabel("Consumption [Wh/product]")
-plt.title("Consumption per Product by Subsector")
-plt.xticks(rotation=45, ha="right")
-plt.tight_layout()
-
-plt.show()
-
-total_consumption = consumption_per_product["Consumption [kWh/product]"]
-print("Total Consumption [kWh/product]:", total_consumption.sum())
+def compute_consumption_per_product(sectors_df, yearly_products=yearly_products):
+    """Adds the specific consumption per product and sorts subsectors by it."""
+    consumption_per_product = sectors_df.copy()
+    consumption_per_product["Consumption [kWh/product]"] = (
+        consumption_per_product["Consumption [kWh/year]"] / yearly_products
+    )
+    return consumption_per_product.sort_values(
+        by="Consumption [kWh/product]", ascending=False
+    )
+
+
+def main():
+    sectors_df = pd.read_csv(sectors_path, sep=";")
+    consumption_per_product = compute_consumption_per_product(sectors_df)
+
+    # The CSV is kept for existing readers; the store keeps the history per run
+    consumption_per_product.to_csv(
+        Path(__file__).parent / "data" / "consumption_per_product.csv", index=False
+    )
+    with ResultsStore() as store:
+        record_sector_kpis(store, consumption_per_product, reporting_year)
+
+    # visualization
+    plt.figure(figsize=(12, 7))
+    colors = plt.cm.viridis(
+        consumption_per_product["Consumption [kWh/product]"]
+        / consumption_per_product["Consumption [kWh/product]"].max()
+    )
+    plt.bar(
+        consumption_per_product["Subsector"],
+        consumption_per_product["Consumption [kWh/product]"] * 1000,
+        color=colors,
+    )
+    plt.xlabel("Subsector")
+    plt.ylabel("Consumption [Wh/product]")
+    plt.title("Consumption per Product by Subsector")
+    plt.xticks(rotation=45, ha="right")
+    plt.tight_layout()
+
+    plt.show()
+
+    total_consumption = consumption_per_product["Consumption [kWh/product]"]
+    print("Total Consumption [kWh/product]:", total_consumption.sum())
+
+
+if __name__ == "__main__":
+    main()
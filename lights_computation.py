@@ -2,6 +2,8 @@ import numpy as np
 import pandas as pd
 import os
 
+from results_store import ResultsStore, record_lighting_kpis
+
 ##difine the variables
 Ground_floor_power = 31.86
 First_floor_power = 33.66
@@ -11,6 +13,7 @@ ground_first_M_T_time = 16 * 4
 ground_first_F_time = 6
 second_M_T_time = 11 * 4
 second_F_time = 5
+reporting_year = 2025
 
 # compute the power consumption
 
@@ -60,3 +63,7 @@ output_path = os.path.join(script_dir, "lights_power_consumption.csv")
 
 results_df.to_csv(output_path, index=False)
 print(f"\nResults saved to {output_path}")
+
+with ResultsStore() as store:
+    record_lighting_kpis(store, results_df, reporting_year)
+print("Results recorded in the KPI results store")
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+# --- Constants ---
+# Reference year for synthetic interval profiles built from the monthly data
+PROFILE_YEAR = 2025
+
+# Production shifts, matching the lighting schedule in lights_computation.py:
+# 16 h/day Monday-Thursday and 6 h on Friday
+SHIFT_START_HOUR = 6
+SHIFT_END_HOUR = 22
+FRIDAY_END_HOUR = 12
+
+# Share of the production-hours load that remains outside production
+BASE_LOAD_LEVEL = 0.25
+
+# Approximate sunrise/sunset hour per month for the PV shape
+DAYLIGHT_HOURS = {
+    1: (7.5, 17.0), 2: (7.0, 17.75), 3: (6.25, 18.5), 4: (6.5, 20.0),
+    5: (5.75, 20.5), 6: (5.5, 21.0), 7: (5.75, 21.0), 8: (6.25, 20.5),
+    9: (7.0, 19.5), 10: (7.5, 18.5), 11: (7.25, 16.75), 12: (7.75, 16.5),
+}
+
+
+def interval_index(year=PROFILE_YEAR, freq="h"):
+    """Returns the interval start timestamps covering one calendar year."""
+    return pd.date_range(f"{year}-01-01", f"{year + 1}-01-01", freq=freq, inclusive="left")
+
+
+def production_shape(index, base_level=BASE_LOAD_LEVEL):
+    """
+    Relative load shape: 1.0 during production shifts, base_level otherwise.
+    """
+    hour = index.hour + index.minute / 60
+    weekday = index.dayofweek
+    in_shift = (weekday < 4) & (hour >= SHIFT_START_HOUR) & (hour < SHIFT_END_HOUR)
+    in_shift |= (weekday == 4) & (hour >= SHIFT_START_HOUR) & (hour < FRIDAY_END_HOUR)
+    return np.where(in_shift, 1.0, base_level)
+
+
+def pv_shape(index):
+    """Relative PV output shape: a half-sine between sunrise and sunset."""
+    hour = np.asarray(index.hour + index.minute / 60, dtype=float)
+    daylight = np.array([DAYLIGHT_HOURS[m] for m in range(1, 13)])
+    sunrise, sunset = daylight[index.month - 1].T
+    phase = (hour - sunrise) / (sunset - sunrise)
+    return np.where((phase > 0) & (phase < 1), np.sin(np.pi * np.clip(phase, 0, 1)), 0.0)
+
+
+def disaggregate_monthly(monthly_values, index, shape):
+    """
+    Spreads 12 monthly totals over the intervals of index, proportionally to
+    shape, so that every month sums exactly to its monthly total.
+    """
+    month_idx = index.month.to_numpy() - 1
+    shape = np.asarray(shape, dtype=float)
+    month_weight = np.bincount(month_idx, weights=shape, minlength=12)
+    monthly_values = np.asarray(monthly_values, dtype=float)
+    return shape * (monthly_values / np.where(month_weight > 0, month_weight, 1.0))[month_idx]
+
+
+def disaggregate_capped(monthly_values, index, shape, cap):
+    """
+    Like disaggregate_monthly, but no interval exceeds cap. The excess over
+    the cap is redistributed within the same month over the intervals with
+    headroom, proportionally to it, so monthly totals are still met exactly.
+    Raises ValueError when a monthly total exceeds the month's summed cap.
+    """
+    month_idx = index.month.to_numpy() - 1
+    monthly_values = np.asarray(monthly_values, dtype=float)
+    capacity = np.bincount(month_idx, weights=cap, minlength=12)
+    infeasible = monthly_values > capacity * (1 + 1e-9)
+    if infeasible.any():
+        months = ", ".join(str(m + 1) for m in np.flatnonzero(infeasible))
+        raise ValueError(f"Monthly total exceeds the interval cap in month(s) {months}")
+
+    values = np.minimum(disaggregate_monthly(monthly_values, index, shape), cap)
+    headroom = cap - values
+    remainder = monthly_values - np.bincount(month_idx, weights=values, minlength=12)
+    room = np.bincount(month_idx, weights=headroom, minlength=12)
+    # remainder <= room, so every interval receives at most its headroom
+    fill = np.where(room > 0, remainder / np.where(room > 0, room, 1.0), 0.0)
+    return values + headroom * np.minimum(fill, 1.0)[month_idx]
+
+
+def widen_overlap(pv, need, index, required):
+    """
+    Moves PV within each month from surplus intervals (PV above need) to
+    daylight intervals where need exceeds PV, until the monthly overlap
+    min(need, PV) reaches required. Monthly PV totals are unchanged; months
+    already covering required are left as they are.
+    """
+    month_idx = index.month.to_numpy() - 1
+    overlap = np.bincount(month_idx, weights=np.minimum(need, pv), minlength=12)
+    shortfall = np.maximum(np.asarray(required, dtype=float) - overlap, 0.0)
+    if not shortfall.any():
+        return pv
+    surplus = np.maximum(pv - need, 0.0)
+    deficit = np.where(pv > 0, np.maximum(need - pv, 0.0), 0.0)
+    surplus_total = np.bincount(month_idx, weights=surplus, minlength=12)
+    deficit_total = np.bincount(month_idx, weights=deficit, minlength=12)
+    if np.any(shortfall > np.minimum(surplus_total, deficit_total) * (1 + 1e-9)):
+        raise ValueError("Self-consumption cannot fit under the need and PV profiles")
+    # Each moved kWh stays within the surplus/deficit, so raises the overlap by one kWh
+    take = shortfall / np.where(surplus_total > 0, surplus_total, 1.0)
+    give = shortfall / np.where(deficit_total > 0, deficit_total, 1.0)
+    return pv - surplus * take[month_idx] + deficit * give[month_idx]
+
+
+def monthly_to_interval(monthly_df, year=PROFILE_YEAR, freq="h"):
+    """
+    Builds an interval DataFrame with the montly_data.csv columns from the
+    monthly totals, which every column preserves. Need follows the
+    production shape and PV the daylight shape; self-consumption follows the
+    overlap of the two and never exceeds it, so the balance identities hold
+    in every interval. In months where the shapes overlap less than the
+    metered self-consumption, part of the PV surplus is moved into daylight
+    hours with unmet need first.
+    """
+    index = interval_index(year, freq)
+    need = disaggregate_monthly(monthly_df["Total need [kWh]"], index, production_shape(index))
+    pv = disaggregate_monthly(monthly_df["PV production [kWh]"], index, pv_shape(index))
+    pv = widen_overlap(pv, need, index, monthly_df["Self-consumed [kWh]"])
+    overlap = np.minimum(need, pv)
+    self_consumed = disaggregate_capped(monthly_df["Self-consumed [kWh]"], index, overlap, overlap)
+    return pd.DataFrame(
+        {
+            "Total need [kWh]": need,
+            "PV production [kWh]": pv,
+            "Bought [kWh]": need - self_consumed,
+            "Self-consumed [kWh]": self_consumed,
+            "Sold [kWh]": pv - self_consumed,
+        },
+        index=index,
+    )
@@ -0,0 +1,219 @@
+import itertools
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List
+
+from gannt import tasks_data
+from pv_analysis import FEED_IN_PRICE_EUR_PER_KWH, GRID_PRICE_EUR_PER_KWH
+
+# --- Constants ---
+DISCOUNT_RATE = 0.06
+LIFETIME_YEARS = 10
+
+# Efficiency measures of the strategic plan (gannt.py T2-T5). Each level is
+# (savings fraction, capex in EUR); subsector weights scale the savings
+# fraction for subsectors only partly covered by the measure.
+MEASURES = [
+    {
+        'Task': 'T2',
+        'Subsectors': {'Compressed air': 1.0},
+        'Levels': [(0.10, 12000), (0.17, 25000), (0.25, 45000)],
+    },
+    {
+        'Task': 'T3',
+        'Subsectors': {'Movement systems': 1.0, 'Automatic warehouse': 0.6},
+        'Levels': [(0.08, 50000), (0.15, 95000), (0.22, 150000)],
+    },
+    {
+        'Task': 'T4',
+        'Subsectors': {
+            'Pumping system': 1.0,
+            'UTA gluing area': 0.6,
+            'UTA offices': 0.6,
+            'UTA canteen': 0.6,
+            'Environmental heating': 0.8,
+        },
+        'Levels': [(0.10, 70000), (0.20, 130000), (0.30, 200000)],
+    },
+    {
+        # Load shifting does not cut consumption; its level is the share of
+        # exported PV energy moved into self-consumption
+        'Task': 'T5',
+        'Subsectors': {},
+        'Levels': [(0.15, 15000), (0.30, 30000), (0.45, 50000)],
+    },
+]
+
+# Part of T4's heating savings comes from compressor heat recovery, which
+# shrinks when T2 cuts compressed-air consumption
+INTERACTIONS = [
+    {'Measure': 'T4', 'Modifier': 'T2', 'Subsector': 'Environmental heating', 'Coefficient': 0.5},
+]
+
+# Loads that can be moved into PV hours by T5
+SHIFTABLE_SUBSECTORS = {'Movement systems': 0.3, 'Compressed air': 0.3, 'Automatic warehouse': 0.4}
+
+
+def plan_dependencies(measures: List[Dict]) -> Dict[str, List[str]]:
+    """Dependencies between the evaluated measures, taken from the Gantt plan."""
+    evaluated = {m['Task'] for m in measures}
+    deps = {}
+    for task in tasks_data:
+        task_id = task['Task'].split(':')[0]
+        if task_id in evaluated:
+            deps[task_id] = [d for d in task['Dependency'] if d in evaluated]
+    return deps
+
+
+def _level_values(measure: Dict) -> np.ndarray:
+    """Savings fraction per level, with index 0 meaning 'not implemented'."""
+    return np.array([0.0] + [level[0] for level in measure['Levels']])
+
+
+def _level_capex(measure: Dict) -> np.ndarray:
+    return np.array([0.0] + [level[1] for level in measure['Levels']])
+
+
+def _axis_shape(n_measures: int, axis: int, size: int, trailing: int = 0) -> tuple:
+    shape = [1] * n_measures + [1] * trailing
+    shape[axis] = size
+    return tuple(shape)
+
+
+def remaining_consumption_factors(measures: List[Dict], subsectors: List[str],
+                                  interactions: List[Dict] = INTERACTIONS) -> np.ndarray:
+    """
+    Remaining share of each subsector's consumption for every combination of
+    measure levels, shape (L_1 + 1, ..., L_M + 1, subsectors).
+
+    Measures acting on the same subsector combine multiplicatively. The grid
+    is built as a running product: each measure's factors multiply the
+    partial product of the measures before it once and are broadcast over
+    all of their level combinations, so the full grid costs one pass over
+    its own size instead of one evaluation per combination.
+    """
+    n = len(measures)
+    index = {m['Task']: i for i, m in enumerate(measures)}
+    sub_index = {name: j for j, name in enumerate(subsectors)}
+    product = np.ones(_axis_shape(n, 0, 1, trailing=1))
+
+    for i, measure in enumerate(measures):
+        savings = _level_values(measure)
+        weights = np.zeros(len(subsectors))
+        for name, weight in measure['Subsectors'].items():
+            if name in sub_index:
+                weights[sub_index[name]] = weight
+        cut = savings.reshape(_axis_shape(n, i, len(savings), 1)) * weights
+
+        for rule in interactions:
+            if rule['Measure'] != measure['Task'] or rule['Subsector'] not in sub_index:
+                continue
+            mod = measures[index[rule['Modifier']]]
+            mod_savings = _level_values(mod).reshape(_axis_shape(n, index[rule['Modifier']], len(mod['Levels']) + 1, 1))
+            mask = np.zeros(len(subsectors))
+            mask[sub_index[rule['Subsector']]] = 1.0
+            cut = cut * (1 - rule['Coefficient'] * mod_savings * mask)
+
+        product = product * (1 - cut)
+    return product
+
+
+def evaluate_portfolio(measures: List[Dict], sectors_df: pd.DataFrame, monthly_df: pd.DataFrame,
+                       grid_price: float = GRID_PRICE_EUR_PER_KWH,
+                       feed_in_price: float = FEED_IN_PRICE_EUR_PER_KWH,
+                       discount_rate: float = DISCOUNT_RATE,
+                       lifetime: int = LIFETIME_YEARS) -> pd.DataFrame:
+    """Savings, NPV and payback for every combination of measures and levels."""
+    subsectors = sectors_df['Subsector'].tolist()
+    baseline = sectors_df['Consumption [kWh/year]'].to_numpy(dtype=float)
+    n = len(measures)
+
+    remaining = remaining_consumption_factors(measures, subsectors)
+    grid_shape = tuple(len(m['Levels']) + 1 for m in measures)
+    remaining = np.broadcast_to(remaining, grid_shape + (len(subsectors),))
+    saved_kwh = ((1 - remaining) * baseline).sum(axis=-1)
+
+    # Saved energy comes out of purchases and self-consumption in proportion;
+    # the displaced self-consumption is exported instead
+    need = monthly_df['Total need [kWh]'].sum()
+    self_share = monthly_df['Self-consumed [kWh]'].sum() / need
+    sold_after = monthly_df['Sold [kWh]'].sum() + saved_kwh * self_share
+    bought_reduction = saved_kwh * (1 - self_share)
+    savings_eur = bought_reduction * grid_price + saved_kwh * self_share * feed_in_price
+
+    # Load shifting, limited by the shiftable load left after the other measures
+    shift_share = np.zeros(grid_shape)
+    for i, measure in enumerate(measures):
+        if not measure['Subsectors']:
+            shift_share = shift_share + _level_values(measure).reshape(_axis_shape(n, i, grid_shape[i]))
+    shiftable = sum(
+        remaining[..., subsectors.index(name)] * baseline[subsectors.index(name)] * share
+        for name, share in SHIFTABLE_SUBSECTORS.items() if name in subsectors
+    )
+    shifted_kwh = np.minimum(shift_share * sold_after, shiftable)
+    bought_reduction = bought_reduction + shifted_kwh
+    savings_eur = savings_eur + shifted_kwh * (grid_price - feed_in_price)
+
+    capex = sum(
+        _level_capex(m).reshape(_axis_shape(n, i, grid_shape[i])) for i, m in enumerate(measures)
+    ) + np.zeros(grid_shape)
+    annuity = (1 - (1 + discount_rate) ** -lifetime) / discount_rate
+    npv = savings_eur * annuity - capex
+
+    combos = np.array(list(itertools.product(*[range(s) for s in grid_shape])))
+    result = pd.DataFrame({m['Task']: combos[:, i] for i, m in enumerate(measures)})
+    result['Savings [kWh/year]'] = saved_kwh.ravel()
+    result['Bought reduction [kWh/year]'] = bought_reduction.ravel()
+    result['Savings [EUR/year]'] = savings_eur.ravel()
+    result['Capex [EUR]'] = capex.ravel()
+    result['NPV [EUR]'] = npv.ravel()
+    result['Payback [years]'] = np.where(
+        result['Savings [EUR/year]'] > 0, result['Capex [EUR]'] / result['Savings [EUR/year]'], np.inf
+    )
+
+    deps = plan_dependencies(measures)
+    feasible = np.ones(len(result), dtype=bool)
+    for task, required in deps.items():
+        for dep in required:
+            feasible &= ~((result[task] > 0) & (result[dep] == 0))
+    result['Feasible'] = feasible
+    result['Frontier'] = pareto_frontier(result)
+    return result
+
+
+def pareto_frontier(result: pd.DataFrame) -> np.ndarray:
+    """Feasible portfolios that no cheaper portfolio beats on kWh saved."""
+    frontier = np.zeros(len(result), dtype=bool)
+    candidates = result[result['Feasible']].sort_values(['Capex [EUR]', 'Savings [kWh/year]'],
+                                                        ascending=[True, False])
+    best = -np.inf
+    for idx, saved in zip(candidates.index, candidates['Savings [kWh/year]']):
+        if saved > best:
+            frontier[idx] = True
+            best = saved
+    return frontier
+
+
+def main():
+    script_dir = Path(__file__).parent
+    sectors_df = pd.read_csv(script_dir / 'data' / 'sectors.csv', sep=';')
+    monthly_df = pd.read_csv(script_dir / 'data' / 'montly_data.csv', sep=';')
+
+    result = evaluate_portfolio(MEASURES, sectors_df, monthly_df)
+    total = sectors_df['Consumption [kWh/year]'].sum()
+    print(f"Evaluated {len(result)} portfolios ({result['Feasible'].sum()} feasible)")
+
+    frontier = result[result['Frontier']].sort_values('Capex [EUR]').copy()
+    frontier['Savings [% of plant]'] = frontier['Savings [kWh/year]'] / total * 100
+    pd.set_option('display.width', 200)
+    print("\n--- Capex / kWh frontier (level 0 = not implemented) ---")
+    print(frontier.round(1).to_string(index=False))
+
+    best = result[result['Feasible']].sort_values('NPV [EUR]', ascending=False).head(5)
+    print("\n--- Highest NPV portfolios ---")
+    print(best.round(1).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
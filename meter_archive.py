@@ -0,0 +1,277 @@
+import argparse
+import json
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from key_indicators import compute_consumption_per_product
+from load_profiles import PROFILE_YEAR, interval_index, monthly_to_interval
+from multi_site import MONTHLY_COLUMNS, MONTHS, load_group
+from peak_analytics import subsector_profiles
+from sankey import prepare_sankey_data
+
+# --- Constants ---
+ARCHIVE_DIR = Path(__file__).parent / ".meter_archive"
+META_FILE = "meta.json"
+TIMESTAMP_FILE = "timestamps.i64"
+TIMESTAMP_DTYPE = "datetime64[s]"
+VALUE_DTYPE = np.float64
+BLOCK_ROWS = 4096
+# Per-block summary columns of every meter
+SUMMARY_FIELDS = ["min", "max", "sum"]
+SUBSECTOR_PREFIX = "Subsector/"
+
+
+def _slug(name: str, taken: set) -> str:
+    base = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_").lower() or "meter"
+    slug, n = base, 1
+    while slug in taken:
+        n += 1
+        slug = f"{base}_{n}"
+    return slug
+
+
+class MeterArchive:
+    """
+    Append-only columnar archive of one site's interval readings.
+
+    Layout: a sorted int64 timestamp file, one float64 file per meter and a
+    per-meter file of block summaries (min, max, sum per BLOCK_ROWS rows).
+    meta.json holds the meter list and the committed row count; it is
+    rewritten last on every append, so readers never see a half-written
+    tail, and the next append truncates any such tail before writing.
+    Reads memory-map the files and slice them without copying; a time range
+    is located by binary search on the timestamp file.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        with open(self.root / META_FILE) as handle:
+            meta = json.load(handle)
+        self.meters: Dict[str, str] = meta["meters"]
+        self.sectors: Dict[str, str] = meta.get("sectors", {})
+        self.rows: int = meta["rows"]
+        self.block_rows: int = meta["block_rows"]
+
+    @classmethod
+    def create(cls, root: Path, meters: Sequence[str], sectors: Optional[Dict[str, str]] = None,
+               block_rows: int = BLOCK_ROWS) -> "MeterArchive":
+        """Creates an empty archive; sectors maps subsector names to their sector."""
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        taken: set = set()
+        slugs = {}
+        for meter in meters:
+            slugs[meter] = _slug(meter, taken)
+            taken.add(slugs[meter])
+        for path in [root / TIMESTAMP_FILE] + [root / f"{s}.f64" for s in slugs.values()] + \
+                [root / f"{s}.blk" for s in slugs.values()]:
+            path.write_bytes(b"")
+        cls._write_meta(root, {"meters": slugs, "sectors": sectors or {}, "rows": 0, "block_rows": block_rows})
+        return cls(root)
+
+    @staticmethod
+    def _write_meta(root: Path, meta: Dict) -> None:
+        tmp = root / f"{META_FILE}.tmp"
+        with open(tmp, "w") as handle:
+            json.dump(meta, handle, indent=2)
+        os.replace(tmp, root / META_FILE)
+
+    def _map(self, file_name: str, dtype, shape) -> np.ndarray:
+        if self.rows == 0:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(self.root / file_name, dtype=dtype, mode="r", shape=shape)
+
+    def timestamps(self) -> np.ndarray:
+        return self._map(TIMESTAMP_FILE, np.int64, (self.rows,)).view(TIMESTAMP_DTYPE)
+
+    def values(self, meter: str) -> np.ndarray:
+        return self._map(f"{self.meters[meter]}.f64", VALUE_DTYPE, (self.rows,))
+
+    def block_summaries(self, meter: str) -> np.ndarray:
+        n_blocks = -(-self.rows // self.block_rows)
+        return self._map(f"{self.meters[meter]}.blk", VALUE_DTYPE, (n_blocks, len(SUMMARY_FIELDS)))
+
+    def append(self, timestamps, values: Dict[str, np.ndarray]) -> None:
+        """Appends readings strictly after the last stored timestamp, one array per meter."""
+        ts = np.asarray(timestamps, dtype=TIMESTAMP_DTYPE).astype(np.int64)
+        if len(ts) == 0:
+            return
+        if np.any(np.diff(ts) <= 0):
+            raise ValueError("Timestamps must be strictly increasing")
+        if self.rows and ts[0] <= self.timestamps()[-1].astype(np.int64):
+            raise ValueError("Appended readings must follow the stored data")
+        missing = set(self.meters) - set(values)
+        if missing:
+            raise ValueError(f"Missing meters: {sorted(missing)}")
+        unknown = set(values) - set(self.meters)
+        if unknown:
+            raise ValueError(f"Unknown meters: {sorted(unknown)}")
+        short = [meter for meter in self.meters if len(values[meter]) != len(ts)]
+        if short:
+            raise ValueError(f"Meters without one value per timestamp: {sorted(short)}")
+
+        # Bytes past the committed row count are left over from an interrupted
+        # append; cut them off so the new rows land right after the committed ones
+        item = VALUE_DTYPE().itemsize
+        n_blocks = -(-self.rows // self.block_rows)
+        os.truncate(self.root / TIMESTAMP_FILE, self.rows * np.dtype(np.int64).itemsize)
+        for slug in self.meters.values():
+            os.truncate(self.root / f"{slug}.f64", self.rows * item)
+            os.truncate(self.root / f"{slug}.blk", n_blocks * len(SUMMARY_FIELDS) * item)
+
+        with open(self.root / TIMESTAMP_FILE, "ab") as handle:
+            ts.tofile(handle)
+        first_block = self.rows // self.block_rows
+        new_rows = self.rows + len(ts)
+        for meter, slug in self.meters.items():
+            column = np.asarray(values[meter], dtype=VALUE_DTYPE)
+            with open(self.root / f"{slug}.f64", "ab") as handle:
+                column.tofile(handle)
+            # Recompute the summaries from the first block touched, partial block included
+            tail = np.r_[np.asarray(self.values(meter)[first_block * self.block_rows:]), column]
+            pad = -len(tail) % self.block_rows
+            blocks = np.pad(tail, (0, pad), constant_values=np.nan).reshape(-1, self.block_rows)
+            summary = np.column_stack([np.nanmin(blocks, axis=1), np.nanmax(blocks, axis=1),
+                                       np.nansum(blocks, axis=1)])
+            with open(self.root / f"{slug}.blk", "r+b") as handle:
+                handle.seek(first_block * len(SUMMARY_FIELDS) * item)
+                summary.astype(VALUE_DTYPE).tofile(handle)
+        self.rows = new_rows
+        self._write_meta(self.root, {"meters": self.meters, "sectors": self.sectors, "rows": self.rows,
+                                     "block_rows": self.block_rows})
+
+    def locate(self, start=None, end=None) -> Tuple[int, int]:
+        """Row range [i, j) of timestamps in [start, end), by binary search."""
+        ts = self.timestamps()
+        i = 0 if start is None else int(np.searchsorted(ts, np.datetime64(pd.Timestamp(start), "s")))
+        j = self.rows if end is None else int(np.searchsorted(ts, np.datetime64(pd.Timestamp(end), "s")))
+        return i, j
+
+    def read(self, meter: str, start=None, end=None) -> Tuple[np.ndarray, np.ndarray]:
+        """Timestamps and values in [start, end) as memory-mapped views (no copy)."""
+        i, j = self.locate(start, end)
+        return self.timestamps()[i:j], self.values(meter)[i:j]
+
+    def range_stats(self, meter: str, start=None, end=None) -> Dict[str, float]:
+        """Min, max and sum over [start, end) from whole-block summaries plus the partial edge blocks."""
+        i, j = self.locate(start, end)
+        if j <= i:
+            return {"min": np.nan, "max": np.nan, "sum": 0.0}
+        first_full = -(-i // self.block_rows)
+        last_full = j // self.block_rows
+        values = self.values(meter)
+        parts = []
+        if first_full < last_full:
+            parts.append(np.asarray(self.block_summaries(meter)[first_full:last_full]))
+            edges = [values[i:first_full * self.block_rows], values[last_full * self.block_rows:j]]
+        else:
+            edges = [values[i:j]]
+        for edge in edges:
+            # Gaps are skipped, as in the nan-aware block summaries
+            edge = edge[~np.isnan(edge)]
+            if len(edge):
+                parts.append(np.array([[edge.min(), edge.max(), edge.sum()]]))
+        if not parts:
+            return {"min": np.nan, "max": np.nan, "sum": 0.0}
+        stacked = np.vstack(parts)
+        # All-gap blocks summarize to NaN min/max
+        mins, maxs = stacked[:, 0], stacked[:, 1]
+        mins, maxs = mins[~np.isnan(mins)], maxs[~np.isnan(maxs)]
+        return {"min": float(mins.min()) if len(mins) else np.nan,
+                "max": float(maxs.max()) if len(maxs) else np.nan,
+                "sum": float(np.nansum(stacked[:, 2]))}
+
+    def monthly_sums(self, meters: Sequence[str], year: int) -> np.ndarray:
+        """Sums per calendar month of year, shape (12, meters), from 13 binary searches."""
+        bounds = np.arange(f"{year}-01", f"{year + 1}-02", dtype="datetime64[M]").astype(TIMESTAMP_DTYPE)
+        cuts = np.searchsorted(self.timestamps(), bounds)
+        result = np.zeros((12, len(meters)))
+        for m, meter in enumerate(meters):
+            # Gaps count as zero, as in range_stats
+            cumulative = np.r_[0.0, np.nancumsum(self.values(meter)[cuts[0]:cuts[-1]])]
+            result[:, m] = np.diff(cumulative[cuts - cuts[0]])
+        return result
+
+
+# --- Loaders for the existing analyses ---
+
+def load_monthly_balance(archive: MeterArchive, year: int = PROFILE_YEAR) -> pd.DataFrame:
+    """The montly_data.csv layout (pv_analysis, sankey, forecasting inputs) for one year."""
+    sums = archive.monthly_sums(MONTHLY_COLUMNS, year)
+    monthly_df = pd.DataFrame(sums, columns=MONTHLY_COLUMNS)
+    monthly_df.insert(0, "Month", MONTHS)
+    return monthly_df
+
+
+def load_sectors(archive: MeterArchive, year: int = PROFILE_YEAR) -> pd.DataFrame:
+    """The sectors.csv layout for one year, from the subsector meters."""
+    meters = [m for m in archive.meters if m.startswith(SUBSECTOR_PREFIX)]
+    start, end = f"{year}-01-01", f"{year + 1}-01-01"
+    rows = []
+    for meter in meters:
+        subsector = meter[len(SUBSECTOR_PREFIX):]
+        rows.append((archive.sectors.get(subsector, ""), subsector, archive.range_stats(meter, start, end)["sum"]))
+    return pd.DataFrame(rows, columns=["Sector", "Subsector", "Consumption [kWh/year]"])
+
+
+def build_demo_archive(root: Path, script_dir: Path, year: int = PROFILE_YEAR, freq: str = "15min") -> MeterArchive:
+    """Writes a synthetic site-year of interval data, appended month by month."""
+    monthly_df = pd.read_csv(script_dir / "data" / "montly_data.csv", sep=";")
+    group = load_group([script_dir])
+    index = interval_index(year, freq)
+    balance = monthly_to_interval(monthly_df, year, freq)
+    subsectors = subsector_profiles(group, index)[0]
+
+    columns = {name: balance[name].to_numpy() for name in MONTHLY_COLUMNS}
+    columns.update({f"{SUBSECTOR_PREFIX}{name}": subsectors[j] for j, name in enumerate(group.subsectors)})
+    archive = MeterArchive.create(root, list(columns), dict(zip(group.subsectors, group.subsector_sectors)))
+    month_starts = np.flatnonzero(np.r_[True, index.month[1:] != index.month[:-1]])
+    for a, b in zip(month_starts, np.r_[month_starts[1:], len(index)]):
+        archive.append(index[a:b], {name: values[a:b] for name, values in columns.items()})
+    return archive
+
+
+def main():
+    script_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Memory-mapped meter archive.")
+    parser.add_argument("--archive", type=Path, default=ARCHIVE_DIR / "main")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the demo archive from the CSV data")
+    args = parser.parse_args()
+
+    if args.rebuild or not (args.archive / META_FILE).is_file():
+        t0 = time.perf_counter()
+        build_demo_archive(args.archive, script_dir)
+        print(f"Built demo archive in {time.perf_counter() - t0:.2f} s")
+
+    t0 = time.perf_counter()
+    archive = MeterArchive(args.archive)
+    ts, values = archive.read("Total need [kWh]", "2025-03-03", "2025-03-11")
+    read_ms = (time.perf_counter() - t0) * 1000
+    print(f"{archive.rows:,} rows x {len(archive.meters)} meters; "
+          f"'Total need', March 3-10: {len(values)} readings, {values.sum():,.0f} kWh in {read_ms:.2f} ms")
+    stats = archive.range_stats("Total need [kWh]", "2025-02-10 08:00", "2025-09-20 18:00")
+    print(f"Feb 10 - Sep 20 from block summaries: min {stats['min']:.2f}, max {stats['max']:.2f}, "
+          f"sum {stats['sum']:,.0f} kWh")
+
+    t0 = time.perf_counter()
+    monthly_df = load_monthly_balance(archive)
+    sectors_df = load_sectors(archive)
+    load_ms = (time.perf_counter() - t0) * 1000
+    print(f"\nSite-year views loaded in {load_ms:.1f} ms")
+
+    pd.set_option("display.width", 200)
+    print(monthly_df.round(0).to_string(index=False))
+    nodes, links = prepare_sankey_data(monthly_df, sectors_df)
+    print(f"\nSankey: {len(nodes['name'])} nodes, {len(links['value'])} links")
+    kpis = compute_consumption_per_product(sectors_df)
+    print("\n--- Consumption per product ---")
+    print(kpis.round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
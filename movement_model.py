@@ -0,0 +1,195 @@
+import itertools
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from key_indicators import yearly_products
+from load_profiles import interval_index, production_shape
+from measure_portfolio import MEASURES
+
+# --- Constants ---
+SUBSECTOR = "Movement systems"
+GRAVITY = 9.81
+JOULES_PER_KWH = 3.6e6
+
+# Axis families of the plant: count and typical parameters. Stroke [m],
+# speed [m/s], acceleration [m/s2], moving mass [kg], standby power [W].
+AXIS_TYPES = [
+    {"type": "Belt conveyor", "count": 1400, "vertical": False, "stroke": 2.0, "speed": 0.8,
+     "accel": 0.8, "mass": 60.0, "friction": 0.04, "standby_w": 3.0, "cycles_per_hour": 120},
+    {"type": "Roller conveyor", "count": 500, "vertical": False, "stroke": 3.0, "speed": 0.5,
+     "accel": 0.5, "mass": 120.0, "friction": 0.05, "standby_w": 4.0, "cycles_per_hour": 60},
+    {"type": "Lift axis", "count": 180, "vertical": True, "stroke": 1.2, "speed": 0.6,
+     "accel": 1.5, "mass": 180.0, "friction": 0.02, "standby_w": 12.0, "cycles_per_hour": 90},
+    {"type": "Gantry axis", "count": 220, "vertical": False, "stroke": 1.5, "speed": 1.5,
+     "accel": 3.0, "mass": 90.0, "friction": 0.02, "standby_w": 8.0, "cycles_per_hour": 180},
+    {"type": "Rotary table", "count": 100, "vertical": False, "stroke": 0.8, "speed": 0.6,
+     "accel": 2.0, "mass": 250.0, "friction": 0.03, "standby_w": 6.0, "cycles_per_hour": 100},
+]
+# Spread of the individual axes around their family parameters
+PARAMETER_SPREAD = 0.2
+DWELL_SECONDS = 2.0
+MOTOR_DRIVE_EFFICIENCY = 0.82
+
+# Retrofit design space of T3: regenerative drive efficiency (0 = braking
+# resistor) and idle time before drives drop to sleep (inf = never)
+REGEN_EFFICIENCIES = np.array([0.0, 0.6, 0.75])
+STANDBY_TIMEOUTS_S = np.array([np.inf, 300.0, 60.0])
+SLEEP_POWER_RATIO = 0.15
+
+
+@dataclass
+class AxisFleet:
+    """One entry per axis; every field is an array of length N."""
+
+    kind: np.ndarray
+    vertical: np.ndarray
+    stroke: np.ndarray
+    speed: np.ndarray
+    accel: np.ndarray
+    mass: np.ndarray
+    friction: np.ndarray
+    standby_kw: np.ndarray
+    cycles_per_hour: np.ndarray
+
+    @classmethod
+    def from_types(cls, axis_types: List[Dict] = AXIS_TYPES, seed: int = 0) -> "AxisFleet":
+        rng = np.random.default_rng(seed)
+        counts = [t["count"] for t in axis_types]
+
+        def column(key):
+            base = np.repeat([t[key] for t in axis_types], counts).astype(float)
+            return base * rng.lognormal(0.0, PARAMETER_SPREAD, len(base))
+
+        return cls(
+            kind=np.repeat([t["type"] for t in axis_types], counts),
+            vertical=np.repeat([t["vertical"] for t in axis_types], counts),
+            stroke=column("stroke"),
+            speed=column("speed"),
+            accel=column("accel"),
+            mass=column("mass"),
+            friction=np.repeat([t["friction"] for t in axis_types], counts).astype(float),
+            standby_kw=column("standby_w") / 1000,
+            cycles_per_hour=column("cycles_per_hour"),
+        )
+
+    def cycle_energy(self):
+        """
+        Mechanical energy per cycle (one move out and one back) [J] and cycle
+        motion time [s], for trapezoidal velocity profiles. Returns
+        (motoring, regenerable, move_time).
+        """
+        # Short strokes never reach full speed: triangular profile
+        peak = np.minimum(self.speed, np.sqrt(self.stroke * self.accel))
+        move_time = 2 * (self.stroke / peak + peak / self.accel)
+        kinetic = self.mass * peak ** 2  # 0.5 m v^2 per move, two moves
+        friction = 2 * self.friction * self.mass * GRAVITY * self.stroke
+        potential = np.where(self.vertical, self.mass * GRAVITY * self.stroke, 0.0)
+        return kinetic + friction + potential, kinetic + potential, move_time
+
+
+def fleet_energy(fleet: AxisFleet, production_hours: float, total_hours: float, cycle_scale: float = 1.0,
+                 regen: Optional[np.ndarray] = None, timeout_s: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Annual electricity per scenario and axis [kWh], shape (S, N) for S
+    (regen, timeout) pairs. Motion follows the duty cycle in production
+    hours; drives idle in between and stay energized outside production
+    unless smart standby puts them to sleep. Regen defaults to none (braking
+    resistor) and timeout_s to never sleeping.
+    """
+    regen = np.zeros(1) if regen is None else regen
+    timeout_s = np.full(1, np.inf) if timeout_s is None else timeout_s
+    motoring, regenerable, move_time = fleet.cycle_energy()
+    # A cycle keeps the axis busy for both moves and both dwells; the rest of
+    # the hour is gaps between cycles. Cycle rates are capped at a fully busy axis.
+    cycle_time = move_time + 2 * DWELL_SECONDS
+    cycles = np.minimum(fleet.cycles_per_hour * cycle_scale, 3600 / cycle_time)
+    busy = cycles * cycle_time / 3600
+
+    regen = np.asarray(regen, dtype=float)[:, None]
+    electrical = (motoring / MOTOR_DRIVE_EFFICIENCY
+                  - regen * regenerable * MOTOR_DRIVE_EFFICIENCY) / JOULES_PER_KWH
+    motion = cycles * production_hours * electrical
+
+    # Dwells hold position at standby power and never sleep; only the gaps
+    # between cycles can. Gaps are taken as exponential, so the share of gap
+    # time past the timeout is exp(-timeout / mean gap).
+    dwell_fraction = cycles * 2 * DWELL_SECONDS / 3600
+    gap_fraction = 1 - busy
+    mean_gap = 3600 * gap_fraction / (2 * np.maximum(cycles, 1e-9))
+    timeout_s = np.asarray(timeout_s, dtype=float)[:, None]
+    asleep = np.where(mean_gap > 0, np.exp(-timeout_s / np.where(mean_gap > 0, mean_gap, 1.0)), 0.0)
+    sleep_factor = 1 - (1 - SLEEP_POWER_RATIO) * asleep
+    idle = fleet.standby_kw * production_hours * (dwell_fraction + gap_fraction * sleep_factor)
+    off_shift_factor = np.where(np.isfinite(timeout_s), SLEEP_POWER_RATIO, 1.0)
+    off_shift = fleet.standby_kw * (total_hours - production_hours) * off_shift_factor
+    return motion + idle + off_shift
+
+
+def calibrate_cycles(fleet: AxisFleet, baseline_kwh: float, production_hours: float, total_hours: float,
+                     iterations: int = 50) -> float:
+    """Scale on the nominal cycle rates that makes the baseline fleet match the metered kWh."""
+    low, high = 0.0, 50.0
+    for _ in range(iterations):
+        scale = (low + high) / 2
+        if fleet_energy(fleet, production_hours, total_hours, scale).sum() < baseline_kwh:
+            low = scale
+        else:
+            high = scale
+    return (low + high) / 2
+
+
+def evaluate_retrofits(fleet: AxisFleet, production_hours: float, total_hours: float, cycle_scale: float,
+                       regen_efficiencies=REGEN_EFFICIENCIES, timeouts=STANDBY_TIMEOUTS_S,
+                       products: int = yearly_products) -> pd.DataFrame:
+    """Energy, savings and per-product figures for every retrofit combination in one batched pass."""
+    combos = np.array(list(itertools.product(regen_efficiencies, timeouts)))
+    energy = fleet_energy(fleet, production_hours, total_hours, cycle_scale, combos[:, 0], combos[:, 1])
+    baseline = energy[(combos[:, 0] == 0) & np.isinf(combos[:, 1])].sum()
+
+    result = pd.DataFrame({
+        "Regen efficiency": combos[:, 0],
+        "Standby timeout [s]": combos[:, 1],
+        "Energy [kWh/year]": energy.sum(axis=1),
+    })
+    result["Savings [kWh/year]"] = baseline - result["Energy [kWh/year]"]
+    result["Savings [%]"] = result["Savings [kWh/year]"] / baseline * 100
+    result["Energy [Wh/product]"] = result["Energy [kWh/year]"] / products * 1000
+    result["Savings [Wh/product]"] = result["Savings [kWh/year]"] / products * 1000
+    return result.sort_values("Savings [kWh/year]", ascending=False)
+
+
+def energy_by_type(fleet: AxisFleet, energy: np.ndarray) -> pd.Series:
+    return pd.Series(energy, index=fleet.kind).groupby(level=0).sum()
+
+
+def main():
+    script_dir = Path(__file__).parent
+    sectors_df = pd.read_csv(script_dir / "data" / "sectors.csv", sep=";")
+    baseline_kwh = float(sectors_df.loc[sectors_df["Subsector"] == SUBSECTOR, "Consumption [kWh/year]"].sum())
+
+    index = interval_index()
+    production_hours = float((production_shape(index, base_level=0.0) > 0).sum())
+    fleet = AxisFleet.from_types()
+    scale = calibrate_cycles(fleet, baseline_kwh, production_hours, len(index))
+    print(f"{len(fleet.kind)} axes, {production_hours:.0f} production hours, cycle-rate scale {scale:.2f}")
+
+    baseline = fleet_energy(fleet, production_hours, len(index), scale)[0]
+    print(f"Baseline: {baseline.sum():,.0f} kWh/year (sectors.csv: {baseline_kwh:,.0f}), "
+          f"{baseline.sum() / yearly_products * 1000:.1f} Wh/product")
+    print(energy_by_type(fleet, baseline).round(0).to_string())
+
+    result = evaluate_retrofits(fleet, production_hours, len(index), scale)
+    pd.set_option("display.width", 200)
+    print("\n--- T3 retrofit scenarios ---")
+    print(result.round(2).to_string(index=False))
+
+    t3 = next(m for m in MEASURES if m["Task"] == "T3")
+    levels = ", ".join(f"{fraction:.0%}" for fraction, _ in t3["Levels"])
+    print(f"\nT3 savings levels assumed in measure_portfolio.py: {levels} of {SUBSECTOR}")
+
+
+if __name__ == "__main__":
+    main()
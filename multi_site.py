@@ -0,0 +1,228 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sankey import create_sankey_figure, load_data, prepare_sankey_data
+
+# --- Constants ---
+MONTHLY_COLUMNS = [
+    "Total need [kWh]",
+    "PV production [kWh]",
+    "Bought [kWh]",
+    "Self-consumed [kWh]",
+    "Sold [kWh]",
+]
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+
+
+@dataclass
+class SharedArray:
+    """Name, shape and dtype needed to re-attach a shared-memory array."""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+    @classmethod
+    def create(cls, values: np.ndarray) -> Tuple["SharedArray", shared_memory.SharedMemory]:
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[...] = values
+        return cls(shm.name, values.shape, values.dtype.str), shm
+
+    def attach(self) -> Tuple[np.ndarray, shared_memory.SharedMemory]:
+        shm = shared_memory.SharedMemory(name=self.name)
+        return np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf), shm
+
+
+@dataclass
+class GroupData:
+    """Per-site inputs stacked into group-level arrays."""
+
+    sites: List[str]
+    site_dirs: List[Path]
+    subsectors: List[str]
+    subsector_sectors: List[str]
+    monthly: np.ndarray  # (sites, 12, len(MONTHLY_COLUMNS))
+    consumption: np.ndarray  # (sites, subsectors)
+
+
+# --- Discovery and Loading ---
+
+def discover_sites(root: Path) -> List[Path]:
+    """Returns every folder under root holding a data/ folder with both input CSVs."""
+    if not root.is_dir():
+        raise FileNotFoundError(f"Sites folder not found: {root}")
+    return sorted(
+        path for path in root.iterdir()
+        if (path / "data" / "montly_data.csv").is_file() and (path / "data" / "sectors.csv").is_file()
+    )
+
+
+def load_group(site_dirs: List[Path]) -> GroupData:
+    """Reads every site once and stacks the inputs into dense arrays."""
+    monthly_frames = [load_data(site / "data" / "montly_data.csv") for site in site_dirs]
+    sectors_frames = [load_data(site / "data" / "sectors.csv") for site in site_dirs]
+
+    all_sectors = pd.concat(sectors_frames).drop_duplicates("Subsector").sort_values(["Sector", "Subsector"])
+    subsectors = all_sectors["Subsector"].tolist()
+
+    monthly = np.stack([
+        df.set_index("Month").reindex(MONTHS)[MONTHLY_COLUMNS].fillna(0).to_numpy(dtype=float)
+        for df in monthly_frames
+    ])
+    consumption = np.stack([
+        df.groupby("Subsector")["Consumption [kWh/year]"].sum().reindex(subsectors).fillna(0).to_numpy(dtype=float)
+        for df in sectors_frames
+    ])
+    return GroupData(
+        sites=[site.name for site in site_dirs],
+        site_dirs=site_dirs,
+        subsectors=subsectors,
+        subsector_sectors=all_sectors["Sector"].tolist(),
+        monthly=monthly,
+        consumption=consumption,
+    )
+
+
+def frames_from_arrays(monthly: np.ndarray, consumption: np.ndarray, subsectors: List[str],
+                       subsector_sectors: List[str]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Rebuilds the montly_data.csv / sectors.csv frames expected by sankey.py."""
+    monthly_df = pd.DataFrame(monthly, columns=MONTHLY_COLUMNS)
+    monthly_df.insert(0, "Month", MONTHS)
+    sectors_df = pd.DataFrame({
+        "Sector": subsector_sectors,
+        "Subsector": subsectors,
+        "Consumption [kWh/year]": consumption,
+    })
+    return monthly_df, sectors_df[sectors_df["Consumption [kWh/year]"] > 0]
+
+
+def compute_kpis(site: str, monthly: np.ndarray, consumption: np.ndarray, subsectors: List[str],
+                 group_need: float) -> Dict:
+    totals = dict(zip(MONTHLY_COLUMNS, monthly.sum(axis=0)))
+    need = totals["Total need [kWh]"]
+    pv = totals["PV production [kWh]"]
+    return {
+        "Site": site,
+        "Total need [kWh]": need,
+        "PV production [kWh]": pv,
+        "Bought [kWh]": totals["Bought [kWh]"],
+        "Sold [kWh]": totals["Sold [kWh]"],
+        "Self-consumption [%]": totals["Self-consumed [kWh]"] / need * 100 if need else 0.0,
+        "PV self-use [%]": totals["Self-consumed [kWh]"] / pv * 100 if pv else 0.0,
+        "Share of group need [%]": need / group_need * 100 if group_need else 0.0,
+        "Largest subsector": subsectors[int(np.argmax(consumption))] if consumption.any() else "",
+    }
+
+
+# --- Worker Side ---
+
+_worker_state = {}
+
+
+def _init_worker(monthly_ref: SharedArray, consumption_ref: SharedArray, subsectors: List[str],
+                 subsector_sectors: List[str]):
+    """Attaches the group arrays once per worker process."""
+    monthly, monthly_shm = monthly_ref.attach()
+    consumption, consumption_shm = consumption_ref.attach()
+    _worker_state.update(
+        monthly=monthly,
+        consumption=consumption,
+        group_need=float(monthly[..., 0].sum()),
+        subsectors=subsectors,
+        subsector_sectors=subsector_sectors,
+        # Keep the handles alive for the lifetime of the worker
+        handles=(monthly_shm, consumption_shm),
+    )
+
+
+def render_site_report(task: Tuple[int, str, str]) -> Dict:
+    """Computes KPIs and writes the Sankey HTML for one site, reading the shared arrays."""
+    site_idx, site, output_dir = task
+    state = _worker_state
+    monthly = state["monthly"][site_idx]
+    consumption = state["consumption"][site_idx]
+
+    monthly_df, sectors_df = frames_from_arrays(
+        monthly, consumption, state["subsectors"], state["subsector_sectors"]
+    )
+    fig = create_sankey_figure(*prepare_sankey_data(monthly_df, sectors_df))
+    fig.update_layout(title_text=f"<b>Energy Flow Sankey Diagram - {site}</b>")
+    fig.write_html(Path(output_dir) / f"sankey_{site}.html", include_plotlyjs="cdn")
+
+    return compute_kpis(site, monthly, consumption, state["subsectors"], state["group_need"])
+
+
+# --- Group Report ---
+
+def run_group_report(root: Path, output_dir: Path, workers: int = None) -> pd.DataFrame:
+    """Renders every site in parallel, then the consolidated Sankey and KPI table."""
+    site_dirs = discover_sites(root)
+    if not site_dirs:
+        raise FileNotFoundError(f"No site folders with data/montly_data.csv and data/sectors.csv under {root}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    group = load_group(site_dirs)
+    monthly_ref, monthly_shm = SharedArray.create(group.monthly)
+    consumption_ref, consumption_shm = SharedArray.create(group.consumption)
+    try:
+        tasks = [(i, site, str(output_dir)) for i, site in enumerate(group.sites)]
+        with ProcessPoolExecutor(
+            max_workers=workers or min(len(tasks), os.cpu_count() or 1),
+            initializer=_init_worker,
+            initargs=(monthly_ref, consumption_ref, group.subsectors, group.subsector_sectors),
+        ) as pool:
+            kpi_rows = list(pool.map(render_site_report, tasks))
+    finally:
+        for shm in (monthly_shm, consumption_shm):
+            shm.close()
+            shm.unlink()
+
+    # Consolidated group view from the summed arrays
+    group_monthly = group.monthly.sum(axis=0)
+    group_consumption = group.consumption.sum(axis=0)
+    monthly_df, sectors_df = frames_from_arrays(
+        group_monthly, group_consumption, group.subsectors, group.subsector_sectors
+    )
+    fig = create_sankey_figure(*prepare_sankey_data(monthly_df, sectors_df))
+    fig.update_layout(title_text=f"<b>Energy Flow Sankey Diagram - Group ({len(group.sites)} sites)</b>")
+    fig.write_html(output_dir / "sankey_group.html", include_plotlyjs="cdn")
+
+    kpi_rows.append(compute_kpis("GROUP", group_monthly, group_consumption, group.subsectors,
+                                 float(group_monthly[:, 0].sum())))
+    kpi_table = pd.DataFrame(kpi_rows)
+    kpi_table.to_csv(output_dir / "group_kpis.csv", index=False)
+    return kpi_table
+
+
+def main():
+    script_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Generate per-site and group energy reports.")
+    parser.add_argument("root", nargs="?", type=Path, default=script_dir / "sites",
+                        help="Folder containing one sub-folder per site, each with a data/ folder.")
+    parser.add_argument("--output", type=Path, default=None, help="Report folder (default: <root>/reports).")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    try:
+        kpi_table = run_group_report(args.root, args.output or args.root / "reports", args.workers)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        return
+
+    pd.set_option("display.width", 160)
+    print(kpi_table.round(1).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import argparse
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from load_profiles import BASE_LOAD_LEVEL, PROFILE_YEAR, disaggregate_monthly, interval_index, production_shape
+from measure_portfolio import SHIFTABLE_SUBSECTORS
+from multi_site import discover_sites, load_group
+
+# --- Constants ---
+INTERVAL = "15min"
+INTERVAL_HOURS = 0.25
+
+TOP_N = 10
+# Fractions of the year at which the load duration curve is sampled
+LDC_FRACTIONS = np.array([0.0, 0.001, 0.01, 0.05, 0.10, 0.25, 0.50, 0.75, 0.90, 1.0])
+
+# Indicative MV tariff: yearly charge per contracted kW, and a penalty per kW
+# by which a month's 15-minute peak exceeds the contracted power
+DEMAND_CHARGE_EUR_PER_KW_YEAR = 45.0
+EXCESS_PENALTY_EUR_PER_KW_MONTH = 12.0
+CONTRACTED_POWER_STEP_KW = 10.0
+
+# Off-shift load relative to the shift load, for subsectors that differ from
+# the plant-wide BASE_LOAD_LEVEL
+SUBSECTOR_BASE_LEVELS = {
+    "UPS Local": 1.0,
+    "Other general services": 0.6,
+    "Environmental heating": 0.5,
+    "Pumping system": 0.4,
+    "Lighting": 0.1,
+    "Milling center": 0.05,
+    "Movement systems": 0.05,
+}
+# Interval-to-interval variability of each subsector's load around its shape
+LOAD_VARIABILITY = 0.2
+
+
+def subsector_profiles(group, index: pd.DatetimeIndex, seed: int = 0) -> np.ndarray:
+    """
+    Interval energy per site and subsector, shape (sites, subsectors, T) in
+    kWh. Each subsector follows its shift pattern with random variability,
+    the site's monthly need split and its annual sectors.csv total.
+    """
+    rng = np.random.default_rng(seed)
+    need = group.monthly[:, :, 0]
+    month_share = need / need.sum(axis=1, keepdims=True)
+    profiles = np.zeros((len(group.sites), len(group.subsectors), len(index)))
+    for j, subsector in enumerate(group.subsectors):
+        shape = production_shape(index, SUBSECTOR_BASE_LEVELS.get(subsector, BASE_LOAD_LEVEL))
+        for s in range(len(group.sites)):
+            noisy = shape * rng.lognormal(0.0, LOAD_VARIABILITY, len(index))
+            monthly = group.consumption[s, j] * month_share[s]
+            profiles[s, j] = disaggregate_monthly(monthly, index, noisy)
+    return profiles
+
+
+def load_duration_curve(power: np.ndarray, fractions: np.ndarray = LDC_FRACTIONS) -> np.ndarray:
+    """
+    Load duration curve sampled at fractions of the time, for every row of
+    power (..., T). Only the requested order statistics are selected with
+    np.partition, instead of sorting each full series.
+    """
+    t = power.shape[-1]
+    # Fraction f of the time above the value -> ascending position (1 - f) * (T - 1)
+    positions = np.round((1.0 - fractions) * (t - 1)).astype(int)
+    kth = np.unique(positions)
+    selected = np.partition(power, kth, axis=-1)
+    return selected[..., positions]
+
+
+def top_peaks(power: np.ndarray, n: int = TOP_N):
+    """
+    Indices and values of the n highest intervals of every row of power
+    (..., T), highest first. argpartition isolates the n candidates and only
+    those are sorted. n is clamped to the series length.
+    """
+    n = min(n, power.shape[-1])
+    candidates = np.argpartition(power, -n, axis=-1)[..., -n:]
+    values = np.take_along_axis(power, candidates, axis=-1)
+    order = np.argsort(-values, axis=-1)
+    return np.take_along_axis(candidates, order, axis=-1), np.take_along_axis(values, order, axis=-1)
+
+
+def monthly_peaks(power: np.ndarray, index: pd.DatetimeIndex) -> np.ndarray:
+    """Maximum interval power per calendar month, shape (..., months)."""
+    months = index.year.to_numpy() * 12 + index.month.to_numpy()
+    starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    return np.maximum.reduceat(power, starts, axis=-1)
+
+
+def contracted_power_costs(peaks: np.ndarray, levels: np.ndarray,
+                           demand_charge: float = DEMAND_CHARGE_EUR_PER_KW_YEAR,
+                           excess_penalty: float = EXCESS_PENALTY_EUR_PER_KW_MONTH) -> np.ndarray:
+    """
+    Yearly demand cost for every site and contracted level, shape (sites, L):
+    the fixed charge on the contracted power plus the penalty on each month's
+    excess. peaks has shape (sites, months).
+    """
+    excess = np.maximum(peaks[:, None, :] - levels[None, :, None], 0.0)
+    return levels[None, :] * demand_charge + excess.sum(axis=-1) * excess_penalty
+
+
+@dataclass
+class ShavingResult:
+    """Lowest achievable peak per site and the energy moved to reach it."""
+
+    caps: np.ndarray  # (sites,) kW
+    original_peaks: np.ndarray  # (sites,) kW
+    shifted_kwh: np.ndarray  # (sites,)
+
+
+def _shed_per_day(power: np.ndarray, shiftable: np.ndarray, day: np.ndarray, n_days: int, caps: np.ndarray):
+    """
+    Energy each site sheds per day to hold its cap, shape (sites, days), and
+    whether the cap is feasible per site: an interval can only shed its own
+    shiftable load, and every day needs room below the cap for what it sheds.
+    """
+    n_sites = power.shape[0]
+    above = np.maximum(power - caps[:, None], 0.0)
+    headroom = np.maximum(caps[:, None] - power, 0.0)
+    # One weighted bincount over a flattened (site, day) key
+    keys = (np.arange(n_sites)[:, None] * n_days + day[None, :]).ravel()
+    shed = np.bincount(keys, weights=above.ravel(), minlength=n_sites * n_days).reshape(n_sites, n_days)
+    room = np.bincount(keys, weights=headroom.ravel(), minlength=n_sites * n_days).reshape(n_sites, n_days)
+    feasible = (above <= shiftable).all(axis=-1) & (shed <= room).all(axis=-1)
+    return shed, feasible
+
+
+def peak_shaving(power: np.ndarray, shiftable: np.ndarray, index: pd.DatetimeIndex,
+                 iterations: int = 30) -> ShavingResult:
+    """
+    Lowest cap each site can hold by moving shiftable load out of the
+    intervals above the cap into intervals of the same day with headroom.
+    power and shiftable are (sites, T) in kW. Feasibility only improves as
+    the cap rises, so every site's cap is bisected at once between its mean
+    load and its peak, each step costing a few (sites, T) arrays.
+    """
+    day = (index.normalize() - index[0].normalize()).days.to_numpy()
+    n_days = day.max() + 1
+    original = power.max(axis=-1)
+    # The peak itself is always feasible, nothing needs shedding
+    low, high = power.mean(axis=-1), original.copy()
+    shed = np.zeros((power.shape[0], n_days))
+    for _ in range(iterations):
+        caps = (low + high) / 2
+        candidate, feasible = _shed_per_day(power, shiftable, day, n_days, caps)
+        low = np.where(feasible, low, caps)
+        high = np.where(feasible, caps, high)
+        shed = np.where(feasible[:, None], candidate, shed)
+    return ShavingResult(caps=high, original_peaks=original, shifted_kwh=shed.sum(axis=-1) * INTERVAL_HOURS)
+
+
+def best_contract(peaks: np.ndarray, step: float = CONTRACTED_POWER_STEP_KW) -> Dict[str, np.ndarray]:
+    """Cheapest contracted level per site on a grid covering all monthly peaks."""
+    levels = np.arange(step, np.ceil(peaks.max() / step) * step + step, step)
+    costs = contracted_power_costs(peaks, levels)
+    best = costs.argmin(axis=-1)
+    rows = np.arange(peaks.shape[0])
+    return {"Level [kW]": levels[best], "Cost [EUR/year]": costs[rows, best],
+            "Cost at max peak [EUR/year]": costs[rows, np.searchsorted(levels, peaks.max(axis=-1))]}
+
+
+def main():
+    script_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Peak demand, load duration curves and contracted power.")
+    parser.add_argument("--sites-root", type=Path, default=None,
+                        help="Directory of site folders with data/montly_data.csv and data/sectors.csv")
+    parser.add_argument("--top", type=int, default=TOP_N)
+    args = parser.parse_args()
+
+    site_dirs = discover_sites(args.sites_root) if args.sites_root else [script_dir]
+    group = load_group(site_dirs)
+    index = interval_index(PROFILE_YEAR, INTERVAL)
+    energy = subsector_profiles(group, index)
+    sub_power = energy / INTERVAL_HOURS
+    site_power = sub_power.sum(axis=1)
+
+    pd.set_option("display.width", 200)
+    ldc = load_duration_curve(site_power)
+    print("--- Site load duration curve [kW] (share of the year above the value) ---")
+    print(pd.DataFrame(ldc, index=group.sites, columns=[f"{f:.1%}" for f in LDC_FRACTIONS]).round(1).to_string())
+
+    idx, values = top_peaks(site_power, args.top)
+    for s, site in enumerate(group.sites):
+        print(f"\n--- Top {args.top} peaks, {site} ---")
+        print(pd.DataFrame({"Interval": index[idx[s]], "Power [kW]": values[s].round(1)}).to_string(index=False))
+
+    sub_ldc = load_duration_curve(sub_power)
+    _, sub_top = top_peaks(sub_power, 1)
+    rows: List[Dict] = []
+    for s, site in enumerate(group.sites):
+        for j, subsector in enumerate(group.subsectors):
+            rows.append({"Site": site, "Subsector": subsector, "Peak [kW]": sub_top[s, j, 0],
+                         "P1% [kW]": sub_ldc[s, j, 2], "Median [kW]": sub_ldc[s, j, 6]})
+    print("\n--- Subsector peaks ---")
+    print(pd.DataFrame(rows).sort_values("Peak [kW]", ascending=False).round(1).to_string(index=False))
+
+    peaks = monthly_peaks(site_power, index)
+    contract = best_contract(peaks)
+    shiftable = sum(sub_power[:, group.subsectors.index(name)] * share
+                    for name, share in SHIFTABLE_SUBSECTORS.items() if name in group.subsectors)
+    shaving = peak_shaving(site_power, shiftable, index)
+    shaved_contract = best_contract(np.minimum(peaks, shaving.caps[:, None]))
+
+    summary = pd.DataFrame(
+        {
+            "Peak [kW]": shaving.original_peaks,
+            "Best contract [kW]": contract["Level [kW]"],
+            "Demand cost [EUR/year]": contract["Cost [EUR/year]"],
+            "Cost contracting peak [EUR/year]": contract["Cost at max peak [EUR/year]"],
+            "Shaved peak [kW]": shaving.caps,
+            "Shifted [kWh/year]": shaving.shifted_kwh,
+            "Contract after shaving [kW]": shaved_contract["Level [kW]"],
+            "Cost after shaving [EUR/year]": shaved_contract["Cost [EUR/year]"],
+        },
+        index=group.sites,
+    )
+    print("\n--- Contracted power and peak shaving ---")
+    print(summary.round(1).T.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,12 @@
 import pandas as pd
 import matplotlib.pyplot as plt
+from pathlib import Path
+
+# --- Constants ---
+CAPACITY_PV = 938.80
+ADDED_PV = 200.00
+GRID_PRICE_EUR_PER_KWH = 0.22
+FEED_IN_PRICE_EUR_PER_KWH = 0.07
 
 # --- Plotting Function (modified to accept column names) ---
 def plot_energy_data(df, self_consumed_col, bought_col, title, filename=None):
@@ -46,40 +53,80 @@ def plot_energy_data(df, self_consumed_col, bought_col, title, filename=None):
     except Exception as e:
         print(f"Error plotting data: {e}")
 
-# Load data
-monthly_data = pd.read_csv('data/montly_data.csv', sep=';')
+# --- Scenario Function ---
+def compute_increased_pv_scenario(monthly_data, capacity_pv=CAPACITY_PV, added_pv=ADDED_PV):
+    """
+    Adds the 'New ...' columns for a PV plant enlarged by added_pv kWp.
+    Production and self-consumption scale with the installed capacity.
+    """
+    monthly_data = monthly_data.copy()
+    increase_factor = (capacity_pv + added_pv) / capacity_pv
+
+    monthly_data['New PV production [kWh]'] = monthly_data['PV production [kWh]'] * increase_factor
+    monthly_data['New Self-consumed [kWh]'] = monthly_data['Self-consumed [kWh]'] * increase_factor
+    monthly_data['New Bought [kWh]'] = (monthly_data['Total need [kWh]'] - monthly_data['New Self-consumed [kWh]']).clip(lower=0)
+    monthly_data['New Sold [kWh]'] = (monthly_data['New PV production [kWh]'] - monthly_data['New Self-consumed [kWh]']).clip(lower=0)
+    return monthly_data
+
+
+# --- Balance and Cost Functions ---
+def compute_pv_balance(total_need, pv_production, self_consumption_ratio):
+    """
+    Splits need and PV production into the montly_data.csv balance columns.
+    self_consumption_ratio is the share of PV production used on site; the
+    self-consumed energy is capped at the need.
+    """
+    balance = pd.DataFrame({
+        'Total need [kWh]': total_need,
+        'PV production [kWh]': pv_production,
+    })
+    balance['Self-consumed [kWh]'] = (balance['PV production [kWh]'] * self_consumption_ratio).clip(
+        upper=balance['Total need [kWh]']
+    )
+    balance['Bought [kWh]'] = balance['Total need [kWh]'] - balance['Self-consumed [kWh]']
+    balance['Sold [kWh]'] = balance['PV production [kWh]'] - balance['Self-consumed [kWh]']
+    return balance
+
+
+def compute_energy_cost(balance, grid_price=GRID_PRICE_EUR_PER_KWH, feed_in_price=FEED_IN_PRICE_EUR_PER_KWH):
+    """Adds grid purchase cost, feed-in revenue and net cost columns to a balance frame."""
+    balance = balance.copy()
+    balance['Grid cost [EUR]'] = balance['Bought [kWh]'] * grid_price
+    balance['Feed-in revenue [EUR]'] = balance['Sold [kWh]'] * feed_in_price
+    balance['Net cost [EUR]'] = balance['Grid cost [EUR]'] - balance['Feed-in revenue [EUR]']
+    return balance
+
+
+def main():
+    # Load data
+    script_dir = Path(__file__).parent
+    monthly_data = pd.read_csv(script_dir / 'data' / 'montly_data.csv', sep=';')
 
-# --- Base Scenario ---
-print("--- Base Scenario ---")
-original_self_consumption_sum = monthly_data['Self-consumed [kWh]'].sum()
-original_total_need_sum = monthly_data['Total need [kWh]'].sum()
-original_self_consumption_percentage = original_self_consumption_sum / original_total_need_sum
-print(f"Original Self-consumption: {original_self_consumption_percentage*100:.2f}%")
+    # --- Base Scenario ---
+    print("--- Base Scenario ---")
+    original_self_consumption_sum = monthly_data['Self-consumed [kWh]'].sum()
+    original_total_need_sum = monthly_data['Total need [kWh]'].sum()
+    original_self_consumption_percentage = original_self_consumption_sum / original_total_need_sum
+    print(f"Original Self-consumption: {original_self_consumption_percentage*100:.2f}%")
 
-original_energy_sold_to_grid = monthly_data['Sold [kWh]'].sum()
-print(f"Original Energy Sold to Grid: {original_energy_sold_to_grid:.2f} kWh")
+    original_energy_sold_to_grid = monthly_data['Sold [kWh]'].sum()
+    print(f"Original Energy Sold to Grid: {original_energy_sold_to_grid:.2f} kWh")
 
-plot_energy_data(monthly_data, 'Self-consumed [kWh]', 'Bought [kWh]', 'Original Monthly Energy Consumption', filename='original_scenario.png')
+    plot_energy_data(monthly_data, 'Self-consumed [kWh]', 'Bought [kWh]', 'Original Monthly Energy Consumption', filename='original_scenario.png')
 
+    # --- Increased PV Scenario ---
+    print("\n--- Increased PV Scenario ---")
+    monthly_data = compute_increased_pv_scenario(monthly_data)
 
-# --- Increased PV Scenario ---
-print("\n--- Increased PV Scenario ---")
-capacity_pv = 938.80
-incresed_pv = capacity_pv + 200.00
-increase_factor = incresed_pv / capacity_pv
+    new_self_consumption_sum = monthly_data['New Self-consumed [kWh]'].sum()
+    new_self_consumption_percentage = new_self_consumption_sum / original_total_need_sum
+    print(f"New Self-consumption with increased PV: {new_self_consumption_percentage*100:.2f}%")
 
-monthly_data['New PV production [kWh]'] = monthly_data['PV production [kWh]'] * increase_factor
-monthly_data['New Self-consumed [kWh]'] = monthly_data['Self-consumed [kWh]'] * increase_factor
-monthly_data['New Bought [kWh]'] = monthly_data['Total need [kWh]'] - monthly_data['New Self-consumed [kWh]']
-monthly_data['New Bought [kWh]'] = monthly_data['New Bought [kWh]'].apply(lambda x: max(0, x))
-monthly_data['New Sold [kWh]'] = monthly_data['New PV production [kWh]'] - monthly_data['New Self-consumed [kWh]']
-monthly_data['New Sold [kWh]'] = monthly_data['New Sold [kWh]'].apply(lambda x: max(0, x))
+    new_energy_sold_to_grid = monthly_data['New Sold [kWh]'].sum()
+    print(f"New Energy Sold to Grid: {new_energy_sold_to_grid:.2f} kWh")
 
-new_self_consumption_sum = monthly_data['New Self-consumed [kWh]'].sum()
-new_self_consumption_percentage = new_self_consumption_sum / original_total_need_sum
-print(f"New Self-consumption with increased PV: {new_self_consumption_percentage*100:.2f}%")
+    plot_energy_data(monthly_data, 'New Self-consumed [kWh]', 'New Bought [kWh]', 'Increased PV Scenario Monthly Energy Consumption', filename='increased_pv_scenario.png')
 
-new_energy_sold_to_grid = monthly_data['New Sold [kWh]'].sum()
-print(f"New Energy Sold to Grid: {new_energy_sold_to_grid:.2f} kWh")
 
-plot_energy_data(monthly_data, 'New Self-consumed [kWh]', 'New Bought [kWh]', 'Increased PV Scenario Monthly Energy Consumption', filename='increased_pv_scenario.png')
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+import argparse
+import gzip
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+import heat_map
+import sankey
+from LCA import material_data
+from pv_analysis import compute_increased_pv_scenario
+
+# --- Constants ---
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR / "data"
+CACHE_DIR = SCRIPT_DIR / ".report_cache"
+
+# Bump when a figure builder changes so stale cache entries are not served
+FIGURE_VERSION = "1"
+
+INDEX_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>TPPEE Energy Reports</title>
+<script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 20px; }}
+.figure {{ height: 700px; margin-bottom: 40px; }}
+</style>
+</head>
+<body>
+<h1>TPPEE Energy Reports</h1>
+{sections}
+<script>
+for (const view of {views}) {{
+    fetch(`/figures/${{view}}.json`)
+        .then(response => response.json())
+        .then(fig => Plotly.newPlot(view, fig.data, fig.layout, {{responsive: true}}))
+        .then(gd => {{ if (view === "sankey_drilldown") attachDrilldown(gd); }});
+}}
+
+// Clicking a node fetches only that node's children and appends them. Node
+// ids are looked up in a Map and only the new entries are sent to
+// extendTraces, so an expansion costs the number of children, not the
+// number of visible nodes.
+function attachDrilldown(gd) {{
+    const expanded = new Set(["TOTAL ELECTRICAL CONSUMPTION"]);
+    const index = new Map(gd.data[0].node.customdata.map((id, i) => [id, i]));
+    const colors = new Map(gd.data[0].node.customdata.map((id, i) => [id, gd.data[0].node.color[i]]));
+    gd.on("plotly_click", event => {{
+        const point = event.points[0];
+        if (!("sourceLinks" in point)) return;
+        const nodeId = gd.data[0].node.customdata[point.pointNumber];
+        if (expanded.has(nodeId)) return;
+        expanded.add(nodeId);
+        fetch(`/sankey/children?node=${{encodeURIComponent(nodeId)}}`)
+            .then(response => response.json())
+            .then(payload => {{
+                const nodes = payload.nodes.filter(child => !index.has(child.id));
+                for (const child of nodes) {{
+                    index.set(child.id, index.size);
+                    colors.set(child.id, child.color);
+                }}
+                Plotly.extendTraces(gd, {{
+                    "node.customdata": [nodes.map(child => child.id)],
+                    "node.label": [nodes.map(child => child.label)],
+                    "node.color": [nodes.map(child => child.color)],
+                    "link.source": [payload.links.map(l => index.get(l.source))],
+                    "link.target": [payload.links.map(l => index.get(l.target))],
+                    "link.value": [payload.links.map(l => l.value)],
+                    "link.color": [payload.links.map(l => colors.get(l.source).replace("0.8", "0.4"))],
+                }}, [0]);
+            }});
+    }});
+}}
+</script>
+</body>
+</html>
+"""
+
+
+# --- Figure Builders ---
+
+def build_sankey_figure() -> go.Figure:
+    monthly_df = sankey.load_data(DATA_DIR / "montly_data.csv")
+    sectors_df = sankey.load_data(DATA_DIR / "sectors.csv")
+    nodes, links = sankey.prepare_sankey_data(monthly_df, sectors_df)
+    return sankey.create_sankey_figure(nodes, links)
+
+
+def build_sankey_tree() -> Tuple[Dict[str, Dict], pd.DataFrame]:
+    monthly_df = sankey.load_data(DATA_DIR / "montly_data.csv")
+    sectors_df = sankey.load_data(DATA_DIR / "sectors.csv")
+    return sankey.build_sankey_tree(monthly_df, sectors_df), monthly_df
+
+
+def build_sankey_drilldown_figure() -> go.Figure:
+    tree, monthly_df = build_sankey_tree()
+    fig = sankey.create_drilldown_figure(tree, monthly_df)
+    fig.update_layout(title_text="<b>Energy Flow Sankey Diagram</b> (click a node to expand)")
+    return fig
+
+
+def build_risk_figure() -> go.Figure:
+    risk_db = heat_map.load_risk_table(SCRIPT_DIR / "risk_table.csv")
+    return heat_map.create_risk_heatmap_figure(risk_db)
+
+
+def build_pv_scenario_figure() -> go.Figure:
+    monthly_df = compute_increased_pv_scenario(
+        pd.read_csv(DATA_DIR / "montly_data.csv", sep=";")
+    )
+    fig = go.Figure()
+    scenarios = [
+        ("Original", "Self-consumed [kWh]", "Bought [kWh]"),
+        ("Increased PV", "New Self-consumed [kWh]", "New Bought [kWh]"),
+    ]
+    for scenario, self_col, bought_col in scenarios:
+        # Same colors as pv_analysis.plot_energy_data, grouped per scenario
+        fig.add_bar(
+            x=[monthly_df["Month"], [scenario] * len(monthly_df)],
+            y=monthly_df[self_col] / 1000,
+            name=f"Self-consumed ({scenario})",
+            marker_color="#1f77b4",
+        )
+        fig.add_bar(
+            x=[monthly_df["Month"], [scenario] * len(monthly_df)],
+            y=monthly_df[bought_col] / 1000,
+            name=f"Bought from Grid ({scenario})",
+            marker_color="#ff7f0e",
+        )
+    fig.update_layout(
+        barmode="relative",
+        title_text="<b>PV Scenarios: Monthly Energy Consumption</b>",
+        yaxis_title="Energy (MWh)",
+    )
+    return fig
+
+
+def build_lca_figure() -> go.Figure:
+    df = material_data.compute_group_percentages()
+    fig = go.Figure(
+        go.Pie(
+            labels=df["Material"],
+            values=df["Percentage"],
+            hole=0.4,
+            sort=False,
+            marker_colors=[material_data.color_map.get(m, "#E0E0E0") for m in df["Material"]],
+            hovertemplate="%{label}: %{value:.1f}%<extra></extra>",
+        )
+    )
+    fig.update_layout(
+        title_text="<b>Material Input Composition</b>",
+        annotations=[
+            dict(text=f"Total<br>{material_data.total_input:,.1f} kg", showarrow=False, font_size=16)
+        ],
+    )
+    return fig
+
+
+@dataclass
+class FigureView:
+    """A served figure together with the files its content depends on."""
+
+    name: str
+    title: str
+    builder: Callable[[], go.Figure]
+    inputs: List[Path]
+
+
+# Each view depends on its data files and on the module its builder draws with
+VIEWS = [
+    FigureView("sankey", "Energy Flow Sankey", build_sankey_figure,
+               [DATA_DIR / "montly_data.csv", DATA_DIR / "sectors.csv", SCRIPT_DIR / "sankey.py"]),
+    FigureView("sankey_drilldown", "Energy Flow Drill-down", build_sankey_drilldown_figure,
+               [DATA_DIR / "montly_data.csv", DATA_DIR / "sectors.csv", SCRIPT_DIR / "sankey.py"]),
+    FigureView("risk", "Risk Heat Map", build_risk_figure,
+               [SCRIPT_DIR / "risk_table.csv", SCRIPT_DIR / "heat_map.py"]),
+    FigureView("pv", "PV Scenarios", build_pv_scenario_figure,
+               [DATA_DIR / "montly_data.csv", SCRIPT_DIR / "pv_analysis.py"]),
+    FigureView("lca", "LCA Material Composition", build_lca_figure,
+               [SCRIPT_DIR / "LCA" / "material_data.py"]),
+]
+
+
+# --- Figure Cache ---
+
+@dataclass
+class CachedFigure:
+    key: str
+    body: bytes
+    gzip_body: bytes
+
+    def etag(self, gzipped: bool = False) -> str:
+        """Strong ETag of one encoding; the gzip and identity bodies differ, so do their tags."""
+        return f'"{self.key[:32]}-gz"' if gzipped else f'"{self.key[:32]}"'
+
+
+class FigureCache:
+    """
+    Keeps figure JSON per view, keyed by a hash of the view's input files.
+
+    Inputs are only re-hashed when their size or mtime changes, and a figure
+    is only rebuilt when that hash changes, so unchanged views are served
+    straight from memory (or from the on-disk cache after a restart).
+    """
+
+    def __init__(self, views: List[FigureView], cache_dir: Path = CACHE_DIR):
+        self.views = {view.name: view for view in views}
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(exist_ok=True)
+        self._figures: Dict[str, CachedFigure] = {}
+        self._stats: Dict[str, Tuple] = {}
+        self._keys: Dict[str, str] = {}
+        # Reentrant: get() holds the view's lock when it calls input_key
+        self._locks = {name: threading.RLock() for name in self.views}
+
+    def input_key(self, view: FigureView) -> str:
+        with self._locks[view.name]:
+            stats = tuple((path.stat().st_mtime_ns, path.stat().st_size) for path in view.inputs)
+            if self._stats.get(view.name) == stats:
+                return self._keys[view.name]
+
+            digest = hashlib.sha256(f"{view.name}:{FIGURE_VERSION}".encode())
+            for path in view.inputs:
+                digest.update(path.read_bytes())
+            key = digest.hexdigest()
+            self._stats[view.name] = stats
+            self._keys[view.name] = key
+            return key
+
+    def get(self, name: str) -> CachedFigure:
+        """Returns the cached figure for a view, rebuilding it only if its inputs changed."""
+        view = self.views[name]
+        with self._locks[name]:
+            key = self.input_key(view)
+            cached = self._figures.get(name)
+            if cached is not None and cached.key == key:
+                return cached
+
+            cache_file = self.cache_dir / f"{name}-{key}.json"
+            if cache_file.is_file():
+                body = cache_file.read_bytes()
+            else:
+                body = pio.to_json(view.builder(), validate=False).encode("utf-8")
+                tmp_file = cache_file.with_suffix(".tmp")
+                tmp_file.write_bytes(body)
+                tmp_file.replace(cache_file)
+                # Drop entries for older versions of this view's inputs
+                for stale in self.cache_dir.glob(f"{name}-*.json"):
+                    if stale != cache_file:
+                        stale.unlink(missing_ok=True)
+
+            cached = CachedFigure(key, body, gzip.compress(body))
+            self._figures[name] = cached
+            return cached
+
+    def warm(self) -> None:
+        """Precomputes every view so the first requests do not pay for it."""
+        for name in self.views:
+            self.get(name)
+
+
+class SankeyTreeCache:
+    """
+    Pre-aggregated Sankey tree for drill-down requests, rebuilt only when the
+    drill-down view's inputs change. Each children payload is serialized once
+    per tree version, so a request costs the size of one node's children.
+    """
+
+    def __init__(self, figures: FigureCache, view_name: str = "sankey_drilldown"):
+        self.figures = figures
+        self.view = figures.views[view_name]
+        self._key = None
+        self._tree = None
+        self._payloads: Dict[str, CachedFigure] = {}
+        self._lock = threading.Lock()
+
+    def children(self, node_id: str) -> Optional[CachedFigure]:
+        with self._lock:
+            key = self.figures.input_key(self.view)
+            if key != self._key:
+                self._tree, _ = build_sankey_tree()
+                self._key = key
+                self._payloads = {}
+            if node_id not in self._tree:
+                return None
+            if node_id not in self._payloads:
+                body = json.dumps(sankey.drilldown_payload(self._tree, node_id)).encode("utf-8")
+                node_key = hashlib.sha256(f"{key}:{node_id}".encode()).hexdigest()
+                self._payloads[node_id] = CachedFigure(node_key, body, gzip.compress(body))
+            return self._payloads[node_id]
+
+
+# --- HTTP Server ---
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    cache: FigureCache = None
+    trees: SankeyTreeCache = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path
+        if path in ("/", "/index.html"):
+            self._send_index()
+        elif path.startswith("/figures/") and path.endswith(".json"):
+            name = path[len("/figures/"):-len(".json")]
+            if name not in self.cache.views:
+                self.send_error(HTTPStatus.NOT_FOUND, f"Unknown figure: {name}")
+                return
+            self._send_figure(self.cache.get(name))
+        elif path == "/sankey/children":
+            node_id = parse_qs(url.query).get("node", [""])[0]
+            payload = self.trees.children(node_id)
+            if payload is None:
+                self.send_error(HTTPStatus.NOT_FOUND, f"Unknown node: {node_id}")
+                return
+            self._send_figure(payload)
+        else:
+            self.send_error(HTTPStatus.NOT_FOUND)
+
+    def _send_index(self):
+        sections = "\n".join(
+            f'<h2>{view.title}</h2>\n<div id="{view.name}" class="figure"></div>'
+            for view in self.cache.views.values()
+        )
+        body = INDEX_HTML.format(sections=sections, views=json.dumps(list(self.cache.views))).encode("utf-8")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_figure(self, figure: CachedFigure):
+        use_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        etag = figure.etag(use_gzip)
+        if _etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        body = figure.gzip_body if use_gzip else figure.body
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        # Clients may keep the figure but must revalidate it against the ETag
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    """Precomputes all figures and serves them on a local HTTP server."""
+    parser = argparse.ArgumentParser(description="Serve the TPPEE report figures locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--precompute-only", action="store_true",
+                        help="Build the figure cache and exit without serving.")
+    args = parser.parse_args()
+
+    cache = FigureCache(VIEWS)
+    cache.warm()
+    if args.precompute_only:
+        print(f"Figure cache written to {cache.cache_dir}")
+        return
+
+    ReportRequestHandler.cache = cache
+    ReportRequestHandler.trees = SankeyTreeCache(cache)
+    server = ThreadingHTTPServer((args.host, args.port), ReportRequestHandler)
+    print(f"Serving reports on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import argparse
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# --- Constants ---
+DEFAULT_DB_PATH = Path(__file__).parent / "data" / "kpi_results.sqlite"
+DEFAULT_SITE = "main"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    source TEXT NOT NULL,
+    note TEXT
+);
+CREATE TABLE IF NOT EXISTS kpis (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    site TEXT NOT NULL,
+    subsector TEXT NOT NULL,
+    kpi TEXT NOT NULL,
+    period_start TEXT NOT NULL,
+    period_end TEXT NOT NULL,
+    value REAL NOT NULL,
+    unit TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_kpis_site_period ON kpis (site, period_start);
+CREATE INDEX IF NOT EXISTS idx_kpis_kpi_period ON kpis (kpi, subsector, period_start);
+CREATE INDEX IF NOT EXISTS idx_kpis_run ON kpis (run_id);
+"""
+
+KPI_COLUMNS = ["site", "subsector", "kpi", "period_start", "period_end", "value", "unit"]
+
+INSERT_RUN = "INSERT INTO runs (created_at, source, note) VALUES (?, ?, ?)"
+INSERT_KPI = (
+    "INSERT INTO kpis (run_id, site, subsector, kpi, period_start, period_end, value, unit) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+class ResultsStore:
+    """
+    Embedded SQLite store of KPI results, one row per site, subsector, KPI,
+    period and run. Runs are appended rather than overwritten, so history
+    stays queryable; queries on site/time range and KPI/subsector/time range
+    are served from indexes.
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def start_run(self, source: str, note: Optional[str] = None) -> int:
+        with self.conn:
+            cursor = self.conn.execute(INSERT_RUN, (datetime.now().isoformat(timespec="seconds"), source, note))
+        return cursor.lastrowid
+
+    def insert_rows(self, run_id: int, rows: Iterable[Sequence]) -> int:
+        """Bulk-inserts (site, subsector, kpi, period_start, period_end, value, unit) tuples in one transaction."""
+        with self.conn:
+            cursor = self.conn.executemany(INSERT_KPI, ((run_id, *row) for row in rows))
+        return cursor.rowcount
+
+    @staticmethod
+    def _frame_rows(frame: pd.DataFrame) -> Iterable[Sequence]:
+        frame = frame[KPI_COLUMNS].astype({"period_start": str, "period_end": str, "value": float})
+        return frame.itertuples(index=False, name=None)
+
+    def insert_frame(self, run_id: int, frame: pd.DataFrame) -> int:
+        """Bulk-inserts a DataFrame holding the KPI_COLUMNS."""
+        return self.insert_rows(run_id, self._frame_rows(frame))
+
+    def record_run(self, source: str, frame: pd.DataFrame, note: Optional[str] = None) -> int:
+        """
+        Creates a run and inserts its KPI rows in one transaction, so a failed
+        insert leaves no empty run behind to shadow the previous results.
+        """
+        rows = self._frame_rows(frame)
+        with self.conn:
+            run_id = self.conn.execute(
+                INSERT_RUN, (datetime.now().isoformat(timespec="seconds"), source, note)
+            ).lastrowid
+            self.conn.executemany(INSERT_KPI, ((run_id, *row) for row in rows))
+        return run_id
+
+    def query(self, kpi: Optional[str] = None, site: Optional[str] = None, subsector: Optional[str] = None,
+              start: Optional[str] = None, end: Optional[str] = None, latest_run_only: bool = True) -> pd.DataFrame:
+        """
+        KPI rows filtered by site, KPI, subsector and period range. With
+        latest_run_only, each (site, subsector, kpi, period) keeps only the
+        value of its most recent run.
+        """
+        clauses, params = [], []
+        for column, value in (("k.kpi", kpi), ("k.site", site), ("k.subsector", subsector)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append("k.period_start >= ?")
+            params.append(str(start))
+        if end is not None:
+            clauses.append("k.period_start < ?")
+            params.append(str(end))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        sql = f"SELECT k.*, r.created_at FROM kpis k JOIN runs r USING (run_id) {where}"
+        if latest_run_only:
+            sql = (
+                f"SELECT * FROM ({sql}) q WHERE run_id = ("
+                "SELECT MAX(k2.run_id) FROM kpis k2 WHERE k2.site = q.site AND k2.subsector = q.subsector "
+                "AND k2.kpi = q.kpi AND k2.period_start = q.period_start)"
+            )
+        return pd.read_sql_query(sql + " ORDER BY period_start, site, subsector", self.conn, params=params)
+
+    def year_over_year(self, kpi: str, site: str = DEFAULT_SITE) -> pd.DataFrame:
+        """Latest value per subsector and year, one column per year."""
+        rows = self.query(kpi=kpi, site=site)
+        if rows.empty:
+            return rows
+        rows["year"] = rows["period_start"].str[:4]
+        return rows.pivot_table(index="subsector", columns="year", values="value", aggfunc="sum")
+
+
+def year_period(year: int) -> Tuple[str, str]:
+    return f"{year}-01-01", f"{year + 1}-01-01"
+
+
+def record_sector_kpis(store: ResultsStore, consumption_per_product: pd.DataFrame, year: int,
+                       site: str = DEFAULT_SITE, source: str = "key_indicators.py") -> int:
+    """Stores the key_indicators.py outputs: annual consumption and kWh per product per subsector."""
+    start, end = year_period(year)
+    frame = consumption_per_product.melt(
+        id_vars="Subsector", value_vars=["Consumption [kWh/year]", "Consumption [kWh/product]"],
+        var_name="column", value_name="value",
+    ).rename(columns={"Subsector": "subsector"})
+    frame["kpi"] = frame["column"].map({"Consumption [kWh/year]": "Consumption",
+                                        "Consumption [kWh/product]": "Consumption per product"})
+    frame["unit"] = frame["column"].map({"Consumption [kWh/year]": "kWh",
+                                         "Consumption [kWh/product]": "kWh/product"})
+    frame = frame.assign(site=site, period_start=start, period_end=end)
+    return store.record_run(source, frame)
+
+
+def record_lighting_kpis(store: ResultsStore, results_df: pd.DataFrame, year: int,
+                         site: str = DEFAULT_SITE, source: str = "lights_computation.py") -> int:
+    """
+    Stores the lights_computation.py outputs under the Lighting subsector.
+    The weekly figures are a typical week of the reporting year and are kept
+    apart from the yearly total by their KPI name and kWh/week unit.
+    """
+    start, end = year_period(year)
+    floor = results_df["Floor"].str.replace(r"_(weekly|yearly)$", "", case=False, regex=True)
+    weekly = results_df["Floor"].str.lower().str.endswith("_weekly")
+    frame = pd.DataFrame({
+        "site": site,
+        "subsector": "Lighting",
+        "kpi": ("Lighting consumption " + weekly.map({True: "per week ", False: ""}) + floor).to_numpy(),
+        "period_start": start,
+        "period_end": end,
+        "value": results_df["Power Consumption (kWh)"].to_numpy(),
+        "unit": weekly.map({True: "kWh/week", False: "kWh"}).to_numpy(),
+    })
+    return store.record_run(source, frame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the KPI results store.")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_PATH)
+    parser.add_argument("--kpi", default=None)
+    parser.add_argument("--site", default=None)
+    parser.add_argument("--subsector", default=None)
+    parser.add_argument("--start", default=None, help="Inclusive period start, e.g. 2025-01-01")
+    parser.add_argument("--end", default=None, help="Exclusive period start bound")
+    parser.add_argument("--all-runs", action="store_true", help="Include superseded runs.")
+    args = parser.parse_args()
+
+    if not args.db.is_file():
+        print(f"No results store at {args.db}; run key_indicators.py or lights_computation.py first.")
+        return
+
+    with ResultsStore(args.db) as store:
+        rows = store.query(args.kpi, args.site, args.subsector, args.start, args.end,
+                           latest_run_only=not args.all_runs)
+    pd.set_option("display.width", 160)
+    print(rows.to_string(index=False) if not rows.empty else "No matching KPI rows.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Callable, List, Sequence, Tuple
+
+from load_profiles import PROFILE_YEAR, interval_index, monthly_to_interval
+from multi_site import MONTHLY_COLUMNS, MONTHS, load_group
+from peak_analytics import subsector_profiles
+
+# --- Constants ---
+# Rollup levels from finest to coarsest. Keys are integer bucket numbers;
+# every bucket boundary of a level is also a boundary of the finer levels.
+LEVELS = ["1min", "15min", "hour", "day", "month"]
+GROWTH_FACTOR = 1.5
+
+
+def _fixed_width(minutes: int) -> Tuple[Callable, Callable]:
+    return (lambda m: m // minutes), (lambda k: k * minutes)
+
+
+def _month_key(m: np.ndarray) -> np.ndarray:
+    return np.asarray(m, dtype="datetime64[m]").astype("datetime64[M]").astype(np.int64)
+
+
+def _month_start(k: np.ndarray) -> np.ndarray:
+    return np.asarray(k, dtype="datetime64[M]").astype("datetime64[m]").astype(np.int64)
+
+
+# Level name -> (minute -> bucket key, bucket key -> start minute)
+_KEY_FUNCTIONS = {
+    "1min": _fixed_width(1),
+    "15min": _fixed_width(15),
+    "hour": _fixed_width(60),
+    "day": _fixed_width(1440),
+    "month": (_month_key, _month_start),
+}
+
+
+def _aggregate(keys: np.ndarray, sums: np.ndarray, counts: np.ndarray):
+    """Sums rows sharing a key; keys must be sorted."""
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return keys[starts], np.add.reduceat(sums, starts, axis=0), np.add.reduceat(counts, starts)
+
+
+class RollupLevel:
+    """Sorted buckets of one resolution, in arrays grown geometrically on append."""
+
+    def __init__(self, name: str, n_series: int):
+        self.name = name
+        self.to_key, self.key_start = _KEY_FUNCTIONS[name]
+        self.size = 0
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._sums = np.zeros((0, n_series))
+        self._counts = np.zeros(0, dtype=np.int64)
+
+    @property
+    def keys(self) -> np.ndarray:
+        return self._keys[:self.size]
+
+    @property
+    def sums(self) -> np.ndarray:
+        return self._sums[:self.size]
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self._counts[:self.size]
+
+    def replace_tail(self, start: int, keys: np.ndarray, sums: np.ndarray, counts: np.ndarray) -> None:
+        """Overwrites the buckets from position start onwards."""
+        end = start + len(keys)
+        if end > len(self._keys):
+            capacity = max(end, int(len(self._keys) * GROWTH_FACTOR))
+            self._keys = np.resize(self._keys, capacity)
+            self._counts = np.resize(self._counts, capacity)
+            grown = np.zeros((capacity, self._sums.shape[1]))
+            grown[:self.size] = self.sums
+            self._sums = grown
+        self._keys[start:end] = keys
+        self._sums[start:end] = sums
+        self._counts[start:end] = counts
+        self.size = end
+
+
+class RollupPyramid:
+    """
+    Pre-aggregated sums of many series at 1-minute, 15-minute, hourly, daily
+    and monthly resolution.
+
+    Appending new readings re-aggregates only the buckets they touch, level by
+    level from the one below. A range query sums the coarsest buckets that
+    fit entirely inside the range and descends only for the partial buckets
+    at its two edges, so a year costs a few hundred bucket reads at most.
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+        self.levels = [RollupLevel(name, len(self.columns)) for name in LEVELS]
+
+    def append(self, timestamps: pd.DatetimeIndex, values: np.ndarray) -> None:
+        """Adds readings (T, series) taken at or after the last stored minute."""
+        minutes = np.asarray(timestamps, dtype="datetime64[m]").astype(np.int64)
+        if len(minutes) == 0:
+            return
+        if np.any(np.diff(minutes) < 0):
+            raise ValueError("Timestamps must be sorted")
+        finest = self.levels[0]
+        if finest.size and minutes[0] < finest.keys[-1]:
+            raise ValueError("Appended readings must not precede the stored data")
+
+        # Finest level: merge the new minutes with the last stored bucket they may share
+        start = np.searchsorted(finest.keys, minutes[0])
+        keys, sums, counts = _aggregate(
+            np.r_[finest.keys[start:], minutes],
+            np.vstack([finest.sums[start:], np.asarray(values, dtype=float)]),
+            np.r_[finest.counts[start:], np.ones(len(minutes), dtype=np.int64)],
+        )
+        finest.replace_tail(start, keys, sums, counts)
+
+        for below, level in zip(self.levels[:-1], self.levels[1:]):
+            # Rebuild every bucket of this level overlapping the changed part of the level below
+            first_key = level.to_key(below.key_start(below.keys[start]))
+            source = np.searchsorted(below.keys, below.to_key(level.key_start(first_key)))
+            keys, sums, counts = _aggregate(
+                level.to_key(below.key_start(below.keys[source:])), below.sums[source:], below.counts[source:]
+            )
+            start = np.searchsorted(level.keys, first_key)
+            level.replace_tail(start, keys, sums, counts)
+
+    def _range_sum(self, depth: int, start: int, end: int) -> Tuple[np.ndarray, int]:
+        """Sums over minutes [start, end) using levels up to depth; returns (sums, buckets read)."""
+        level = self.levels[depth]
+        if depth == 0:
+            i, j = np.searchsorted(level.keys, [start, end])
+            return level.sums[i:j].sum(axis=0), j - i
+
+        # Buckets lying entirely inside the range
+        low = level.to_key(start)
+        if level.key_start(low) < start:
+            low += 1
+        high = level.to_key(end)
+        if low >= high:
+            return self._range_sum(depth - 1, start, end)
+
+        i, j = np.searchsorted(level.keys, [low, high])
+        total, blocks = level.sums[i:j].sum(axis=0), j - i
+        for edge_start, edge_end in ((start, level.key_start(low)), (level.key_start(high), end)):
+            if edge_start < edge_end:
+                edge, edge_blocks = self._range_sum(depth - 1, edge_start, edge_end)
+                total, blocks = total + edge, blocks + edge_blocks
+        return total, blocks
+
+    def query(self, start, end) -> pd.Series:
+        """Sum of every series over [start, end), at 1-minute resolution."""
+        start_min, end_min = np.array([start, end], dtype="datetime64[m]").astype(np.int64)
+        total, blocks = self._range_sum(len(self.levels) - 1, int(start_min), int(end_min))
+        result = pd.Series(total, index=self.columns)
+        result.attrs["buckets_read"] = int(blocks)
+        return result
+
+    def buckets(self, level: str, start=None, end=None) -> pd.DataFrame:
+        """Stored buckets of one level, optionally limited to bucket starts in [start, end)."""
+        rollup = self.levels[LEVELS.index(level)]
+        index = pd.DatetimeIndex(rollup.key_start(rollup.keys).astype("datetime64[m]"))
+        mask = np.ones(len(index), dtype=bool)
+        if start is not None:
+            mask &= index >= pd.Timestamp(start)
+        if end is not None:
+            mask &= index < pd.Timestamp(end)
+        return pd.DataFrame(rollup.sums[mask], index=index[mask], columns=self.columns)
+
+
+def to_monthly_data(pyramid: RollupPyramid, year: int = PROFILE_YEAR) -> pd.DataFrame:
+    """The montly_data.csv layout, read from the monthly rollup."""
+    monthly = pyramid.buckets("month", f"{year}-01-01", f"{year + 1}-01-01")
+    frame = monthly.reindex(pd.date_range(f"{year}-01-01", periods=12, freq="MS"), fill_value=0.0)
+    result = frame[MONTHLY_COLUMNS].reset_index(drop=True)
+    result.insert(0, "Month", MONTHS)
+    return result
+
+
+def build_minute_data(script_dir: Path, year: int = PROFILE_YEAR) -> Tuple[pd.DatetimeIndex, np.ndarray, List[str]]:
+    """Synthetic 1-minute plant balance and subsector consumption for the demo."""
+    monthly_df = pd.read_csv(script_dir / "data" / "montly_data.csv", sep=";")
+    index = interval_index(year, "min")
+    balance = monthly_to_interval(monthly_df, year, "min")
+    group = load_group([script_dir])
+    subsectors = subsector_profiles(group, index)[0]
+    values = np.column_stack([balance[MONTHLY_COLUMNS].to_numpy(), subsectors.T])
+    return index, values, MONTHLY_COLUMNS + group.subsectors
+
+
+def main():
+    script_dir = Path(__file__).parent
+    index, values, columns = build_minute_data(script_dir)
+    pyramid = RollupPyramid(columns)
+
+    # Readings arrive in daily batches
+    t0 = time.perf_counter()
+    day_starts = np.flatnonzero(np.r_[True, index.day[1:] != index.day[:-1]])
+    for a, b in zip(day_starts, np.r_[day_starts[1:], len(index)]):
+        pyramid.append(index[a:b], values[a:b])
+    elapsed = time.perf_counter() - t0
+    print(f"Appended {len(index):,} minutes in {len(day_starts)} batches in {elapsed:.2f} s")
+    print("Buckets per level: " + ", ".join(f"{lv.name}={lv.size:,}" for lv in pyramid.levels))
+
+    frame = pd.DataFrame(values, index=index, columns=columns)
+    pd.set_option("display.width", 200)
+    for start, end in (("2025-01-01", "2026-01-01"), ("2025-03-14 07:23", "2025-11-02 18:41")):
+        t0 = time.perf_counter()
+        result = pyramid.query(start, end)
+        query_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        rows = frame.loc[start:pd.Timestamp(end) - pd.Timedelta("1min")]
+        scan = rows.sum()
+        scan_ms = (time.perf_counter() - t0) * 1000
+        print(f"\n[{start}, {end}): {result.attrs['buckets_read']} buckets in {query_ms:.2f} ms "
+              f"(scan of {len(rows):,} rows: {scan_ms:.1f} ms), "
+              f"max difference {np.abs(result - scan).max():.2e} kWh")
+        print(result[MONTHLY_COLUMNS].round(0).to_string())
+
+    print("\n--- Monthly data from the rollup ---")
+    print(to_monthly_data(pyramid).round(0).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
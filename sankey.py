@@ -138,6 +138,101 @@ def create_sankey_figure(nodes: Dict, links: Dict) -> go.Figure:
     )
     return fig
 
+# --- Drill-down Functions ---
+
+TOTAL_NODE = "TOTAL ELECTRICAL CONSUMPTION"
+PATH_SEPARATOR = " / "
+
+
+def build_sankey_tree(monthly_df: pd.DataFrame, sectors_df: pd.DataFrame,
+                      level_columns: Tuple[str, ...] = ("Sector", "Subsector")) -> Dict[str, Dict]:
+    """
+    Pre-aggregates the consumption hierarchy into a node table keyed by path.
+
+    level_columns lists the hierarchy from the top down; a sub-metering file
+    can add deeper columns (e.g. "Meter") and every level is summed once
+    here, so expanding a node later only has to read its own children.
+    """
+    total = sectors_df["Consumption [kWh/year]"].sum()
+    tree = {
+        "PV": {"name": "PV", "parent": None, "value": float(monthly_df["PV production [kWh]"].sum()), "children": []},
+        "GRID": {"name": "GRID", "parent": None, "value": float(monthly_df["Bought [kWh]"].sum()), "children": []},
+        TOTAL_NODE: {"name": TOTAL_NODE, "parent": None, "value": float(total), "children": []},
+    }
+    for node_id in tree:
+        tree[node_id]["color"] = COLOR_PALETTE[node_id]
+        tree[node_id]["label"] = f"<b>{node_id}</b>"
+
+    for depth in range(1, len(level_columns) + 1):
+        columns = list(level_columns[:depth])
+        sums = sectors_df.groupby(columns, sort=True)["Consumption [kWh/year]"].sum()
+        for key, value in sums.items():
+            path = (key,) if depth == 1 else key
+            node_id = PATH_SEPARATOR.join(path)
+            parent_id = PATH_SEPARATOR.join(path[:-1]) if depth > 1 else TOTAL_NODE
+            tree[node_id] = {
+                "name": path[-1],
+                "parent": parent_id,
+                "value": float(value),
+                "children": [],
+                "color": COLOR_PALETTE.get(path[0], "rgba(200, 200, 200, 0.8)"),
+                "label": f"<b>{path[-1]}<br>({value / total * 100:.1f}%)</b>",
+            }
+            tree[parent_id]["children"].append(node_id)
+    return tree
+
+
+def drilldown_payload(tree: Dict[str, Dict], node_id: str) -> Dict:
+    """Nodes and links for the children of one node only."""
+    node = tree[node_id]
+    nodes, links = [], []
+    for child_id in node["children"]:
+        child = tree[child_id]
+        if child["value"] <= 0:
+            continue
+        nodes.append({
+            "id": child_id,
+            "label": child["label"],
+            "color": child["color"],
+            "expandable": bool(child["children"]),
+        })
+        links.append({"source": node_id, "target": child_id, "value": child["value"]})
+    return {"node": node_id, "nodes": nodes, "links": links}
+
+
+def create_drilldown_figure(tree: Dict[str, Dict], monthly_df: pd.DataFrame,
+                            expanded: Tuple[str, ...] = ()) -> go.Figure:
+    """
+    Sankey with the supply side and the first consumption level, plus the
+    children of any node listed in expanded. Node ids go to customdata so a
+    client can request the children of a clicked node.
+    """
+    node_ids = ["PV", "GRID", TOTAL_NODE]
+    links = {"source": [], "target": [], "value": []}
+
+    def add_link(source: str, target: str, value: float):
+        if value > 0:
+            links["source"].append(node_ids.index(source))
+            links["target"].append(node_ids.index(target))
+            links["value"].append(value)
+
+    add_link("PV", "GRID", monthly_df["Sold [kWh]"].sum())
+    add_link("PV", TOTAL_NODE, monthly_df["Self-consumed [kWh]"].sum())
+    add_link("GRID", TOTAL_NODE, monthly_df["Bought [kWh]"].sum())
+
+    for parent_id in (TOTAL_NODE,) + tuple(expanded):
+        for child in drilldown_payload(tree, parent_id)["nodes"]:
+            node_ids.append(child["id"])
+            add_link(parent_id, child["id"], tree[child["id"]]["value"])
+
+    fig = create_sankey_figure(
+        {"label": [tree[n]["label"] for n in node_ids], "color": [tree[n]["color"] for n in node_ids]},
+        links,
+    )
+    fig.update_traces(node_customdata=node_ids)
+    return fig
+
+
 def main():
     """Main function to generate and show the Sankey diagram."""
     try:
@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from gannt import START_PROJECT, get_date_from_month, tasks_data
+from measure_portfolio import INTERACTIONS, MEASURES, SHIFTABLE_SUBSECTORS, plan_dependencies
+from pv_analysis import compute_energy_cost, compute_pv_balance
+
+# --- Constants ---
+HORIZON_MONTHS = 48  # 2026-2029
+# Level of each measure assumed in the plan (1-based index into its Levels)
+PLAN_LEVELS = {'T2': 2, 'T3': 2, 'T4': 2, 'T5': 2}
+# Delays [months] evaluated for every task, dependents move along
+DELAYS = (3, 6, 12)
+
+
+def plan_schedule(measures: List[Dict] = MEASURES) -> Dict[str, tuple]:
+    """(StartMonth, EndMonth) of each evaluated measure, from the Gantt plan."""
+    evaluated = {m['Task'] for m in measures}
+    return {
+        task['Task'].split(':')[0]: (task['StartMonth'], task['EndMonth'])
+        for task in tasks_data if task['Task'].split(':')[0] in evaluated
+    }
+
+
+def schedule_variants(base: Dict[str, tuple], delays=DELAYS, measures: List[Dict] = MEASURES) -> Dict[str, np.ndarray]:
+    """
+    The plan plus every single-task delay, as (start, end) month arrays of
+    shape (2, tasks). A delayed task delays the tasks depending on it.
+    """
+    tasks = list(base)
+    deps = plan_dependencies(measures)
+    variants = {'Plan': np.array([[base[t][0] for t in tasks], [base[t][1] for t in tasks]])}
+    for task in tasks:
+        moved = {task}
+        # Dependents of moved tasks move too, transitively
+        changed = True
+        while changed:
+            changed = False
+            for other, required in deps.items():
+                if other not in moved and moved.intersection(required):
+                    moved.add(other)
+                    changed = True
+        for delay in delays:
+            shift = np.array([delay if t in moved else 0 for t in tasks])
+            variants[f'{task} +{delay} months'] = variants['Plan'] + shift
+    return variants
+
+
+def ramp(schedules: np.ndarray, months: int = HORIZON_MONTHS) -> np.ndarray:
+    """
+    Share of each task's savings achieved per project month, rising linearly
+    over its active months. schedules has shape (V, 2, tasks); returns (V, tasks, months).
+    """
+    m = np.arange(1, months + 1)
+    start = schedules[:, 0, :, None]
+    end = schedules[:, 1, :, None]
+    return np.clip((m - start + 1) / (end - start + 1), 0.0, 1.0)
+
+
+@dataclass
+class TaskEffects:
+    """Per-task savings at full implementation, computed once and reused by every schedule."""
+
+    tasks: List[str]
+    fractions: np.ndarray  # (tasks,) savings fraction of the planned level
+    cuts: np.ndarray  # (tasks, subsectors) fraction of consumption saved
+    shift_share: np.ndarray  # (tasks,) share of exported PV moved into self-consumption
+    interactions: List[tuple]  # (task index, modifier index, subsector index, coefficient)
+
+    @classmethod
+    def from_measures(cls, measures: List[Dict], subsectors: List[str], levels: Dict[str, int] = PLAN_LEVELS):
+        tasks = [m['Task'] for m in measures]
+        fractions = np.array([
+            m['Levels'][levels[m['Task']] - 1][0] if levels.get(m['Task']) else 0.0 for m in measures
+        ])
+        cuts = np.zeros((len(tasks), len(subsectors)))
+        shift_share = np.zeros(len(tasks))
+        for i, measure in enumerate(measures):
+            if not measure['Subsectors']:
+                shift_share[i] = fractions[i]
+            for name, weight in measure['Subsectors'].items():
+                if name in subsectors:
+                    cuts[i, subsectors.index(name)] = fractions[i] * weight
+        rules = [
+            (tasks.index(r['Measure']), tasks.index(r['Modifier']), subsectors.index(r['Subsector']), r['Coefficient'])
+            for r in INTERACTIONS if r['Subsector'] in subsectors
+        ]
+        return cls(tasks, fractions, cuts, shift_share, rules)
+
+    def remaining(self, ramps: np.ndarray) -> np.ndarray:
+        """Remaining share of each subsector's consumption, shape (V, subsectors, months)."""
+        cut = ramps[:, :, None, :] * self.cuts[None, :, :, None]
+        for task, modifier, subsector, coefficient in self.interactions:
+            # Part of the task's savings shrinks as the modifier's savings ramp in
+            cut[:, task, subsector, :] *= 1 - coefficient * ramps[:, modifier, :] * self.fractions[modifier]
+        return np.prod(1 - cut, axis=1)
+
+
+def project_trajectory(sectors_df: pd.DataFrame, monthly_df: pd.DataFrame, schedules: np.ndarray,
+                       effects: TaskEffects, months: int = HORIZON_MONTHS) -> pd.DataFrame:
+    """
+    Monthly need, PV balance and cost for a batch of schedules (V, 2, tasks).
+    Subsector consumption follows the montly_data.csv profile; PV production
+    and the self-consumption ratio repeat the reference year.
+    """
+    subsectors = sectors_df['Subsector'].tolist()
+    annual = sectors_df['Consumption [kWh/year]'].to_numpy(dtype=float)
+    calendar = (START_PROJECT.month - 1 + np.arange(months)) % 12
+    need_share = (monthly_df['Total need [kWh]'] / monthly_df['Total need [kWh]'].sum()).to_numpy()[calendar]
+    baseline = annual[:, None] * need_share[None, :]  # (subsectors, months)
+
+    ramps = ramp(schedules, months)
+    consumption = effects.remaining(ramps) * baseline[None]  # (V, subsectors, months)
+    need = consumption.sum(axis=1)
+
+    pv = monthly_df['PV production [kWh]'].to_numpy()[calendar]
+    ratio = (monthly_df['Self-consumed [kWh]'] / monthly_df['PV production [kWh]']).to_numpy()[calendar]
+    n_variants = len(schedules)
+    balance = compute_pv_balance(need.ravel(), np.tile(pv, n_variants), np.tile(ratio, n_variants))
+
+    # Load shifting moves exported PV into self-consumption, up to the
+    # shiftable load and the energy still bought
+    shiftable = sum(
+        consumption[:, subsectors.index(name), :] * share
+        for name, share in SHIFTABLE_SUBSECTORS.items() if name in subsectors
+    )
+    shift_share = (ramps * effects.shift_share[None, :, None]).sum(axis=1)
+    moved = np.minimum.reduce([
+        shift_share.ravel() * balance['Sold [kWh]'].to_numpy(),
+        shiftable.ravel(),
+        balance['Bought [kWh]'].to_numpy(),
+    ])
+    balance['Self-consumed [kWh]'] += moved
+    balance['Bought [kWh]'] -= moved
+    balance['Sold [kWh]'] -= moved
+
+    balance = compute_energy_cost(balance)
+    dates = [get_date_from_month(m) for m in range(1, months + 1)]
+    balance.insert(0, 'Variant', np.repeat(np.arange(n_variants), months))
+    balance.insert(1, 'Month', np.tile(pd.DatetimeIndex(dates), n_variants))
+    balance['Baseline need [kWh]'] = np.tile(baseline.sum(axis=0), n_variants)
+    return balance
+
+
+def yearly_summary(trajectory: pd.DataFrame) -> pd.DataFrame:
+    """Yearly totals with savings against the reference year and the PV share of the need."""
+    yearly = trajectory.groupby(['Variant', trajectory['Month'].dt.year]).sum(numeric_only=True)
+    yearly['Savings [kWh]'] = yearly['Baseline need [kWh]'] - yearly['Total need [kWh]']
+    yearly['PV share [%]'] = yearly['Self-consumed [kWh]'] / yearly['Total need [kWh]'] * 100
+    return yearly.drop(columns='Baseline need [kWh]')
+
+
+def main():
+    script_dir = Path(__file__).parent
+    sectors_df = pd.read_csv(script_dir / 'data' / 'sectors.csv', sep=';')
+    monthly_df = pd.read_csv(script_dir / 'data' / 'montly_data.csv', sep=';')
+
+    effects = TaskEffects.from_measures(MEASURES, sectors_df['Subsector'].tolist())
+    base = plan_schedule()
+    variants = schedule_variants(base)
+    schedules = np.stack(list(variants.values()))
+    trajectory = project_trajectory(sectors_df, monthly_df, schedules, effects)
+    yearly = yearly_summary(trajectory)
+
+    pd.set_option('display.width', 200)
+    columns = ['Total need [kWh]', 'Savings [kWh]', 'Bought [kWh]', 'Sold [kWh]', 'PV share [%]', 'Net cost [EUR]']
+    print(f"--- Plan trajectory (levels {PLAN_LEVELS}) ---")
+    print(yearly.loc[0, columns].round(1).to_string())
+
+    names = list(variants)
+    totals = trajectory.groupby('Variant')[['Total need [kWh]', 'Baseline need [kWh]', 'Net cost [EUR]']].sum()
+    comparison = pd.DataFrame({
+        'Savings 2026-2029 [kWh]': totals['Baseline need [kWh]'] - totals['Total need [kWh]'],
+        'Net cost 2026-2029 [EUR]': totals['Net cost [EUR]'],
+    })
+    comparison.index = names
+    comparison['Extra cost vs plan [EUR]'] = comparison['Net cost 2026-2029 [EUR]'] - comparison.loc['Plan', 'Net cost 2026-2029 [EUR]']
+    print(f"\n--- {len(names)} schedule variants ---")
+    print(comparison.sort_values('Extra cost vs plan [EUR]').round(0).to_string())
+
+
+if __name__ == '__main__':
+    main()
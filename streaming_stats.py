@@ -0,0 +1,287 @@
+import argparse
+import csv
+import io
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+# --- Constants ---
+CHUNK_ROWS = 1_000_000
+SAMPLE_ROWS = 1_000
+QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.99)
+
+# Log-bucket quantile sketch: every estimate is within SKETCH_ALPHA relative
+# error of a true sample value. Magnitudes below SKETCH_MIN_VALUE count as
+# zero and those above SKETCH_MAX_VALUE share the top bucket, so each column
+# keeps a fixed number of counters regardless of the file size.
+SKETCH_ALPHA = 0.01
+SKETCH_MIN_VALUE = 1e-9
+SKETCH_MAX_VALUE = 1e15
+_GAMMA = (1 + SKETCH_ALPHA) / (1 - SKETCH_ALPHA)
+_LOG_GAMMA = np.log(_GAMMA)
+_KEY_MIN = int(np.ceil(np.log(SKETCH_MIN_VALUE) / _LOG_GAMMA))
+_KEY_MAX = int(np.ceil(np.log(SKETCH_MAX_VALUE) / _LOG_GAMMA))
+_N_BUCKETS = _KEY_MAX - _KEY_MIN + 1
+
+
+def _bucket_counts(magnitudes: np.ndarray) -> np.ndarray:
+    """Per-column bucket counts of a (rows, columns) array of magnitudes >= SKETCH_MIN_VALUE (NaN elsewhere)."""
+    n_cols = magnitudes.shape[1]
+    valid = ~np.isnan(magnitudes)
+    keys = np.ceil(np.log(np.where(valid, magnitudes, 1.0)) / _LOG_GAMMA).astype(np.int64)
+    keys = np.clip(keys, _KEY_MIN, _KEY_MAX) - _KEY_MIN
+    flat = (np.arange(n_cols)[None, :] * _N_BUCKETS + keys)[valid]
+    return np.bincount(flat, minlength=n_cols * _N_BUCKETS).reshape(n_cols, _N_BUCKETS)
+
+
+@dataclass
+class StreamProfile:
+    """
+    Mergeable per-column statistics: counts, exact sum, min/max, Welford
+    mean and M2, and a log-bucket quantile sketch. Profiles of disjoint
+    chunks merge exactly, in any order.
+    """
+
+    columns: List[str]
+    count: np.ndarray
+    missing: np.ndarray
+    total: np.ndarray
+    mean: np.ndarray
+    m2: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    positive: np.ndarray
+    negative: np.ndarray
+    zeros: np.ndarray
+
+    @classmethod
+    def empty(cls, columns: Sequence[str]) -> "StreamProfile":
+        n = len(columns)
+        return cls(
+            columns=list(columns),
+            count=np.zeros(n, dtype=np.int64),
+            missing=np.zeros(n, dtype=np.int64),
+            total=np.zeros(n),
+            mean=np.zeros(n),
+            m2=np.zeros(n),
+            minimum=np.full(n, np.inf),
+            maximum=np.full(n, -np.inf),
+            positive=np.zeros((n, _N_BUCKETS), dtype=np.int64),
+            negative=np.zeros((n, _N_BUCKETS), dtype=np.int64),
+            zeros=np.zeros(n, dtype=np.int64),
+        )
+
+    @classmethod
+    def from_values(cls, columns: Sequence[str], values: np.ndarray) -> "StreamProfile":
+        """Profile of one (rows, columns) block, NaN meaning missing."""
+        valid = ~np.isnan(values)
+        count = valid.sum(axis=0)
+        has = count > 0
+        total = np.nansum(values, axis=0)
+        mean = np.divide(total, count, out=np.zeros(len(columns)), where=has)
+        m2 = np.nansum((values - mean) ** 2, axis=0)
+        magnitude = np.abs(values)
+        indexed = magnitude >= SKETCH_MIN_VALUE
+        return cls(
+            columns=list(columns),
+            count=count.astype(np.int64),
+            missing=(~valid).sum(axis=0).astype(np.int64),
+            total=total,
+            mean=mean,
+            m2=m2,
+            minimum=np.where(has, np.nanmin(np.where(valid, values, np.inf), axis=0), np.inf),
+            maximum=np.where(has, np.nanmax(np.where(valid, values, -np.inf), axis=0), -np.inf),
+            positive=_bucket_counts(np.where(indexed & (values > 0), magnitude, np.nan)),
+            negative=_bucket_counts(np.where(indexed & (values < 0), magnitude, np.nan)),
+            zeros=(valid & ~indexed).sum(axis=0).astype(np.int64),
+        )
+
+    def merge(self, other: "StreamProfile") -> "StreamProfile":
+        """Combines two profiles of disjoint rows (Chan et al. for mean and M2)."""
+        count = self.count + other.count
+        safe = np.maximum(count, 1)
+        delta = other.mean - self.mean
+        return StreamProfile(
+            columns=self.columns,
+            count=count,
+            missing=self.missing + other.missing,
+            total=self.total + other.total,
+            mean=self.mean + delta * other.count / safe,
+            m2=self.m2 + other.m2 + delta ** 2 * self.count * other.count / safe,
+            minimum=np.minimum(self.minimum, other.minimum),
+            maximum=np.maximum(self.maximum, other.maximum),
+            positive=self.positive + other.positive,
+            negative=self.negative + other.negative,
+            zeros=self.zeros + other.zeros,
+        )
+
+    def std(self) -> np.ndarray:
+        """Sample standard deviation."""
+        return np.sqrt(np.divide(self.m2, self.count - 1, out=np.full(len(self.columns), np.nan),
+                                 where=self.count > 1))
+
+    def quantiles(self, qs: Sequence[float] = QUANTILES) -> np.ndarray:
+        """
+        Approximate quantiles per column, shape (columns, len(qs)), following
+        the np.quantile "linear" convention: the value at rank q * (n - 1),
+        interpolated between the two neighbouring order statistics. Each order
+        statistic is estimated by its bucket's representative value, so the
+        result stays within SKETCH_ALPHA of the exact linear quantile.
+        """
+        key_values = 2 * _GAMMA ** np.arange(_KEY_MIN, _KEY_MAX + 1) / (_GAMMA + 1)
+        # Bucket values in ascending order: negatives (largest magnitude first), zero, positives
+        values = np.concatenate([-key_values[::-1], [0.0], key_values])
+        result = np.full((len(self.columns), len(qs)), np.nan)
+        for c in range(len(self.columns)):
+            if self.count[c] == 0:
+                continue
+            counts = np.concatenate([self.negative[c, ::-1], [self.zeros[c]], self.positive[c]])
+            cumulative = np.cumsum(counts)
+            ranks = np.asarray(qs, dtype=float) * (self.count[c] - 1)
+            below = np.floor(ranks)
+            above = np.minimum(below + 1, self.count[c] - 1)
+            low = values[np.searchsorted(cumulative, below, side="right")]
+            high = values[np.searchsorted(cumulative, above, side="right")]
+            result[c] = np.clip(low + (ranks - below) * (high - low), self.minimum[c], self.maximum[c])
+        return result
+
+    def summary(self, qs: Sequence[float] = QUANTILES) -> pd.DataFrame:
+        has = self.count > 0
+        frame = pd.DataFrame(
+            {
+                "count": self.count,
+                "missing": self.missing,
+                "sum": self.total,
+                "mean": np.where(has, self.mean, np.nan),
+                "std": self.std(),
+                "min": np.where(has, self.minimum, np.nan),
+                "max": np.where(has, self.maximum, np.nan),
+            },
+            index=self.columns,
+        )
+        for q, values in zip(qs, self.quantiles(qs).T):
+            frame[f"q{q:g}"] = values
+        return frame
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of bytes [start, end) of a file, for per-worker CSV parsing."""
+
+    def __init__(self, path: Path, start: int, end: int):
+        self._file = open(path, "rb")
+        self._file.seek(start)
+        self._left = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = min(len(buffer), self._left)
+        if n <= 0:
+            return 0
+        got = self._file.readinto(memoryview(buffer)[:n])
+        self._left -= got
+        return got
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+@dataclass
+class FileLayout:
+    separator: str
+    columns: List[str]
+    numeric: List[str]
+    data_start: int
+
+
+def inspect_file(file_path: Path) -> FileLayout:
+    """Delimiter, header and numeric columns from the first rows of a ';' or ',' separated file."""
+    with open(file_path, newline="") as handle:
+        separator = csv.Sniffer().sniff(handle.readline(), delimiters=";,").delimiter
+    with open(file_path, "rb") as handle:
+        handle.readline()
+        data_start = handle.tell()
+    sample = pd.read_csv(file_path, sep=separator, nrows=SAMPLE_ROWS)
+    return FileLayout(separator, list(sample.columns), list(sample.select_dtypes("number").columns), data_start)
+
+
+def split_ranges(file_path: Path, start: int, parts: int) -> List[Tuple[int, int]]:
+    """Splits bytes [start, size) into up to parts ranges ending on line boundaries."""
+    size = os.path.getsize(file_path)
+    bounds = [start]
+    with open(file_path, "rb") as handle:
+        for i in range(1, parts):
+            handle.seek(max(start + (size - start) * i // parts, bounds[-1]))
+            handle.readline()
+            bounds.append(min(handle.tell(), size))
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def profile_range(file_path: Path, layout: FileLayout, start: int, end: int,
+                  chunk_rows: int = CHUNK_ROWS) -> StreamProfile:
+    """Streams one byte range chunk by chunk; memory is bounded by chunk_rows."""
+    profile = StreamProfile.empty(layout.numeric)
+    reader = io.BufferedReader(_ByteRange(file_path, start, end), buffer_size=1 << 20)
+    with reader:
+        chunks = pd.read_csv(reader, sep=layout.separator, header=None, names=layout.columns,
+                             usecols=layout.numeric, chunksize=chunk_rows)
+        for chunk in chunks:
+            if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in chunk.dtypes):
+                # Unparseable cells become missing values
+                chunk = chunk.apply(pd.to_numeric, errors="coerce")
+            values = chunk[layout.numeric].to_numpy(dtype=float)
+            profile = profile.merge(StreamProfile.from_values(layout.numeric, values))
+    return profile
+
+
+def _profile_task(task) -> StreamProfile:
+    return profile_range(*task)
+
+
+def profile_file(file_path: Path, workers: int = 1, chunk_rows: int = CHUNK_ROWS,
+                 layout: Optional[FileLayout] = None) -> StreamProfile:
+    """
+    Single-pass profile of every numeric column. With several workers the
+    file is split into line-aligned byte ranges, each worker profiles its
+    own range and the partial profiles are merged.
+    """
+    file_path = Path(file_path)
+    layout = layout or inspect_file(file_path)
+    ranges = split_ranges(file_path, layout.data_start, max(workers, 1))
+    tasks = [(file_path, layout, start, end, chunk_rows) for start, end in ranges]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_profile_task, tasks))
+    else:
+        parts = [_profile_task(task) for task in tasks]
+
+    profile = StreamProfile.empty(layout.numeric)
+    for part in parts:
+        profile = profile.merge(part)
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming summary statistics of a large CSV file.")
+    parser.add_argument("file", type=Path)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    if not args.file.is_file():
+        print(f"File not found: {args.file}")
+        return
+    profile = profile_file(args.file, args.workers, args.chunk_rows)
+    pd.set_option("display.width", 200)
+    print(profile.summary().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import itertools
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from compressed_air import bank_power, calibrate_demand, load_baseline_kwh
+from load_profiles import interval_index, production_shape
+from measure_portfolio import DISCOUNT_RATE, LIFETIME_YEARS
+from pv_analysis import GRID_PRICE_EUR_PER_KWH
+from weather_normalization import HDD_BASE_C, WEATHER_SUBSECTORS, load_temperature
+
+# --- Constants ---
+PUMP_SUBSECTOR = "Pumping system"
+UTA_SUBSECTORS = ["UTA gluing area", "UTA offices", "UTA canteen"]
+
+# Space heating is supplied by heat pumps; recovered heat displaces their output
+HEAT_PUMP_COP = 3.0
+# Share of compressor electrical input recoverable as hot water
+COMPRESSOR_HEAT_SHARE = 0.75
+STORAGE_LOSS_PER_HOUR = 0.005
+
+# Fixed-speed pumps are throttled: power falls only part way with flow
+THROTTLED_MIN_POWER = 0.6
+# Process circulation demand relative to full flow outside production shifts
+PUMP_OFF_SHIFT_DEMAND = 0.35
+# Ventilation airflow needed outside shifts; fixed-speed fans run at full speed
+VENTILATION_OFF_SHIFT_DEMAND = 0.5
+
+# Configuration axes of the T4 design space
+PUMP_VFD = [False, True]
+FAN_MIN_SPEEDS = [1.0, 0.7, 0.5]  # 1.0 = no fan VFD
+HEAT_RECOVERY = [0.0, 0.5, 1.0]  # share of the compressor heat captured
+STORAGE_KWH = [0.0, 250.0, 1000.0]
+ISARCO_SUPPLY_KW = [0.0, 40.0, 80.0]  # waste heat from the Isarco integration
+
+# Indicative capex [EUR]
+CAPEX_PUMP_VFD = 9000.0
+CAPEX_FAN_VFD = 18000.0
+CAPEX_RECOVERY_PER_SHARE = 35000.0
+CAPEX_STORAGE_PER_KWH = 40.0
+CAPEX_ISARCO_FIXED = 30000.0
+CAPEX_ISARCO_PER_KW = 250.0
+
+
+def pump_power(demand, rated_kw, vfd, min_speed=0.3):
+    """
+    Affinity-law power of a pump or fan delivering demand (flow ratio 0-1).
+    With a VFD the speed follows the flow and power scales with its cube;
+    without it the machine runs at full speed and is throttled.
+    min_speed may be an array broadcasting against demand.
+    """
+    demand = np.asarray(demand, dtype=float)
+    variable = rated_kw * np.maximum(demand, min_speed) ** 3
+    throttled = rated_kw * (THROTTLED_MIN_POWER + (1 - THROTTLED_MIN_POWER) * demand)
+    return np.where(demand > 0, np.where(vfd, variable, throttled), 0.0)
+
+
+def heating_demand(temperature: np.ndarray, heating_kwh: float, cop: float = HEAT_PUMP_COP) -> np.ndarray:
+    """Hourly space-heating load [kW thermal] proportional to HDD, scaled to the metered heating electricity."""
+    degrees = np.maximum(HDD_BASE_C - temperature, 0.0)
+    return degrees * heating_kwh * cop / degrees.sum()
+
+
+def match_heat(sources: np.ndarray, sink: np.ndarray, storage_kwh: np.ndarray,
+               loss: float = STORAGE_LOSS_PER_HOUR) -> np.ndarray:
+    """
+    Recovered heat delivered to the sink per hour for every configuration.
+    sources is (C, T), sink (T,), storage_kwh (C,). Direct use comes first,
+    surplus charges the buffer tank and deficits discharge it. The time loop
+    is sequential because of the tank state but each step covers all
+    configurations at once.
+    """
+    direct = np.minimum(sources, sink)
+    surplus = sources - direct
+    deficit = sink - direct
+    stored = np.zeros(sources.shape[0])
+    discharged = np.zeros_like(sources)
+    for t in range(sources.shape[1]):
+        stored *= 1 - loss
+        out = np.minimum(stored, deficit[:, t])
+        stored = np.minimum(stored - out + surplus[:, t], storage_kwh)
+        discharged[:, t] = out
+    return direct + discharged
+
+
+def configuration_grid() -> pd.DataFrame:
+    combos = list(itertools.product(PUMP_VFD, FAN_MIN_SPEEDS, HEAT_RECOVERY, STORAGE_KWH, ISARCO_SUPPLY_KW))
+    return pd.DataFrame(combos, columns=["Pump VFD", "Fan min speed", "Heat recovery", "Storage [kWh]",
+                                         "Isarco [kW]"])
+
+
+def simulate(configs: pd.DataFrame, temperature: np.ndarray, index: pd.DatetimeIndex,
+             sectors_df: pd.DataFrame, compressor_kw: np.ndarray) -> pd.DataFrame:
+    """
+    Annual electricity of pumps, UTA fans and heat pumps for every
+    configuration, evaluated as (configurations, hours) arrays.
+    """
+    consumption = sectors_df.groupby("Subsector")["Consumption [kWh/year]"].sum()
+    heating_kwh = sum(consumption.get(name, 0.0) * split["heating"] for name, split in WEATHER_SUBSECTORS.items())
+    fan_kwh = sum(consumption.get(name, 0.0) * (1 - WEATHER_SUBSECTORS[name]["heating"]
+                                                - WEATHER_SUBSECTORS[name]["cooling"]) for name in UTA_SUBSECTORS)
+    pump_kwh = consumption.get(PUMP_SUBSECTOR, 0.0)
+
+    sink = heating_demand(temperature, heating_kwh)
+    shift = production_shape(index, base_level=0.0)
+    # Circulation follows production and the heating load, whichever is higher
+    pump_demand = np.maximum(np.where(shift > 0, 1.0, PUMP_OFF_SHIFT_DEMAND), sink / sink.max())
+    fan_demand = np.where(shift > 0, 1.0, VENTILATION_OFF_SHIFT_DEMAND)
+
+    # Rated powers calibrated so the fixed-speed baseline matches sectors.csv
+    pump_rated = pump_kwh / pump_power(pump_demand, 1.0, False).sum()
+    fan_rated = fan_kwh / len(index)
+
+    pump_vfd = configs["Pump VFD"].to_numpy()[:, None]
+    fan_speed = configs["Fan min speed"].to_numpy()[:, None]
+    pumps = pump_power(pump_demand[None, :], pump_rated, pump_vfd)
+    fans = np.where(fan_speed < 1.0, fan_rated * np.maximum(fan_demand[None, :], fan_speed) ** 3, fan_rated)
+
+    sources = (configs["Heat recovery"].to_numpy()[:, None] * COMPRESSOR_HEAT_SHARE * compressor_kw[None, :]
+               + configs["Isarco [kW]"].to_numpy()[:, None])
+    recovered = match_heat(sources, sink, configs["Storage [kWh]"].to_numpy())
+    heat_pumps = (sink[None, :] - recovered) / HEAT_PUMP_COP
+
+    result = configs.copy()
+    result["Pumps [kWh/year]"] = pumps.sum(axis=1)
+    result["UTA fans [kWh/year]"] = fans.sum(axis=1)
+    result["Heat pumps [kWh/year]"] = heat_pumps.sum(axis=1)
+    result["Recovered heat [MWh/year]"] = recovered.sum(axis=1) / 1000
+    result["Electricity [kWh/year]"] = result[["Pumps [kWh/year]", "UTA fans [kWh/year]",
+                                               "Heat pumps [kWh/year]"]].sum(axis=1)
+    return result
+
+
+def rank_configurations(result: pd.DataFrame, grid_price: float = GRID_PRICE_EUR_PER_KWH) -> pd.DataFrame:
+    """Savings against the no-retrofit configuration, capex, payback and NPV."""
+    baseline = result.loc[
+        ~result["Pump VFD"] & (result["Fan min speed"] == 1.0) & (result["Heat recovery"] == 0)
+        & (result["Storage [kWh]"] == 0) & (result["Isarco [kW]"] == 0),
+        "Electricity [kWh/year]",
+    ].iloc[0]
+    result = result.copy()
+    result["Savings [kWh/year]"] = baseline - result["Electricity [kWh/year]"]
+    result["Savings [EUR/year]"] = result["Savings [kWh/year]"] * grid_price
+    result["Capex [EUR]"] = (
+        result["Pump VFD"] * CAPEX_PUMP_VFD
+        + (result["Fan min speed"] < 1.0) * CAPEX_FAN_VFD
+        + result["Heat recovery"] * CAPEX_RECOVERY_PER_SHARE
+        + result["Storage [kWh]"] * CAPEX_STORAGE_PER_KWH
+        + (result["Isarco [kW]"] > 0) * CAPEX_ISARCO_FIXED + result["Isarco [kW]"] * CAPEX_ISARCO_PER_KW
+    )
+    annuity = (1 - (1 + DISCOUNT_RATE) ** -LIFETIME_YEARS) / DISCOUNT_RATE
+    result["NPV [EUR]"] = result["Savings [EUR/year]"] * annuity - result["Capex [EUR]"]
+    result["Payback [years]"] = np.where(
+        result["Savings [EUR/year]"] > 0, result["Capex [EUR]"] / result["Savings [EUR/year]"], np.inf
+    )
+    return result.sort_values("NPV [EUR]", ascending=False)
+
+
+def main():
+    script_dir = Path(__file__).parent
+    sectors_path = script_dir / "data" / "sectors.csv"
+    sectors_df = pd.read_csv(sectors_path, sep=";")
+
+    index = interval_index()
+    temperature = load_temperature(script_dir / "data" / "hourly_temperature.csv", index).to_numpy()
+    demand, leak_flow = calibrate_demand(production_shape(index, base_level=0.05), load_baseline_kwh(sectors_path))
+    compressor_kw = bank_power(demand + leak_flow)
+
+    configs = configuration_grid()
+    result = rank_configurations(simulate(configs, temperature, index, sectors_df, compressor_kw))
+    baseline = result.loc[result["Capex [EUR]"] == 0].iloc[0]
+    print(f"Evaluated {len(result)} configurations over {len(index)} hours")
+    print(f"Baseline: pumps {baseline['Pumps [kWh/year]']:,.0f} kWh, UTA fans {baseline['UTA fans [kWh/year]']:,.0f} kWh, "
+          f"heat pumps {baseline['Heat pumps [kWh/year]']:,.0f} kWh")
+
+    pd.set_option("display.width", 220)
+    print("\n--- Highest NPV configurations ---")
+    print(result.head(10).round(1).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import argparse
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from forecasting import accumulate_normal_equations, solve_normal_equations
+from load_profiles import PROFILE_YEAR
+from multi_site import discover_sites, load_group
+
+# --- Constants ---
+TEMPERATURE = "Temperature [°C]"
+HDD = "HDD [K·d]"
+CDD = "CDD [K·d]"
+
+# Heating base of the Italian degree-day convention and a cooling base for the UTAs
+HDD_BASE_C = 20.0
+CDD_BASE_C = 24.0
+
+# Weather-driven subsectors: share of the annual consumption following
+# heating and cooling degree-days, the rest is a flat base load
+WEATHER_SUBSECTORS = {
+    "Environmental heating": {"heating": 0.85, "cooling": 0.0},
+    "UTA offices": {"heating": 0.45, "cooling": 0.30},
+    "UTA gluing area": {"heating": 0.40, "cooling": 0.25},
+    "UTA canteen": {"heating": 0.45, "cooling": 0.25},
+}
+
+# Synthetic hourly temperature used when no weather file is available
+MEAN_TEMPERATURE_C = 13.5
+ANNUAL_AMPLITUDE_C = 10.0
+DAILY_AMPLITUDE_C = 4.0
+COLDEST_DAY = 20
+WARMEST_HOUR = 15
+
+# Years averaged into the synthetic normal year when no long-term file is available
+NORMAL_YEARS = 20
+
+# Regressors of the monthly model: base load per day, HDD and CDD
+MODEL_TERMS = ["Base [kWh/day]", "Heating [kWh/K·d]", "Cooling [kWh/K·d]"]
+
+
+def synthetic_temperature(index: pd.DatetimeIndex, offset: float = 0.0, seed: int = 0) -> pd.Series:
+    """Annual and daily sinusoids plus day-to-day weather noise, shifted by offset [K]."""
+    day = index.dayofyear.to_numpy()
+    hour = index.hour.to_numpy() + index.minute.to_numpy() / 60
+    rng = np.random.default_rng(seed)
+    # One weather anomaly per day, smoothed so cold and warm spells last a few days
+    daily_noise = np.convolve(rng.normal(0, 3.0, day.max() + 6), np.ones(5) / 5, mode="same")[:day.max()]
+    values = (
+        MEAN_TEMPERATURE_C + offset
+        - ANNUAL_AMPLITUDE_C * np.cos(2 * np.pi * (day - COLDEST_DAY) / 365.25)
+        + DAILY_AMPLITUDE_C * np.cos(2 * np.pi * (hour - WARMEST_HOUR) / 24)
+        + daily_noise[day - 1]
+    )
+    return pd.Series(values, index=index, name=TEMPERATURE)
+
+
+def load_temperature(file_path: Path, index: pd.DatetimeIndex) -> pd.Series:
+    """
+    Reads hourly temperatures (Timestamp;Temperature [°C]) aligned to index,
+    falling back to the synthetic series when the file is missing.
+    """
+    if not file_path.is_file():
+        return synthetic_temperature(index)
+    weather = pd.read_csv(file_path, sep=";", parse_dates=["Timestamp"], index_col="Timestamp")
+    return weather[TEMPERATURE].reindex(index).interpolate(limit_direction="both")
+
+
+def degree_days(temperature: pd.Series, hdd_base: float = HDD_BASE_C,
+                cdd_base: float = CDD_BASE_C, freq: str = "MS") -> pd.DataFrame:
+    """
+    Heating and cooling degree-days from an hourly (or finer) temperature
+    series, integrated interval by interval and summed per freq period.
+    """
+    values = temperature.to_numpy(dtype=float)
+    step_days = pd.Series(temperature.index).diff().median() / pd.Timedelta("1D")
+    frame = pd.DataFrame(
+        {
+            HDD: np.maximum(hdd_base - values, 0.0) * step_days,
+            CDD: np.maximum(values - cdd_base, 0.0) * step_days,
+            "Days": step_days,
+        },
+        index=temperature.index,
+    )
+    return frame.resample(freq).sum()
+
+
+def long_term_temperature(file_path: Path, years: range) -> pd.Series:
+    """
+    Hourly temperatures of a long-term record (TMY or multi-year,
+    Timestamp;Temperature [°C]), or synthetic years with independent weather
+    noise when the file is missing.
+    """
+    if file_path.is_file():
+        weather = pd.read_csv(file_path, sep=";", parse_dates=["Timestamp"], index_col="Timestamp")
+        return weather[TEMPERATURE].dropna()
+    return pd.concat([
+        synthetic_temperature(pd.date_range(f"{year}-01-01", f"{year + 1}-01-01", freq="h", inclusive="left"),
+                              seed=year)
+        for year in years
+    ])
+
+
+def normal_degree_days(temperature: pd.Series, year: int) -> pd.DataFrame:
+    """
+    Normal-year weather: degree-days of every calendar month averaged over
+    all years of temperature, laid on the months (and day counts) of year.
+    """
+    monthly = degree_days(temperature)
+    normal = monthly.groupby(monthly.index.month).mean()
+    normal.index = pd.date_range(f"{year}-01-01", periods=12, freq="MS")
+    normal["Days"] = normal.index.days_in_month.to_numpy(dtype=float)
+    return normal
+
+
+def design_matrix(weather: pd.DataFrame) -> np.ndarray:
+    """Model regressors per period: days, HDD and CDD."""
+    return weather[["Days", HDD, CDD]].to_numpy(dtype=float)
+
+
+@dataclass
+class DegreeDayModel:
+    """
+    Weather-normalization models for many series (site x subsector) sharing
+    the same periods and weather, kept as normal-equation sums so new months
+    are folded in without revisiting the history.
+    """
+
+    names: List[str]
+    xtx: np.ndarray
+    xty: np.ndarray
+    n_obs: np.ndarray
+    last_period: Optional[pd.Timestamp] = None
+
+    @classmethod
+    def empty(cls, names: List[str]) -> "DegreeDayModel":
+        k = len(MODEL_TERMS)
+        return cls(list(names), np.zeros((len(names), k, k)), np.zeros((len(names), k)),
+                   np.zeros(len(names), dtype=np.int64))
+
+    def update(self, consumption: pd.DataFrame, weather: pd.DataFrame) -> int:
+        """
+        Adds the periods of consumption (index = period start, one column per
+        series) after the last period already fitted; returns how many were added.
+        """
+        consumption = consumption[self.names].sort_index()
+        if self.last_period is not None:
+            consumption = consumption.loc[consumption.index > self.last_period]
+        if consumption.empty:
+            return 0
+        x = design_matrix(weather.reindex(consumption.index))
+        d_xtx, d_xty, d_n = accumulate_normal_equations(x, consumption.to_numpy(dtype=float).T)
+        self.xtx, self.xty, self.n_obs = self.xtx + d_xtx, self.xty + d_xty, self.n_obs + d_n
+        self.last_period = consumption.index[-1]
+        return len(consumption)
+
+    def coefficients(self) -> pd.DataFrame:
+        """All series solved in one batched call."""
+        return pd.DataFrame(solve_normal_equations(self.xtx, self.xty), index=self.names, columns=MODEL_TERMS)
+
+    def predict(self, weather: pd.DataFrame) -> pd.DataFrame:
+        values = design_matrix(weather) @ self.coefficients().to_numpy().T
+        return pd.DataFrame(np.clip(values, 0.0, None), index=weather.index, columns=self.names)
+
+
+def normalized_savings(model: DegreeDayModel, consumption: pd.DataFrame, weather: pd.DataFrame,
+                       normal_weather: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Avoided energy in the reporting period: the baseline model evaluated at
+    the reporting period's weather minus the metered consumption. With
+    normal_weather, savings are also expressed for a normal weather year by
+    scaling the relative savings onto the baseline at normal conditions.
+    """
+    adjusted = model.predict(weather).sum()
+    actual = consumption[model.names].sum()
+    result = pd.DataFrame(
+        {
+            "Actual [kWh]": actual,
+            "Adjusted baseline [kWh]": adjusted,
+            "Savings [kWh]": adjusted - actual,
+        }
+    )
+    result["Savings [%]"] = result["Savings [kWh]"] / result["Adjusted baseline [kWh]"].where(adjusted > 0) * 100
+    if normal_weather is not None:
+        normal = model.predict(normal_weather).sum()
+        result["Normal-year baseline [kWh]"] = normal
+        result["Normal-year savings [kWh]"] = normal * result["Savings [%]"].fillna(0) / 100
+    return result
+
+
+def subsector_monthly_series(group, weather: pd.DataFrame) -> pd.DataFrame:
+    """
+    Splits each site's annual subsector consumption into months: weather-driven
+    subsectors follow their share of HDD/CDD, all others the site's monthly
+    need. Stands in for sub-metered series until those are available.
+    """
+    hdd = weather[HDD].to_numpy()
+    cdd = weather[CDD].to_numpy()
+    days = weather["Days"].to_numpy()
+    need = group.monthly[:, :, 0]
+    need_shape = need / need.sum(axis=1, keepdims=True)
+
+    columns = {}
+    for s, site in enumerate(group.sites):
+        for j, subsector in enumerate(group.subsectors):
+            annual = group.consumption[s, j]
+            if annual <= 0:
+                continue
+            if subsector in WEATHER_SUBSECTORS:
+                split = WEATHER_SUBSECTORS[subsector]
+                base = 1.0 - split["heating"] - split["cooling"]
+                shape = base * days / days.sum() + split["heating"] * hdd / hdd.sum()
+                if cdd.sum() > 0:
+                    shape = shape + split["cooling"] * cdd / cdd.sum()
+                else:
+                    shape = shape + split["cooling"] * days / days.sum()
+            else:
+                shape = need_shape[s]
+            columns[f"{site} / {subsector}"] = annual * shape
+        columns[f"{site} / Total need"] = need[s]
+    return pd.DataFrame(columns, index=weather.index)
+
+
+def main():
+    script_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="Weather-normalized consumption and savings.")
+    parser.add_argument("--sites-root", type=Path, default=None,
+                        help="Directory of site folders with data/montly_data.csv and data/sectors.csv")
+    parser.add_argument("--weather", type=Path, default=script_dir / "data" / "hourly_temperature.csv")
+    parser.add_argument("--normal-weather", type=Path, default=script_dir / "data" / "normal_temperature.csv",
+                        help="TMY or multi-year hourly temperatures defining the normal year")
+    args = parser.parse_args()
+
+    site_dirs = discover_sites(args.sites_root) if args.sites_root else [script_dir]
+    group = load_group(site_dirs)
+
+    index = pd.date_range(f"{PROFILE_YEAR}-01-01", f"{PROFILE_YEAR + 1}-01-01", freq="h", inclusive="left")
+    weather = degree_days(load_temperature(args.weather, index))
+    series = subsector_monthly_series(group, weather)
+    names = [c for c in series.columns if c.split(" / ")[1] in WEATHER_SUBSECTORS or c.endswith("Total need")]
+
+    # Baseline fitted as the months arrive: eleven months, then December
+    model = DegreeDayModel.empty(names)
+    added_first = model.update(series.iloc[:11], weather)
+    added_refresh = model.update(series, weather)
+    print(f"Baseline periods fitted: {added_first} + {added_refresh} (incremental refresh)")
+    print(f"Baseline degree-days {PROFILE_YEAR}: {weather[HDD].sum():.0f} HDD, {weather[CDD].sum():.0f} CDD")
+
+    pd.set_option("display.width", 200)
+    print("\n--- Baseline models ---")
+    print(model.coefficients().round(1).to_string())
+
+    # Reporting year: a colder year, with a 10% cut on the weather-driven
+    # consumption standing in for the T4 heating and ventilation measures
+    report_index = index + pd.DateOffset(years=1)
+    report_weather = degree_days(synthetic_temperature(report_index, offset=-1.0, seed=1))
+    report = model.predict(report_weather)
+    for site in group.sites:
+        measure = [c for c in names if c.startswith(f"{site} / ") and not c.endswith("Total need")]
+        cut = 0.10 * report[measure]
+        report[measure] -= cut
+        report[f"{site} / Total need"] -= cut.sum(axis=1)
+    print(f"Reporting degree-days {PROFILE_YEAR + 1}: {report_weather[HDD].sum():.0f} HDD, "
+          f"{report_weather[CDD].sum():.0f} CDD")
+
+    normal_years = range(PROFILE_YEAR - NORMAL_YEARS, PROFILE_YEAR)
+    normal_temperature = long_term_temperature(args.normal_weather, normal_years)
+    normal_weather = normal_degree_days(normal_temperature, PROFILE_YEAR + 1)
+    source = args.normal_weather.name if args.normal_weather.is_file() else f"{NORMAL_YEARS} synthetic years"
+    print(f"Normal-year degree-days ({source}): {normal_weather[HDD].sum():.0f} HDD, "
+          f"{normal_weather[CDD].sum():.0f} CDD")
+    savings = normalized_savings(model, report, report_weather, normal_weather=normal_weather)
+    print("\n--- Weather-normalized savings ---")
+    print(savings.round(1).to_string())
+
+    raw = series[names].sum().to_numpy() - report[names].sum().to_numpy()
+    print("\nRaw kWh difference (ignoring weather):")
+    print(pd.Series(raw, index=names).round(0).to_string())
+
+
+if __name__ == "__main__":
+    main()